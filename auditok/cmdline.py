@@ -33,6 +33,12 @@ __date__ = "2015-11-23"
 __updated__ = "2018-10-24"
 
 
+def _energy_threshold(value):
+    if value == "auto":
+        return value
+    return float(value)
+
+
 def main(argv=None):
     program_name = os.path.basename(sys.argv[0])
     if argv is None:
@@ -224,9 +230,21 @@ def main(argv=None):
             "-e",
             "--energy-threshold",
             dest="energy_threshold",
-            type=float,
+            type=_energy_threshold,
             default=50,
-            help="Log energy threshold for detection [default: %(default)s]",
+            help="Log energy threshold for detection. Use 'auto' for a "
+            "threshold that follows the noise floor of the signal "
+            "[default: %(default)s]",
+            metavar="FLOAT|auto",
+        )
+        group.add_argument(
+            "--offset-energy-threshold",
+            dest="offset_energy_threshold",
+            type=float,
+            default=None,
+            help="Lower log energy threshold used to continue an event once "
+            "it has started with --energy-threshold (hysteresis) "
+            "[default: use --energy-threshold]",
             metavar="FLOAT",
         )
 
@@ -311,6 +329,16 @@ def main(argv=None):
             "PDF file (requires matplotlib)",
             metavar="FILE",
         )
+        group.add_argument(
+            "--record-max-memory",
+            dest="record_max_memory",
+            type=int,
+            default=None,
+            help="Maximum memory (in bytes) used to keep audio data for "
+            "--plot and --save-image. Data is written to a temporary file "
+            "past this limit [default: no limit]",
+            metavar="INT",
+        )
         group.add_argument(
             "--printf",
             dest="printf",
@@ -412,10 +440,13 @@ def main(argv=None):
                 detections = (
                     (det.start, det.end) for det in tokenizer_worker.detections
                 )
+                energy_threshold = args.energy_threshold
+                if energy_threshold == "auto":
+                    energy_threshold = None
                 plot(
                     record,
                     detections=detections,
-                    energy_threshold=args.energy_threshold,
+                    energy_threshold=energy_threshold,
                     show=True,
                     save_as=args.save_image,
                 )
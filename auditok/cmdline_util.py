@@ -37,6 +37,7 @@ def make_kwargs(args_ns):
         "frames_per_buffer": args_ns.frame_per_buffer,
         "input_device_index": args_ns.input_device_index,
         "record": record,
+        "record_max_memory": args_ns.record_max_memory,
     }
 
     split_kwargs = {
@@ -46,6 +47,7 @@ def make_kwargs(args_ns):
         "drop_trailing_silence": args_ns.drop_trailing_silence,
         "strict_min_dur": args_ns.strict_min_duration,
         "energy_threshold": args_ns.energy_threshold,
+        "offset_energy_threshold": args_ns.offset_energy_threshold,
     }
 
     miscellaneous = {
@@ -10,21 +10,72 @@ Summary
 """
 import os
 import math
-from auditok.util import AudioReader, DataValidator, AudioEnergyValidator
-from auditok.io import check_audio_data, to_file, player_for, get_audio_source
+import heapq
+from collections import deque
+from itertools import accumulate, chain, product, tee
+from concurrent.futures import ProcessPoolExecutor
+from auditok.util import (
+    AudioReader,
+    DataValidator,
+    AudioEnergyValidator,
+    AdaptiveEnergyValidator,
+    make_channel_selector,
+)
+from auditok.io import (
+    AudioIOError,
+    AudioSource,
+    BufferAudioSource,
+    RawAudioSource,
+    WaveAudioSource,
+    MmapRawAudioSource,
+    MmapWaveAudioSource,
+    Rewindable,
+    check_audio_data,
+    to_byte_view,
+    to_file,
+    player_for,
+    get_audio_source,
+    load_energy_track,
+    save_energy_track,
+)
 from auditok.exceptions import TooSamllBlockDuration
 
 try:
+    import numpy as np
     from . import signal_numpy as signal
+
+    _WITH_NUMPY = True
 except ImportError:
     from . import signal
 
-__all__ = ["split", "AudioRegion", "StreamTokenizer"]
+    _WITH_NUMPY = False
+
+__all__ = [
+    "split",
+    "sweep",
+    "split_channels",
+    "AudioRegion",
+    "LazyAudioRegion",
+    "StreamTokenizer",
+]
 
 
 DEFAULT_ANALYSIS_WINDOW = 0.05
 DEFAULT_ENERGY_THRESHOLD = 50
 _EPSILON = 1e-6
+_SHARD_DURATION = 60
+_BATCH_SIZE = 256
+_NOISE_FLOOR_HORIZON = 5
+_COARSE_RMS_MARGIN = 1
+_SWEEP_PARAMS = {
+    "min_dur",
+    "max_dur",
+    "max_silence",
+    "drop_trailing_silence",
+    "strict_min_dur",
+    "energy_threshold",
+    "eth",
+}
 
 
 def split(
@@ -117,26 +168,95 @@ def split(
         than available memory.
     max_read, mr : float, default: None (read until end of stream)
         maximum data to read from source in seconds.
+    read_ahead : float, default: None
+        if given, audio data is read from files, standard input or microphone
+        in chunks of `read_ahead` seconds rather than one analysis window at
+        a time (see `AudioReader`). Detected events are the same.
     validator, val : callable, DataValidator
         custom data validator. If ´None´ (default), an `AudioEnergyValidor` is
         used with the given energy threshold. Can be a callable or an instnace
         of `DataValidator` that implements `is_valid`. In either case, it'll be
-        called with with a window of audio data as the first parameter.
-    energy_threshold, eth : float, default: 50
+        called with with a window of audio data as the first parameter. If
+        the validator overrides `DataValidator.is_valid_batch` and `input` is
+        seekable, `is_valid_batch` is called instead with large blocks of
+        windows.
+    energy_threshold, eth : float or "auto", default: 50
         energy threshlod for audio activity detection. Audio regions that have
         enough windows of with a signal energy equal to or above this threshold
         are considered valid audio events. Here we are referring to this quntity
         as enegry of this signal but to be more accurate, it is the log energy
         of the signal computed as: 10 . log10 dot(x, x) / |x|
+        If "auto", the threshold follows the noise floor of the signal, which
+        is tracked over the last 5 seconds, and a window is valid if its
+        energy is at least 10 dB above the noise floor (see
+        `AdaptiveEnergyValidator`, that can be used as a custom `validator`
+        to change these values).
         If `validator` is given, this argumemt is ignored.
+    offset_energy_threshold, oeth : float, default: None
+        if given, a lower energy threshold used, once an audio event has
+        started, to continue it (`energy_threshold` is then the threshold
+        required to start an event). This hysteresis avoids fragmenting an
+        event whose energy hovers around `energy_threshold` into many short
+        events. Must be <= `energy_threshold` and can not be used with
+        `energy_threshold="auto"`. If `validator` is given, this argumemt is
+        ignored.
+    coarse_window : float, default: None
+        if given, duration in seconds of coarse analysis windows used to
+        skip silence: the energy of coarse windows is computed first and
+        analysis windows are only validated within coarse windows whose
+        energy is high enough to contain a valid analysis window. Coarse
+        windows are made of a whole number of analysis windows (i.e.,
+        `coarse_window` is rounded to a multiple of `analysis_window`), so
+        detected regions are exactly the same as without coarse windows.
+        Useful when audio is mostly silent and `analysis_window` is small.
+        Only used if numpy is not installed: with numpy, the energies of all
+        analysis windows are computed at once and a coarse pass would be
+        slower. Only used with the default energy validator (or a custom
+        `AudioEnergyValidator`), if `input` is data in memory or a *wav* or
+        *raw* audio file read with non-overlapping windows.
+    refinement_window : float, default: None
+        if given, duration in seconds (<= `analysis_window`) of the short
+        windows used to refine the boundaries of detected audio events. The
+        start (resp. end) of an event is moved from the edge of an analysis
+        window to the first (resp. last) sample of the first (resp. last)
+        short window whose energy is >= the energy threshold. Short windows
+        are searched for, one sample at a time, within the first (resp. last)
+        analysis window of the event and the window before (resp. after) it.
+        The end of an event that keeps its trailing silence, and boundaries
+        between an event truncated to `max_dur` and its continuation, are not
+        refined. Use a `refinement_window` of a few samples to get boundaries
+        accurate to the sample with large analysis windows. Only used with the
+        default energy validator (or a custom `AudioEnergyValidator`) and if
+        the audio source is seekable and read with non-overlapping windows.
+    workers : int, default: 1
+        number of worker processes used to compute the energy of analysis
+        windows. Only used if `input` is a path to (or an `AudioSource` of) a
+        *wav* or a *raw* audio file, and if no custom `validator` is given.
+        The file is lazily read by workers, one shard of about 60 seconds at a
+        time, and tokenization is done on the validity of all windows, so the
+        result is exactly the same as with one single process. On platforms
+        where worker processes are spawned (e.g., Windows and macOS), the
+        calling code should be protected by `if __name__ == "__main__":`.
+    energy_sidecar : bool, default: False
+        if True, and if `input` is a path to an audio file and no custom
+        `validator` is given, the energy of analysis windows is loaded from a
+        sidecar file saved next to `input` (see `auditok.io.save_energy_track`)
+        instead of being computed. If there is no such a file, or if `input`
+        has changed since it was saved, energies of the whole file are
+        computed and saved. Requires numpy.
+    lazy : bool, default: False
+        if True, return `LazyAudioRegion`s that only keep their position in
+        the audio source and read their data from it on first access. Data of
+        a detected event is then never kept in memory unless used. Combined
+        with `large_file=True`, this is the most memory-efficient way to split
+        a large file. Only used if the audio source is seekable (i.e., `input`
+        is not read from microphone or from an `AudioReader` with overlapping
+        windows), otherwise regular `AudioRegion`s are returned.
     """
-    if min_dur <= 0:
-        raise ValueError("'min_dur' ({}) must be > 0".format(min_dur))
-    if max_dur <= 0:
-        raise ValueError("'max_dur' ({}) must be > 0".format(max_dur))
-    if max_silence < 0:
-        raise ValueError("'max_silence' ({}) must be >= 0".format(max_silence))
-
+    _check_durations(min_dur, max_dur, max_silence)
+    audio_source = None
+    workers = kwargs.get("workers", 1)
+    lazy = kwargs.get("lazy", False)
     if isinstance(input, AudioReader):
         source = input
         analysis_window = source.block_dur
@@ -156,24 +276,581 @@ def split(
             params["sampling_rate"] = input.sr
             params["sample_width"] = input.sw
             params["channels"] = input.ch
-            input = bytes(input)
-        try:
-            source = AudioReader(input, block_dur=analysis_window, **params)
-        except TooSamllBlockDuration as exc:
-            err_msg = "Too small 'analysis_windows' ({0}) for sampling rate "
-            err_msg += "({1}). Analysis windows should at least be 1/{1} to "
-            err_msg += "cover one single data sample"
-            raise ValueError(err_msg.format(exc.block_dur, exc.sampling_rate))
+            input = input._data
+        if isinstance(input, AudioSource):
+            audio_source = input
+        elif (
+            (workers > 1 or kwargs.get("energy_sidecar", False))
+            and isinstance(input, str)
+            and input != "-"
+        ):
+            # workers read their shards from file and sidecar energies
+            # are not computed from data, avoid loading all data
+            try:
+                audio_source = get_audio_source(
+                    input, **dict(params, large_file=True)
+                )
+            except AudioIOError:
+                audio_source = get_audio_source(input, **params)
+        else:
+            audio_source = get_audio_source(input, **params)
+        source = _make_audio_reader(audio_source, analysis_window, params)
 
     validator = kwargs.get("validator", kwargs.get("val"))
+    offset_validator = None
     if validator is None:
+        validator, offset_validator = _make_energy_validators(source, kwargs)
+    tokenizer = _make_tokenizer(
+        validator,
+        analysis_window,
+        min_dur,
+        max_dur,
+        max_silence,
+        drop_trailing_silence,
+        strict_min_dur,
+        offset_validator,
+    )
+    refiner = _make_boundary_refiner(
+        validator,
+        offset_validator,
+        source,
+        analysis_window,
+        kwargs.get("refinement_window"),
+    )
+    source.open()
+    overlapping = source.hop_size < source.block_size
+    seekable = isinstance(audio_source, Rewindable) and not overlapping
+    if isinstance(audio_source, Rewindable):
+        # offline source, tokens needn't be delivered as soon as possible
+        # (unlike with microphone), check the validity of many windows at
+        # once if validator supports it
+        tokenizer.batch_size = _BATCH_SIZE
+        first_sample = audio_source.position
+    runs = _select_validity_runs(
+        input, audio_source, source, validator, offset_validator, kwargs
+    )
+    if runs is not None:
+        spans = tokenizer._iter_run_tokens(runs, offset_validator is not None)
+        if overlapping:
+            data = _get_buffer_data(audio_source, kwargs)
+            return _iter_regions_from_overlapping_spans(spans, data, source)
+    elif seekable:
+        # frames needn't be kept by tokenizer, each region's data is read
+        # back from audio source once the region is detected
+        spans = tokenizer.tokenize(source, generator=True, spans_only=True)
+    else:
+        token_gen = tokenizer.tokenize(source, generator=True)
+        return (
+            _make_audio_region(
+                token[0],
+                token[1],
+                source.block_dur,
+                source.sr,
+                source.sw,
+                source.ch,
+            )
+            for token in token_gen
+        )
+    return _iter_regions_from_spans(
+        spans, audio_source, first_sample, source, lazy, refiner
+    )
+
+
+def sweep(
+    input,
+    grid,
+    min_dur=0.2,
+    max_dur=5,
+    max_silence=0.3,
+    drop_trailing_silence=False,
+    strict_min_dur=False,
+    workers=1,
+    **kwargs
+):
+    """
+    Split audio data with many combinations of split parameters. Audio data
+    is read once and the energy of each analysis window is computed once.
+    Every combination of parameters is then evaluated against these energies
+    and gives the same regions as `split` called with the same parameters.
+
+    Parameters
+    ----------
+    input : str, bytes, AudioSource, AudioRegion or None
+        input audio data, see `split`. Contrary to `split`, all data is loaded
+        to memory. If None (i.e., read from microphone), `max_read` must be
+        given.
+    grid : dict or iterable of dict
+        split parameters to evaluate. If a dict, it maps parameter names to
+        lists of values and all combinations of these values (i.e., their
+        cartesian product) are evaluated. If an iterable of dicts, each dict
+        is one combination of parameters. Accepted parameters are `min_dur`,
+        `max_dur`, `max_silence`, `drop_trailing_silence`, `strict_min_dur`
+        and `energy_threshold` (alias `eth`). Parameters missing from a
+        combination take the value given to this function.
+    min_dur, max_dur, max_silence, drop_trailing_silence, strict_min_dur :
+        default split parameters, see `split`.
+    workers : int, default: 1
+        number of worker processes used to evaluate combinations of
+        parameters. On platforms where worker processes are spawned (e.g.,
+        Windows and macOS), the calling code should be protected by
+        `if __name__ == "__main__":`.
+
+    Kwargs
+    ------
+    analysis_window, audio_format, sampling_rate, sample_width, channels,
+    use_channel, max_read, energy_threshold and their aliases are used as in
+    `split`. A custom `validator` can not be used with this function.
+
+    Returns
+    -------
+    results : list
+        `(params, regions)` tuples, one for each combination of parameters
+        and in the same order as in `grid`. `params` is a dict of parameters
+        taken from `grid` and `regions` the list of detected `AudioRegion`s.
+
+    Examples
+    --------
+    >>> grid = {"energy_threshold": [50, 55, 60], "max_silence": [0.2, 0.3]}
+    >>> for params, regions in sweep("audio.wav", grid):
+    ...     print(params, len(regions))
+    """
+    if "validator" in kwargs or "val" in kwargs:
+        raise ValueError("A custom 'validator' can not be used with 'sweep'")
+    if isinstance(grid, dict):
+        names = list(grid)
+        grid = [dict(zip(names, values)) for values in product(*grid.values())]
+    else:
+        grid = [dict(params) for params in grid]
+    energy_threshold = kwargs.get(
+        "energy_threshold", kwargs.get("eth", DEFAULT_ENERGY_THRESHOLD)
+    )
+    configs = []
+    for params in grid:
+        unknown = sorted(set(params) - _SWEEP_PARAMS)
+        if unknown:
+            raise ValueError(
+                "Unknown sweep parameter(s): {}".format(", ".join(unknown))
+            )
+        config = {
+            "energy_threshold": params.get(
+                "energy_threshold", params.get("eth", energy_threshold)
+            ),
+            "min_dur": params.get("min_dur", min_dur),
+            "max_dur": params.get("max_dur", max_dur),
+            "max_silence": params.get("max_silence", max_silence),
+            "drop_trailing_silence": params.get(
+                "drop_trailing_silence", drop_trailing_silence
+            ),
+            "strict_min_dur": params.get("strict_min_dur", strict_min_dur),
+        }
+        if config["energy_threshold"] == "auto":
+            raise ValueError(
+                "'energy_threshold' can not be 'auto' with 'sweep'"
+            )
+        _check_durations(
+            config["min_dur"], config["max_dur"], config["max_silence"]
+        )
+        configs.append(config)
+
+    analysis_window = kwargs.get(
+        "analysis_window", kwargs.get("aw", DEFAULT_ANALYSIS_WINDOW)
+    )
+    if analysis_window <= 0:
+        raise ValueError(
+            "'analysis_window' ({}) must be > 0".format(analysis_window)
+        )
+    if not isinstance(input, AudioRegion):
+        params = kwargs.copy()
+        max_read = params.pop("max_read", params.pop("mr", None))
+        input = AudioRegion.load(input, max_read=max_read, **params)
+    data = bytes(input)
+    audio_source = BufferAudioSource(data, input.sr, input.sw, input.ch)
+    reader = _make_audio_reader(audio_source, analysis_window, {})
+    use_channel = kwargs.get("use_channel", kwargs.get("uc"))
+    validator = AudioEnergyValidator(
+        energy_threshold, input.sw, input.ch, use_channel=use_channel
+    )
+    energies = validator.energy_track(data, reader.block_size)
+    args = (reader.block_dur, input.sw, input.ch, use_channel)
+    if workers > 1 and len(configs) > 1:
+        # a few chunks per worker balance load without sending the energy
+        # track too many times
+        chunk_size = math.ceil(len(configs) / (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _sweep_spans, energies, configs[i : i + chunk_size], *args
+                )
+                for i in range(0, len(configs), chunk_size)
+            ]
+            all_spans = [spans for fut in futures for spans in fut.result()]
+    else:
+        all_spans = _sweep_spans(energies, configs, *args)
+
+    window_bytes = reader.block_size * input.sw * input.ch
+    results = []
+    for params, spans in zip(grid, all_spans):
+        regions = [
+            _make_audio_region(
+                [data[start * window_bytes : (end + 1) * window_bytes]],
+                start,
+                reader.block_dur,
+                input.sr,
+                input.sw,
+                input.ch,
+            )
+            for start, end in spans
+        ]
+        results.append((params, regions))
+    return results
+
+
+def split_channels(
+    input,
+    min_dur=0.2,
+    max_dur=5,
+    max_silence=0.3,
+    drop_trailing_silence=False,
+    strict_min_dur=False,
+    **kwargs
+):
+    """
+    Split each channel of multichannel audio data independently and return a
+    generator of single-channel `AudioRegion`s. This gives the same regions as
+    calling `split` with `use_channel=0`, `use_channel=1`, etc. but data is
+    read only once and the energy of all channels is computed at once. Each
+    channel has its own tokenization state.
+
+    Parameters
+    ----------
+    input : str, bytes, AudioSource or AudioRegion
+        input audio data, see `split`. Unlike `split`, input must be seekable
+        (i.e., not read from microphone) because the data of each detected
+        region is read back from it.
+    min_dur, max_dur, max_silence, drop_trailing_silence, strict_min_dur :
+        split parameters, see `split`.
+
+    Kwargs
+    ------
+    analysis_window, audio_format, sampling_rate, sample_width, channels,
+    large_file, max_read, energy_threshold and their aliases are used as in
+    `split`. If a custom `validator` is given, it's called with the data of
+    each channel of each analysis window. `use_channel` and `hop_dur` are not
+    accepted.
+
+    Returns
+    -------
+    regions : generator
+        detected regions, ordered by start time and channel. Each region has
+        the data of one channel and its metadata has `start`, `end` and
+        `channel` entries.
+
+    Raises
+    ------
+    ValueError if `input` is not seekable, or if `use_channel` or `hop_dur`
+    is given.
+    """
+    _check_durations(min_dur, max_dur, max_silence)
+    for name in ("use_channel", "uc", "hop_dur"):
+        if kwargs.get(name) is not None:
+            raise ValueError(
+                "'{}' can not be used with 'split_channels'".format(name)
+            )
+    analysis_window = kwargs.get(
+        "analysis_window", kwargs.get("aw", DEFAULT_ANALYSIS_WINDOW)
+    )
+    if analysis_window <= 0:
+        raise ValueError(
+            "'analysis_window' ({}) must be > 0".format(analysis_window)
+        )
+    params = kwargs.copy()
+    params["max_read"] = params.get("max_read", params.get("mr"))
+    params["audio_format"] = params.get("audio_format", params.get("fmt"))
+    if isinstance(input, AudioRegion):
+        params["sampling_rate"] = input.sr
+        params["sample_width"] = input.sw
+        params["channels"] = input.ch
+        input = input._data
+    if isinstance(input, AudioSource):
+        audio_source = input
+    elif input is None or input == "-":
+        audio_source = None
+    else:
+        audio_source = get_audio_source(input, **params)
+    if not isinstance(audio_source, Rewindable):
+        raise ValueError("'split_channels' requires a seekable input")
+    reader = _make_audio_reader(audio_source, analysis_window, params)
+
+    validator = kwargs.get("validator", kwargs.get("val"))
+    # without a custom validator, energies of all channels are computed at
+    # once, otherwise validator is called with each channel's data
+    per_channel = validator is None
+    if per_channel:
         energy_threshold = kwargs.get(
             "energy_threshold", kwargs.get("eth", DEFAULT_ENERGY_THRESHOLD)
         )
-        use_channel = kwargs.get("use_channel", kwargs.get("uc"))
+        if energy_threshold == "auto":
+            raise ValueError(
+                "'energy_threshold' can not be 'auto' with 'split_channels'"
+            )
+        validator = AudioEnergyValidator(
+            energy_threshold, reader.sw, reader.ch
+        )
+    # validity of windows is computed beforehand, tokenizers only need the
+    # validity of each window of their channel
+    tokenizers = [
+        _make_tokenizer(
+            bool,
+            analysis_window,
+            min_dur,
+            max_dur,
+            max_silence,
+            drop_trailing_silence,
+            strict_min_dur,
+        )
+        for _ in range(reader.ch)
+    ]
+    reader.open()
+    first_sample = audio_source.position
+    masks = _iter_channel_masks(reader, validator, per_channel)
+    runs = _iter_channel_runs(masks, reader.ch)
+
+    def iter_channel_spans(channel):
+        for start, end in tokenizers[channel]._iter_run_tokens(runs[channel]):
+            yield start, channel, end
+
+    spans = heapq.merge(*(iter_channel_spans(ch) for ch in range(reader.ch)))
+    return _iter_channel_regions(spans, audio_source, first_sample, reader)
+
+
+def _iter_channel_masks(reader, validator, per_channel):
+    """
+    Read windows from `reader`, about `_SHARD_DURATION` seconds at a time,
+    and yield a sequence of per-window validity flags for each channel. If
+    `per_channel` is True, `validator` is an `AudioEnergyValidator` whose
+    `is_valid_buffer` is used on all channels at once. Otherwise, it's called
+    with the data of each channel of each window.
+    """
+    fmt = signal.FORMAT[reader.sw]
+    channels = reader.ch
+    nb_windows = max(1, round(_SHARD_DURATION / reader.block_dur))
+    while True:
+        windows = []
+        while len(windows) < nb_windows:
+            window = reader.read()
+            if window is None:
+                break
+            windows.append(window)
+        if not windows:
+            return
+        if per_channel:
+            data = b"".join(windows)
+            mask = validator.is_valid_buffer(
+                data, reader.block_size, per_channel=True
+            )
+            # one sequence of flags per channel
+            yield list(zip(*mask)) if isinstance(mask, list) else mask.T
+            continue
+        is_valid = getattr(validator, "is_valid", validator)
+        yield [
+            [
+                is_valid(
+                    signal.extract_single_channel(
+                        window, fmt, channels, channel
+                    ).tobytes()
+                )
+                for window in windows
+            ]
+            for channel in range(channels)
+        ]
+
+
+def _iter_channel_runs(masks, channels):
+    """
+    Return one iterator of `(validity, length)` runs for each channel. Masks
+    (see `_iter_channel_masks`) are consumed lazily, when the runs of one
+    channel are exhausted, and runs of other channels are kept until used.
+    """
+    masks = iter(masks)
+    queues = [deque() for _ in range(channels)]
+
+    def iter_runs(queue):
+        while True:
+            while not queue:
+                channel_masks = next(masks, None)
+                if channel_masks is None:
+                    return
+                for channel_queue, mask in zip(queues, channel_masks):
+                    channel_queue.extend(signal.run_lengths(mask))
+            yield queue.popleft()
+
+    return [iter_runs(queue) for queue in queues]
+
+
+def _iter_channel_regions(spans, audio_source, first_sample, reader):
+    """
+    Create single-channel `AudioRegion`s from `(start_frame, channel,
+    end_frame)` spans. See `_iter_regions_from_spans`.
+    """
+    fmt = signal.FORMAT[reader.sw]
+    spans, spans_copy = tee(spans)
+    regions = _iter_regions_from_spans(
+        ((start, end) for start, _, end in spans_copy),
+        audio_source,
+        first_sample,
+        reader,
+    )
+    for (_, channel, _), region in zip(spans, regions):
+        data = signal.extract_single_channel(
+            region._data, fmt, reader.ch, channel
+        )
+        meta = dict(region.meta, channel=channel)
+        yield AudioRegion(data, reader.sr, reader.sw, 1, meta)
+
+
+def _get_batch_validation(validator):
+    """
+    Return the `is_valid_batch` method of `validator` if it is overridden
+    (see `DataValidator.is_valid_batch`), None otherwise.
+    """
+    is_valid_batch = getattr(validator, "is_valid_batch", None)
+    if getattr(type(validator), "is_valid_batch", None) in (
+        None,
+        DataValidator.is_valid_batch,
+    ):
+        return None
+    return is_valid_batch
+
+
+def _iter_batch_runs(reader, is_valid_batch):
+    """
+    Read windows from `reader`, about `_SHARD_DURATION` seconds at a time,
+    check their validity with one call to `is_valid_batch` and yield runs of
+    `(validity, length)`. If numpy is available, windows are passed to
+    `is_valid_batch` as an array of samples (see
+    `DataValidator.is_valid_batch`), otherwise as a list of windows.
+    """
+    nb_windows = max(1, round(_SHARD_DURATION / reader.block_dur))
+    while True:
+        windows = []
+        while len(windows) < nb_windows:
+            window = reader.read()
+            if window is None:
+                break
+            windows.append(window)
+        if not windows:
+            return
+        if not _WITH_NUMPY:
+            yield from signal.run_lengths(is_valid_batch(windows))
+            continue
+        fmt = signal.FORMAT[reader.sw]
+        window_bytes = reader.block_size * reader.sw * reader.ch
+        batches = [windows]
+        if len(windows[-1]) < window_bytes:
+            # a shorter last window is passed alone
+            batches = [windows[:-1], windows[-1:]]
+        for batch in batches:
+            if not batch:
+                continue
+            frame_size = len(batch[0]) // (reader.sw * reader.ch)
+            frames = signal.to_frames(
+                b"".join(batch), fmt, reader.ch, frame_size
+            )
+            if reader.ch == 1:
+                frames = frames[:, :, 0]
+            yield from signal.run_lengths(is_valid_batch(frames))
+
+
+def _check_durations(min_dur, max_dur, max_silence):
+    """
+    Check that split durations are positive, raise a `ValueError` otherwise.
+    """
+    if min_dur <= 0:
+        raise ValueError("'min_dur' ({}) must be > 0".format(min_dur))
+    if max_dur <= 0:
+        raise ValueError("'max_dur' ({}) must be > 0".format(max_dur))
+    if max_silence < 0:
+        raise ValueError("'max_silence' ({}) must be >= 0".format(max_silence))
+
+
+def _make_audio_reader(audio_source, analysis_window, params):
+    """
+    Create an `AudioReader` that reads `audio_source` with windows of
+    `analysis_window` seconds. Raise a `ValueError` if windows are too small
+    to cover one single data sample.
+    """
+    try:
+        return AudioReader(audio_source, block_dur=analysis_window, **params)
+    except TooSamllBlockDuration as exc:
+        err_msg = "Too small 'analysis_windows' ({0}) for sampling rate "
+        err_msg += "({1}). Analysis windows should at least be 1/{1} to "
+        err_msg += "cover one single data sample"
+        raise ValueError(err_msg.format(exc.block_dur, exc.sampling_rate))
+
+
+def _make_energy_validators(reader, kwargs):
+    """
+    Create the energy validator used by `split` (an `AdaptiveEnergyValidator`
+    if `energy_threshold` is "auto") and, if an `offset_energy_threshold` is
+    given in `kwargs`, the offset validator of the tokenizer (None
+    otherwise). Raise a `ValueError` if the offset energy threshold can't be
+    used with the energy threshold.
+    """
+    energy_threshold = kwargs.get(
+        "energy_threshold", kwargs.get("eth", DEFAULT_ENERGY_THRESHOLD)
+    )
+    offset_energy_threshold = kwargs.get(
+        "offset_energy_threshold", kwargs.get("oeth")
+    )
+    use_channel = kwargs.get("use_channel", kwargs.get("uc"))
+    offset_validator = None
+    if offset_energy_threshold is not None:
+        if energy_threshold == "auto":
+            raise ValueError(
+                "'offset_energy_threshold' can not be used with "
+                "energy_threshold='auto'"
+            )
+        if offset_energy_threshold > energy_threshold:
+            raise ValueError(
+                "'offset_energy_threshold' ({}) must be <= "
+                "'energy_threshold' ({})".format(
+                    offset_energy_threshold, energy_threshold
+                )
+            )
+        offset_validator = AudioEnergyValidator(
+            offset_energy_threshold,
+            reader.sw,
+            reader.ch,
+            use_channel=use_channel,
+        )
+    if energy_threshold == "auto":
+        # the horizon is a number of windows as read by reader
+        horizon = max(1, round(_NOISE_FLOOR_HORIZON / reader.hop_dur))
+        validator = AdaptiveEnergyValidator(
+            reader.sw, reader.ch, use_channel=use_channel, horizon=horizon
+        )
+    else:
         validator = AudioEnergyValidator(
-            energy_threshold, source.sw, source.ch, use_channel=use_channel
+            energy_threshold, reader.sw, reader.ch, use_channel=use_channel
         )
+    return validator, offset_validator
+
+
+def _make_tokenizer(
+    validator,
+    analysis_window,
+    min_dur,
+    max_dur,
+    max_silence,
+    drop_trailing_silence,
+    strict_min_dur,
+    offset_validator=None,
+):
+    """
+    Create a `StreamTokenizer` from split parameters given in seconds. Raise
+    a `ValueError` if `min_dur` or `max_silence` are not compatible with
+    `max_dur`.
+    """
     mode = (
         StreamTokenizer.DROP_TRAILING_SILENCE if drop_trailing_silence else 0
     )
@@ -218,23 +895,14 @@ def split(
             )
         )
 
-    tokenizer = StreamTokenizer(
-        validator, min_length, max_length, max_continuous_silence, mode=mode
-    )
-    source.open()
-    token_gen = tokenizer.tokenize(source, generator=True)
-    region_gen = (
-        _make_audio_region(
-            token[0],
-            token[1],
-            source.block_dur,
-            source.sr,
-            source.sw,
-            source.ch,
-        )
-        for token in token_gen
+    return StreamTokenizer(
+        validator,
+        min_length,
+        max_length,
+        max_continuous_silence,
+        mode=mode,
+        offset_validator=offset_validator,
     )
-    return region_gen
 
 
 def _duration_to_nb_windows(
@@ -276,6 +944,54 @@ def _duration_to_nb_windows(
     return int(round_fn(duration / analysis_window + epsilon))
 
 
+def _get_buffer_data(audio_source, kwargs):
+    """
+    Return the data that will be read from `audio_source` by `split` if it is
+    a `BufferAudioSource` or a memory-mapped file audio source, otherwise
+    return None. Audio data starts at the
+    current position of `audio_source` and is limited to `max_read` seconds,
+    if given in `kwargs`.
+    """
+    if not isinstance(
+        audio_source,
+        (BufferAudioSource, MmapRawAudioSource, MmapWaveAudioSource),
+    ):
+        return None
+    bytes_per_sample = audio_source.sw * audio_source.ch
+    data = memoryview(audio_source.data).cast("B")
+    data = data[audio_source.position * bytes_per_sample :]
+    max_read = kwargs.get("max_read", kwargs.get("mr"))
+    if max_read is not None:
+        max_samples = max(round(max_read * audio_source.sr), 0)
+        data = data[: max_samples * bytes_per_sample]
+    return data
+
+
+def _iter_regions_from_overlapping_spans(spans, data, reader):
+    """
+    Helper function to create `AudioRegion`s from `(start_frame, end_frame)`
+    spans returned by a tokenizer that reads overlapping windows of `data`
+    from `reader`. As with the frames kept by the tokenizer, the data of each
+    region is made of all of its windows, one after the other.
+    """
+    bytes_per_sample = reader.sw * reader.ch
+    window_bytes = reader.block_size * bytes_per_sample
+    hop_bytes = reader.hop_size * bytes_per_sample
+    for start_frame, end_frame in spans:
+        frames = [
+            data[i * hop_bytes : i * hop_bytes + window_bytes]
+            for i in range(start_frame, end_frame + 1)
+        ]
+        yield _make_audio_region(
+            frames,
+            start_frame,
+            reader.block_dur,
+            reader.sr,
+            reader.sw,
+            reader.ch,
+        )
+
+
 def _make_audio_region(
     data_frames,
     start_frame,
@@ -315,6 +1031,686 @@ def _make_audio_region(
     return AudioRegion(data, sampling_rate, sample_width, channels, meta)
 
 
+class _HysteresisEnergyValidator(AudioEnergyValidator):
+    """
+    An `AudioEnergyValidator` that compares energies to an onset and to an
+    offset energy thresholds at once and returns hysteresis levels (see
+    `signal.hysteresis_levels`) instead of validity flags. Used by `split` to
+    validate windows beforehand for a tokenizer with an `offset_validator`.
+    """
+
+    def __init__(
+        self,
+        energy_threshold,
+        offset_energy_threshold,
+        sample_width,
+        channels,
+        use_channel=None,
+    ):
+        super(_HysteresisEnergyValidator, self).__init__(
+            energy_threshold, sample_width, channels, use_channel
+        )
+        self._offset_validator = AudioEnergyValidator(
+            offset_energy_threshold, sample_width, channels, use_channel
+        )
+
+    def __reduce__(self):
+        args = (
+            self._energy_threshold,
+            self._offset_validator.energy_threshold,
+            self._sample_width,
+            self._channels,
+            self._use_channel,
+        )
+        return (self.__class__, args)
+
+    def is_valid_energies(self, energies):
+        return signal.hysteresis_levels(
+            super(_HysteresisEnergyValidator, self).is_valid_energies(
+                energies
+            ),
+            self._offset_validator.is_valid_energies(energies),
+        )
+
+
+def _make_runs_validator(validator, offset_validator, reader):
+    """
+    Return the validator used by `split` to validate windows read by
+    `reader` beforehand: `validator` itself or, if `offset_validator` is
+    given (i.e., with hysteresis), a `_HysteresisEnergyValidator` that
+    returns the levels of windows for both energy thresholds at once.
+    """
+    if offset_validator is None:
+        return validator
+    return _HysteresisEnergyValidator(
+        validator.energy_threshold,
+        offset_validator.energy_threshold,
+        reader.sw,
+        reader.ch,
+        use_channel=validator.use_channel,
+    )
+
+
+def _compute_energy_track(audio_source, validator, reader):
+    """
+    Compute the energy of all analysis windows of `audio_source`, a seekable
+    audio source at position 0, one shard of `_SHARD_DURATION` seconds at a
+    time, so that memory usage doesn't depend on audio duration. Position of
+    `audio_source` is then reset to 0. Requires numpy.
+    """
+    window_size = reader.block_size
+    nb_windows = max(1, round(_SHARD_DURATION * reader.sr / window_size))
+    shard_size = nb_windows * window_size
+    energies = []
+    while True:
+        data = audio_source.read(shard_size)
+        if not data:
+            break
+        energies.append(validator.energy_track(data, window_size))
+        if len(data) // (audio_source.sw * audio_source.ch) < shard_size:
+            break
+    audio_source.rewind()
+    if not energies:
+        return np.zeros(0)
+    return np.concatenate(energies)
+
+
+def _get_sidecar_runs(filename, audio_source, validator, reader):
+    """
+    Load the energy track of audio file `filename` from its sidecar file, or
+    compute and save it if the sidecar is missing or stale, and return the
+    run-length encoded validity of analysis windows read by `reader` from
+    `audio_source`, a seekable audio source of `filename` at position 0.
+    """
+    params = {
+        "sampling_rate": reader.sr,
+        "sample_width": reader.sw,
+        "channels": reader.ch,
+    }
+    use_channel = validator.use_channel
+    energies = load_energy_track(
+        filename, reader.block_dur, use_channel, **params
+    )
+    if energies is None:
+        energies = _compute_energy_track(audio_source, validator, reader)
+        save_energy_track(
+            filename, energies, reader.block_dur, use_channel, **params
+        )
+    if reader.max_read is None:
+        return signal.run_lengths(validator.is_valid_energies(energies))
+    max_samples = max(round(reader.max_read * reader.sr), 0)
+    nb_windows, tail_size = divmod(max_samples, reader.block_size)
+    runs = signal.run_lengths(
+        validator.is_valid_energies(energies[:nb_windows])
+    )
+    if tail_size > 0 and len(energies) > nb_windows:
+        # last window read by reader is shorter than a sidecar window
+        audio_source.position = nb_windows * reader.block_size
+        tail = audio_source.read(tail_size)
+        audio_source.rewind()
+        runs += signal.run_lengths(validator.is_valid_buffer(tail, tail_size))
+    return runs
+
+
+def _min_valid_rms(energy_threshold):
+    """
+    Return the smallest integer RMS (>= 1) of a window whose log energy is
+    >= `energy_threshold`. As energies are computed from integer RMS values,
+    a window is valid if and only if its RMS is at least this value.
+    """
+    min_rms = max(math.ceil(10 ** (energy_threshold / 20)), 1)
+    while min_rms > 1 and 20 * math.log10(min_rms - 1) >= energy_threshold:
+        min_rms -= 1
+    while 20 * math.log10(min_rms) < energy_threshold:
+        min_rms += 1
+    return min_rms
+
+
+def _coarse_energy_threshold(energy_threshold, factor):
+    """
+    Return an energy threshold for coarse windows of `factor` analysis
+    windows such that all analysis windows of a coarse window whose energy
+    is below it have an energy below `energy_threshold`. Return None if
+    there is no such threshold (i.e., if all coarse windows might contain a
+    valid analysis window).
+    """
+    min_rms = _min_valid_rms(energy_threshold)
+    # the mean square of a coarse window is at least `1 / factor` times that
+    # of any of its analysis windows, keep a margin for rounding errors
+    min_coarse_rms = math.floor(min_rms / math.sqrt(factor))
+    min_coarse_rms -= _COARSE_RMS_MARGIN
+    if min_coarse_rms < 1:
+        return None
+    return 20 * math.log10(min_coarse_rms)
+
+
+def _make_coarse_to_fine_validator(
+    validator, energy_threshold, reader, coarse_window
+):
+    """
+    Return a `_CoarseToFineValidator` that validates analysis windows of
+    `reader` with `validator` only within coarse windows of about
+    `coarse_window` seconds that might contain valid windows, or `validator`
+    if such coarse windows can't be used. `energy_threshold` is the lowest
+    energy threshold used by `validator`.
+    """
+    factor = round(coarse_window / reader.block_dur)
+    if factor < 2:
+        return validator
+    coarse_threshold = _coarse_energy_threshold(energy_threshold, factor)
+    if coarse_threshold is None:
+        return validator
+    coarse_validator = AudioEnergyValidator(
+        coarse_threshold, reader.sw, reader.ch, validator.use_channel
+    )
+    return _CoarseToFineValidator(
+        validator, coarse_validator, factor, reader.sw, reader.ch
+    )
+
+
+class _CoarseToFineValidator:
+    """
+    Validate analysis windows of audio data in two passes: the energy of
+    coarse windows of `factor` analysis windows is computed first with
+    `coarse_validator` then analysis windows are validated with `validator`
+    only within coarse windows accepted by `coarse_validator`, all other
+    analysis windows are non-valid. Results are the same as those of
+    `validator` if `coarse_validator`'s threshold is computed with
+    `_coarse_energy_threshold`.
+    """
+
+    def __init__(
+        self, validator, coarse_validator, factor, sample_width, channels
+    ):
+        self._validator = validator
+        self._coarse_validator = coarse_validator
+        self._factor = factor
+        self._sample_bytes = sample_width * channels
+
+    def is_valid_buffer(self, data, window_size):
+        data = to_byte_view(data)
+        window_bytes = window_size * self._sample_bytes
+        coarse_size = window_size * self._factor
+        coarse_mask = self._coarse_validator.is_valid_buffer(data, coarse_size)
+        if len(data) % (coarse_size * self._sample_bytes) != 0:
+            # windows of a shorter last coarse window can't be skipped
+            coarse_mask[-1] = True
+        nb_windows = -(-len(data) // window_bytes)
+        masks = []
+        window = 0
+        for is_candidate, nb_coarse_windows in signal.run_lengths(coarse_mask):
+            stop = min(window + nb_coarse_windows * self._factor, nb_windows)
+            if is_candidate:
+                block = data[window * window_bytes : stop * window_bytes]
+                mask = self._validator.is_valid_buffer(block, window_size)
+                masks.append(mask)
+            else:
+                masks.append([False] * (stop - window))
+            window = stop
+        if _WITH_NUMPY:
+            return np.concatenate(masks) if masks else np.zeros(0, bool)
+        return list(chain.from_iterable(masks))
+
+
+def _iter_shard_runs(audio_source, validator, reader, first_sample):
+    """
+    Same as `_validate_shards_in_parallel` but shards are lazily validated,
+    one at a time, in the calling process. `audio_source`'s position is set
+    before each read, so regions can be read from it in between.
+    """
+    window_size = reader.block_size
+    nb_windows = max(1, round(_SHARD_DURATION * reader.sr / window_size))
+    shard_size = nb_windows * window_size
+    last_sample = None
+    if reader.max_read is not None:
+        last_sample = first_sample + max(round(reader.max_read * reader.sr), 0)
+    next_sample = first_sample
+    while last_sample is None or next_sample < last_sample:
+        size = shard_size
+        if last_sample is not None:
+            size = min(size, last_sample - next_sample)
+        try:
+            audio_source.position = next_sample
+            data = audio_source.read(size)
+        except IndexError:
+            # shard starts after the end of file
+            data = None
+        if data is None:
+            return
+        mask = validator.is_valid_buffer(data, window_size)
+        yield from signal.run_lengths(mask)
+        if len(data) // (audio_source.sw * audio_source.ch) < size:
+            return
+        next_sample += size
+
+
+class _BoundaryRefiner:
+    """
+    Move the boundaries of regions detected with an energy threshold from
+    analysis window edges to the first (resp. last) sample of audio activity.
+
+    A region start is searched for in the first window of the region and in
+    the window before it, as the first sample of the first short window of
+    `refinement_size` samples whose energy is >= `onset_threshold`. A region
+    end is searched for in the last window of the region and in the window
+    after it, as the last sample of the last short window whose energy is
+    >= `offset_threshold`. Boundaries are only moved where an analysis window
+    whose energy is above the threshold is contiguous to a window whose
+    energy is below it (i.e., not where a region is truncated because of its
+    maximum duration, nor at the end of a region that keeps its trailing
+    silence).
+    """
+
+    def __init__(
+        self,
+        onset_threshold,
+        offset_threshold,
+        refinement_size,
+        reader,
+        use_channel=None,
+    ):
+        self._onset_rms = _min_valid_rms(onset_threshold)
+        self._offset_rms = _min_valid_rms(offset_threshold)
+        self._refinement_size = refinement_size
+        self._block_size = reader.block_size
+        self._sample_width = reader.sw
+        self._channels = reader.ch
+        self._any_channel = use_channel in (None, "any")
+        self._selector = make_channel_selector(
+            reader.sw, reader.ch, use_channel
+        )
+
+    def _sums_of_squares(self, data):
+        # cumulative sums of squared samples of each selected channel, sums
+        # are computed with integers so that the validity of a window is the
+        # same as with its integer RMS
+        if self._channels == 1:
+            channels = [signal.to_array(data, self._sample_width, 1)]
+        elif self._any_channel:
+            channels = list(self._selector(data))
+        else:
+            channels = [self._selector(data)]
+        return [
+            [0, *accumulate(int(x) ** 2 for x in samples)]
+            for samples in channels
+        ]
+
+    def _is_valid(self, sums, start, stop, min_rms):
+        if stop <= start:
+            return False
+        min_sum = min_rms ** 2 * (stop - start)
+        return any(x[stop] - x[start] >= min_sum for x in sums)
+
+    def refine(self, audio_source, start, stop, first_sample, lower, upper):
+        """
+        Return refined `(start, stop)` sample positions of a region that
+        starts at `start` and stops at `stop` in `audio_source`. `lower` is
+        the lowest possible refined start (e.g., the end of the previous
+        region) and `upper`, if not None, the highest possible refined stop.
+        """
+        block_size = self._block_size
+        size = self._refinement_size
+        offset = max(first_sample, start - block_size)
+        end = stop + block_size
+        if upper is not None:
+            end = min(end, upper)
+        position = audio_source.position
+        audio_source.position = offset
+        data = audio_source.read(end - offset)
+        audio_source.position = position
+        sums = self._sums_of_squares(data)
+        end = offset + len(sums[0]) - 1
+        # the last window of region might be shorter than `block_size` at
+        # the end of data
+        stop = min(stop, end)
+        last_window = start + (stop - start - 1) // block_size * block_size
+        new_start = start
+        # the window before region (if any) starts at `offset`
+        if not self._is_valid(sums, 0, start - offset, self._onset_rms):
+            first = max(lower, offset) - offset
+            last = min(start + block_size, end) - size - offset
+            for i in range(first, last + 1):
+                if self._is_valid(sums, i, i + size, self._onset_rms):
+                    new_start = offset + i
+                    break
+        new_stop = stop
+        if self._is_valid(
+            sums, last_window - offset, stop - offset, self._offset_rms
+        ) and not self._is_valid(
+            sums, stop - offset, end - offset, self._offset_rms
+        ):
+            first = last_window + size - offset
+            for i in range(end - offset, first - 1, -1):
+                if self._is_valid(sums, i - size, i, self._offset_rms):
+                    new_stop = offset + i
+                    break
+        if new_stop <= new_start:
+            return start, stop
+        return new_start, new_stop
+
+
+def _make_boundary_refiner(
+    validator, offset_validator, reader, analysis_window, refinement_window
+):
+    """
+    Return a `_BoundaryRefiner` that refines the boundaries of regions
+    detected with `validator` (and `offset_validator`, if given) using
+    windows of `refinement_window` seconds, or None if `refinement_window`
+    is None or if `validator` is not an `AudioEnergyValidator`. Raise a
+    `ValueError` if `refinement_window` is not within `]0, analysis_window]`.
+    """
+    if refinement_window is None:
+        return None
+    if not 0 < refinement_window <= analysis_window:
+        raise ValueError(
+            "'refinement_window' ({}) must be > 0 and <= "
+            "'analysis_window' ({})".format(refinement_window, analysis_window)
+        )
+    if not isinstance(validator, AudioEnergyValidator):
+        return None
+    return _BoundaryRefiner(
+        validator.energy_threshold,
+        (offset_validator or validator).energy_threshold,
+        max(1, round(refinement_window * reader.sr)),
+        reader,
+        validator.use_channel,
+    )
+
+
+def _iter_refined_spans(
+    spans, refiner, audio_source, first_sample, max_sample, sampling_rate
+):
+    """
+    Refine `(start, stop, start_time)` sample spans of regions (see
+    `_iter_sample_spans`) with `refiner` and yield refined spans. A refined
+    start never goes before the refined stop of the previous region.
+    """
+    previous_stop = first_sample
+    for start, stop, _ in spans:
+        start, stop = refiner.refine(
+            audio_source, start, stop, first_sample, previous_stop, max_sample
+        )
+        previous_stop = stop
+        yield start, stop, (start - first_sample) / sampling_rate
+
+
+def _validate_shard(audio_source, validator, window_size, first_sample, size):
+    """
+    Read `size` samples from `audio_source` starting at `first_sample` and
+    return the run-length encoded validity of the read analysis windows, as
+    well as the number of read samples. Called in worker processes by
+    `_validate_shards_in_parallel`.
+    """
+    audio_source.open()
+    try:
+        audio_source.position = first_sample
+        data = audio_source.read(size)
+    except IndexError:
+        # shard starts after the end of file
+        data = None
+    finally:
+        audio_source.close()
+    if data is None:
+        return [], 0
+    runs = signal.run_lengths(validator.is_valid_buffer(data, window_size))
+    return runs, len(data) // (audio_source.sw * audio_source.ch)
+
+
+def _validate_shards_in_parallel(
+    audio_source, validator, reader, first_sample, workers
+):
+    """
+    Helper function to validate analysis windows of a file in parallel. Data
+    from `first_sample` until the end of file (or until `reader.max_read` is
+    reached) is divided into shards of whole analysis windows that are
+    validated in `workers` processes.
+
+    Returns
+    -------
+    runs : list
+        `(is_valid, nb_windows)` tuples, the run-length encoded validity of
+        all windows in the same order as windows in file.
+    """
+    window_size = reader.block_size
+    nb_windows = max(1, round(_SHARD_DURATION * reader.sr / window_size))
+    shard_size = nb_windows * window_size
+    last_sample = None
+    if reader.max_read is not None:
+        last_sample = first_sample + max(round(reader.max_read * reader.sr), 0)
+    runs = []
+    pending = deque()
+    next_sample = first_sample
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < 2 * workers and (
+                last_sample is None or next_sample < last_sample
+            ):
+                size = shard_size
+                if last_sample is not None:
+                    size = min(size, last_sample - next_sample)
+                future = executor.submit(
+                    _validate_shard,
+                    audio_source,
+                    validator,
+                    window_size,
+                    next_sample,
+                    size,
+                )
+                pending.append((future, size))
+                next_sample += size
+            if not pending:
+                break
+            future, size = pending.popleft()
+            shard_runs, nb_samples = future.result()
+            runs.extend(shard_runs)
+            if nb_samples < size:
+                # end of file reached, no need for remaining shards
+                for future, _ in pending:
+                    future.cancel()
+                break
+    return runs
+
+
+def _select_validity_runs(
+    input, audio_source, reader, validator, offset_validator, kwargs
+):
+    """
+    Select how `split` validates beforehand the analysis windows read by
+    `reader` from `audio_source` and return the run-length encoded validity
+    of windows (i.e., runs of hysteresis levels if `offset_validator` is
+    given, see `StreamTokenizer._iter_run_tokens`). Return None if windows
+    should rather be validated one by one by the tokenizer, which is always
+    the case if `audio_source` is not seekable.
+    """
+    if not isinstance(audio_source, Rewindable):
+        return None
+    overlapping = reader.hop_size < reader.block_size
+    if not isinstance(validator, AudioEnergyValidator):
+        is_valid_batch = _get_batch_validation(validator)
+        if is_valid_batch is None or overlapping:
+            return None
+        # validity of large blocks of windows is checked at once
+        return _iter_batch_runs(reader, is_valid_batch)
+    runs_validator = _make_runs_validator(validator, offset_validator, reader)
+    if overlapping:
+        data = _get_buffer_data(audio_source, kwargs)
+        if data is None or not _WITH_NUMPY:
+            # without numpy, overlapping windows are faster validated one by
+            # one by the tokenizer
+            return None
+        # overlapping windows are a strided view of data, all windows are
+        # validated at once without being copied
+        mask = runs_validator.is_valid_buffer(
+            data, reader.block_size, hop_size=reader.hop_size
+        )
+        return signal.run_lengths(mask)
+    if kwargs.get("energy_sidecar", False) and isinstance(input, str):
+        return _get_sidecar_runs(input, audio_source, runs_validator, reader)
+    # validator used for blocks of data (i.e., shards of a file or data in
+    # memory), possibly with a coarse pass to skip silent windows. With
+    # numpy, energies of all windows are computed in one vectorized pass,
+    # a coarse pass (that still reads every sample) can't save time
+    shards_validator = runs_validator
+    coarse_window = kwargs.get("coarse_window")
+    if coarse_window is not None and not _WITH_NUMPY:
+        shards_validator = _make_coarse_to_fine_validator(
+            runs_validator,
+            (offset_validator or validator).energy_threshold,
+            reader,
+            coarse_window,
+        )
+    first_sample = audio_source.position
+    is_file = isinstance(audio_source, (RawAudioSource, WaveAudioSource))
+    workers = kwargs.get("workers", 1)
+    if workers > 1 and is_file:
+        return _validate_shards_in_parallel(
+            audio_source, shards_validator, reader, first_sample, workers
+        )
+    data = _get_buffer_data(audio_source, kwargs)
+    if data is not None:
+        # all data is in memory, compute validity of all windows at once
+        mask = shards_validator.is_valid_buffer(data, reader.block_size)
+        return signal.run_lengths(mask)
+    if is_file:
+        # shards are validated lazily, one at a time
+        return _iter_shard_runs(
+            audio_source, shards_validator, reader, first_sample
+        )
+    return None
+
+
+def _sweep_spans(
+    energies, configs, analysis_window, sample_width, channels, use_channel
+):
+    """
+    Helper function to detect `(start_frame, end_frame)` spans of audio
+    events for each config of split parameters in `configs`, from the log
+    energies of analysis windows. Validity runs are computed once for each
+    energy threshold. Called by `sweep`, possibly in worker processes.
+    """
+    runs = {}
+    results = []
+    for config in configs:
+        validator = AudioEnergyValidator(
+            config["energy_threshold"],
+            sample_width,
+            channels,
+            use_channel=use_channel,
+        )
+        tokenizer = _make_tokenizer(
+            validator,
+            analysis_window,
+            config["min_dur"],
+            config["max_dur"],
+            config["max_silence"],
+            config["drop_trailing_silence"],
+            config["strict_min_dur"],
+        )
+        threshold = config["energy_threshold"]
+        if threshold not in runs:
+            mask = validator.is_valid_energies(energies)
+            runs[threshold] = signal.run_lengths(mask)
+        results.append(list(tokenizer._iter_run_tokens(runs[threshold])))
+    return results
+
+
+def _get_nb_samples(audio_source):
+    """
+    Return the number of samples of `audio_source`, a seekable audio source,
+    without reading its data. Position of `audio_source` is restored.
+    """
+    position = audio_source.position
+    try:
+        # negative positions are relative to the end of audio source
+        audio_source.position = -1
+        nb_samples = audio_source.position + 1
+    except IndexError:
+        # empty audio source
+        nb_samples = 0
+    audio_source.position = position
+    return nb_samples
+
+
+def _iter_sample_spans(spans, first_sample, reader, max_sample=None):
+    """
+    Convert `(start_frame, end_frame)` spans of windows read by `reader` from
+    `first_sample` into `(start, stop, start_time)` spans, where `start` and
+    `stop` are sample positions in the audio source of `reader`, `stop` being
+    limited to `max_sample` if given, and `start_time` is in seconds.
+    """
+    block_size = reader.block_size
+    for start_frame, end_frame in spans:
+        start = first_sample + start_frame * block_size
+        stop = first_sample + (end_frame + 1) * block_size
+        if max_sample is not None:
+            stop = min(stop, max_sample)
+        yield start, stop, start_frame * reader.block_dur
+
+
+def _iter_regions_from_spans(
+    spans, audio_source, first_sample, reader, lazy=False, refiner=None
+):
+    """
+    Helper function to create `AudioRegion`s from `(start_frame, end_frame)`
+    spans returned by a tokenizer that reads windows from `reader`. Data of
+    each region is read back, with one single read, from `audio_source`, the
+    seekable audio source of `reader`, whose position is restored after each
+    read. If `lazy` is True, `LazyAudioRegion`s that read their data on first
+    access are created instead. If `refiner` is given, region boundaries are
+    refined to sample positions before regions are created.
+
+    Parameters
+    ----------
+    spans : iterable
+        `(start_frame, end_frame)` tuples.
+    audio_source : Rewindable
+        audio source read by `reader`.
+    first_sample : int
+        position of `audio_source` when `reader` started reading from it.
+    reader : AudioReader
+        reader with non-overlapping windows used by tokenizer.
+    lazy : bool, default: False
+        whether to create `LazyAudioRegion`s.
+    refiner : _BoundaryRefiner, default: None
+        object used to refine region boundaries.
+    """
+    max_sample = None
+    if reader.max_read is not None:
+        max_samples = max(round(reader.max_read * reader.sr), 0)
+        max_sample = first_sample + max_samples
+    if lazy:
+        # the last window of a lazy region might be shorter than
+        # `block_size`, its length can't be deduced from read data
+        nb_samples = _get_nb_samples(audio_source)
+        if max_sample is None or max_sample > nb_samples:
+            max_sample = nb_samples
+    sample_spans = _iter_sample_spans(spans, first_sample, reader, max_sample)
+    if refiner is not None:
+        sample_spans = _iter_refined_spans(
+            sample_spans,
+            refiner,
+            audio_source,
+            first_sample,
+            max_sample,
+            reader.sr,
+        )
+    for start, stop, start_time in sample_spans:
+        if lazy:
+            meta = {
+                "start": start_time,
+                "end": start_time + (stop - start) / reader.sr,
+            }
+            yield LazyAudioRegion(audio_source, start, stop - start, meta)
+            continue
+        position = audio_source.position
+        audio_source.position = start
+        data = audio_source.read(stop - start)
+        audio_source.position = position
+        duration = len(data) / (reader.sr * reader.sw * reader.ch)
+        meta = {"start": start_time, "end": start_time + duration}
+        yield AudioRegion(data, reader.sr, reader.sw, reader.ch, meta)
+
+
 def _read_chunks_online(max_read, **kwargs):
     """
     Helper function to read audio data from an online blocking source
@@ -415,6 +1811,8 @@ class _SecondsView:
     indices in seconds.
     """
 
+    __slots__ = ("_region",)
+
     def __init__(self, region):
         self._region = region
 
@@ -440,6 +1838,8 @@ class _MillisView(_SecondsView):
     indices in milliseconds.
     """
 
+    __slots__ = ()
+
     def __getitem__(self, index):
         err_msg = (
             "Slicing AudioRegion by milliseconds requires indices of type "
@@ -469,6 +1869,8 @@ class _AudioRegionMetadata(dict):
     """A class to store `AudioRegion`'s metadata.
     """
 
+    __slots__ = ()
+
     def __getattr__(self, name):
         if name in self:
             return self[name]
@@ -487,6 +1889,17 @@ class _AudioRegionMetadata(dict):
 
 
 class AudioRegion(object):
+
+    __slots__ = (
+        "_data",
+        "_sampling_rate",
+        "_sample_width",
+        "_channels",
+        "_samples",
+        "_meta",
+        "__weakref__",
+    )
+
     def __init__(self, data, sampling_rate, sample_width, channels, meta=None):
         """
         AudioRegion encapsulates raw audio data and provides an interface to
@@ -495,8 +1908,11 @@ class AudioRegion(object):
 
         Parameters
         ----------
-        data : bytes
-            raw audio data as a bytes object
+        data : bytes-like
+            raw audio data as a bytes object or as any object that supports
+            the buffer protocol (e.g., `bytearray`, `memoryview`, `array` or
+            `numpy.ndarray`). Such objects are not copied, the region is a
+            view of their data.
         sampling_rate : int
             sampling rate of audio data
         sample_width : int
@@ -514,25 +1930,19 @@ class AudioRegion(object):
 
         """
         check_audio_data(data, sample_width, channels)
-        self._data = data
+        self._data = to_byte_view(data)
+        self._init_attributes(sampling_rate, sample_width, channels, meta)
+
+    def _init_attributes(self, sampling_rate, sample_width, channels, meta):
         self._sampling_rate = sampling_rate
         self._sample_width = sample_width
         self._channels = channels
         self._samples = None
-        self.splitp = self.split_and_plot
-
         if meta is not None:
             self._meta = _AudioRegionMetadata(meta)
         else:
             self._meta = None
 
-        self._seconds_view = _SecondsView(self)
-        self.sec = self.seconds
-        self.s = self.seconds
-
-        self._millis_view = _MillisView(self)
-        self.ms = self.millis
-
     @property
     def meta(self):
         return self._meta
@@ -609,20 +2019,28 @@ class AudioRegion(object):
 
     @property
     def seconds(self):
-        return self._seconds_view
+        """
+        A view to slice audio region by seconds (alias `sec` and `s`).
+        """
+        return _SecondsView(self)
+
+    sec = s = seconds
 
     @property
     def millis(self):
-        return self._millis_view
+        """
+        A view to slice audio region by milliseconds (alias `ms`).
+        """
+        return _MillisView(self)
+
+    ms = millis
 
     @property
     def duration(self):
         """
         Returns region duration in seconds.
         """
-        return len(self._data) / (
-            self.sampling_rate * self.sample_width * self.channels
-        )
+        return len(self) / self.sampling_rate
 
     @property
     def sampling_rate(self):
@@ -668,7 +2086,9 @@ class AudioRegion(object):
         if player is None:
             player = player_for(self)
         player.play(
-            self._data, progress_bar=progress_bar, **progress_bar_kwargs
+            bytes(self._data),
+            progress_bar=progress_bar,
+            **progress_bar_kwargs
         )
 
     def save(
@@ -821,6 +2241,9 @@ class AudioRegion(object):
             eth = kwargs.get(
                 "energy_threshold", kwargs.get("eth", DEFAULT_ENERGY_THRESHOLD)
             )
+            if eth == "auto":
+                # threshold is not constant
+                eth = None
             plot(
                 self,
                 scale_signal=scale_signal,
@@ -836,6 +2259,8 @@ class AudioRegion(object):
         except ImportError:
             raise RuntimeWarning("Plotting requires matplotlib")
 
+    splitp = split_and_plot
+
     def __array__(self):
         return self.samples
 
@@ -861,7 +2286,7 @@ class AudioRegion(object):
         return len(self)
 
     def __bytes__(self):
-        return self._data
+        return bytes(self._data)
 
     def __str__(self):
         return (
@@ -874,12 +2299,7 @@ class AudioRegion(object):
     def __repr__(self):
         return str(self)
 
-    def __add__(self, other):
-        """
-        Concatenates this region and `other` and return a new region.
-        Both regions must have the same sampling rate, sample width
-        and number of channels. If not, raises a `ValueError`.
-        """
+    def _check_concatenable(self, other):
         if not isinstance(other, AudioRegion):
             raise TypeError(
                 "Can only concatenate AudioRegion, "
@@ -900,7 +2320,100 @@ class AudioRegion(object):
                 "Can only concatenate AudioRegions of the same "
                 "number of channels ({} != {})".format(self.ch, other.ch)
             )
-        data = self._data + other._data
+
+    def _join_data(self, regions, separator):
+        """
+        Check that all `regions` have the same audio parameters as this
+        region and join their data, in one single allocation, with
+        `separator` inserted between them.
+        """
+        params = (self.sr, self.sw, self.ch)
+        data = []
+        for region in regions:
+            if (
+                not isinstance(region, AudioRegion)
+                or (region.sr, region.sw, region.ch) != params
+            ):
+                self._check_concatenable(region)
+            data.append(region._data)
+        return bytes(separator).join(data)
+
+    @staticmethod
+    def concatenate(regions):
+        """
+        Concatenate many regions and return a new region. All regions must
+        have the same sampling rate, sample width and number of channels.
+
+        Unlike `sum(regions)`, which creates a new region for each addition
+        and is therefore quadratic in the total length of regions, data is
+        copied once into a newly allocated region. `regions` can be any
+        iterable, including a generator returned by `split`, in which case
+        detected regions are not kept in memory (e.g.,
+        `AudioRegion.concatenate(split("audio.wav"))` returns a copy of
+        "audio.wav" without silence).
+
+        Parameters
+        ----------
+        regions : iterable
+            `AudioRegion`s to concatenate.
+
+        Returns
+        -------
+        region : AudioRegion
+            concatenation of all regions.
+
+        Raises
+        ------
+        TypeError if an element of `regions` is not an `AudioRegion`.
+        ValueError if `regions` is empty or if regions have different audio
+        parameters.
+
+        See also
+        --------
+        AudioRegion.join
+        """
+        regions = iter(regions)
+        try:
+            first = next(regions)
+        except StopIteration:
+            raise ValueError("Can't concatenate an empty iterable of regions")
+        if not isinstance(first, AudioRegion):
+            raise TypeError(
+                "Can only concatenate AudioRegion, "
+                'not "{}"'.format(type(first))
+            )
+        data = first._join_data(chain((first,), regions), b"")
+        return AudioRegion(data, first.sr, first.sw, first.ch)
+
+    def join(self, regions):
+        """
+        Concatenate `regions` with this region inserted between them (e.g.,
+        a short silence), like `bytes.join` does. Data is copied once into a
+        newly allocated region, see `AudioRegion.concatenate`. All regions
+        must have the same audio parameters as this region. If `regions` is
+        empty, an empty region is returned.
+
+        Parameters
+        ----------
+        regions : iterable
+            `AudioRegion`s to join.
+
+        Returns
+        -------
+        region : AudioRegion
+            regions joined by this region.
+        """
+        data = self._join_data(regions, self._data)
+        return AudioRegion(data, self.sr, self.sw, self.ch)
+
+    def __add__(self, other):
+        """
+        Concatenates this region and `other` and return a new region.
+        Both regions must have the same sampling rate, sample width
+        and number of channels. If not, raises a `ValueError`.
+        """
+        self._check_concatenable(other)
+        data = b"".join((self._data, other._data))
         return AudioRegion(data, self.sr, self.sw, self.ch)
 
     def __radd__(self, other):
@@ -908,17 +2421,19 @@ class AudioRegion(object):
         Concatenates `other` and this region. `other` should be an
         `AudioRegion` with the same audio parameters as this region
         but can exceptionally be `0` to make it possible to concatenate
-        many regions with `sum`.
+        many regions with `sum`. Use `AudioRegion.concatenate` to
+        concatenate many regions in linear time.
         """
         if other == 0:
             return self
-        return other.add(self)
+        self._check_concatenable(other)
+        return other + self
 
     def __mul__(self, n):
         if not isinstance(n, int):
             err_msg = "Can't multiply AudioRegion by a non-int of type '{}'"
             raise TypeError(err_msg.format(type(n)))
-        data = self._data * n
+        data = bytes(self._data) * n
         return AudioRegion(data, self.sr, self.sw, self.ch)
 
     def __rmul__(self, n):
@@ -977,6 +2492,107 @@ class AudioRegion(object):
         return AudioRegion(data, self.sr, self.sw, self.ch)
 
 
+class LazyAudioRegion(AudioRegion):
+
+    __slots__ = ("_audio_source", "_offset", "_length", "_loaded_data")
+
+    def __init__(self, audio_source, offset, length, meta=None):
+        """
+        An `AudioRegion` whose data is not held in memory but read from a
+        seekable audio source on first access (e.g., by `bytes()`,
+        `samples`, `save()` or `play()`). Once read, data is kept by the
+        region. Slicing a `LazyAudioRegion` returns a `LazyAudioRegion` that
+        doesn't read any data.
+
+        Parameters
+        ----------
+        audio_source : Rewindable
+            audio source to read data from. If it is closed when data is
+            read, it is opened and closed again after reading. Its position
+            is restored after reading.
+        offset : int
+            position, in number of samples, of region's first sample in
+            `audio_source`.
+        length : int
+            number of samples of region.
+        meta : dict, default: None
+            region metadata, see `AudioRegion`.
+        """
+        self._audio_source = audio_source
+        self._offset = offset
+        self._length = length
+        self._loaded_data = None
+        self._init_attributes(
+            audio_source.sr, audio_source.sw, audio_source.ch, meta
+        )
+
+    @property
+    def _data(self):
+        if self._loaded_data is None:
+            self._loaded_data = self._read_data()
+        return self._loaded_data
+
+    @property
+    def offset(self):
+        """
+        Position, in number of samples, of region's first sample in audio
+        source.
+        """
+        return self._offset
+
+    def _read_data(self):
+        audio_source = self._audio_source
+        was_open = audio_source.is_open()
+        if not was_open:
+            audio_source.open()
+        position = audio_source.position
+        try:
+            audio_source.position = self._offset
+            data = audio_source.read(self._length)
+        finally:
+            audio_source.position = position
+            if not was_open:
+                audio_source.close()
+        if data is None:
+            return b""
+        return to_byte_view(data)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if self._loaded_data is not None:
+            return super(LazyAudioRegion, self).__getitem__(index)
+        err_msg = "Slicing AudioRegion by samples requires indices of type "
+        err_msg += "'int' without a step (e.g. region.sec[1600:3200])"
+        start_sample, stop_sample = _check_convert_index(index, (int), err_msg)
+        start, stop, _ = slice(start_sample, stop_sample).indices(len(self))
+        return LazyAudioRegion(
+            self._audio_source, self._offset + start, max(stop - start, 0)
+        )
+
+
+class _FrameCounter:
+    """
+    A list-like object used by `StreamTokenizer` instead of a list of frames
+    when tokens are made of spans only. It only counts appended frames.
+    """
+
+    __slots__ = ("_count",)
+
+    def __init__(self, count=0):
+        self._count = count
+
+    def append(self, frame):
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return _FrameCounter(len(range(self._count)[index]))
+
+
 class StreamTokenizer:
     """
     Class for stream tokenizers. It implements a 4-state automaton scheme
@@ -1033,6 +2649,22 @@ class StreamTokenizer:
     event if it is shorter than `min_length` (given that the above
     conditions are fulfilled of course).
 
+    `batch_size` : *(int, default=None)*
+        If given and `validator` overrides `DataValidator.is_valid_batch`,
+        number of frames read from data source before checking their
+        validity with one single call to `is_valid_batch`. Tokens might then
+        be delivered up to `batch_size` frames later than with `is_valid`.
+        If None, the validity of each frame is checked as soon as it is read
+        (e.g., for real-time processing).
+
+    `offset_validator` : *(callable, DataValidator, default=None)*
+        If given, validator used instead of `validator` once a token has
+        started (i.e., `validator` must accept a frame to start a token,
+        `offset_validator` to continue it). With a less strict
+        `offset_validator` (e.g., a lower energy threshold), tokenization
+        uses hysteresis: events whose level hovers around the threshold of
+        `validator` are not fragmented into many small tokens.
+
     :Examples:
 
     In the following code, without `STRICT_MIN_LENGTH`, the 'BB' token is
@@ -1161,6 +2793,8 @@ class StreamTokenizer:
         init_min=0,
         init_max_silence=0,
         mode=0,
+        batch_size=None,
+        offset_validator=None,
     ):
         if callable(validator):
             self._is_valid = validator
@@ -1172,6 +2806,16 @@ class StreamTokenizer:
                 "DataValidator"
             )
 
+        if offset_validator is None or callable(offset_validator):
+            self._is_offset_valid = offset_validator
+        elif isinstance(offset_validator, DataValidator):
+            self._is_offset_valid = offset_validator.is_valid
+        else:
+            raise TypeError(
+                "'offset_validator' must be a callable or an instance of "
+                "DataValidator"
+            )
+
         if max_length <= 0:
             raise ValueError(
                 "'max_length' must be > 0 (value={0})".format(max_length)
@@ -1201,11 +2845,17 @@ class StreamTokenizer:
         self.max_continuous_silence = max_continuous_silence
         self.init_min = init_min
         self.init_max_silent = init_max_silence
+        self.batch_size = batch_size
+        self._is_valid_batch = _get_batch_validation(validator)
+        self.offset_validator = offset_validator
+        self._is_offset_valid_batch = _get_batch_validation(offset_validator)
         self._set_mode(mode)
         self._deliver = None
         self._tokens = None
         self._state = None
         self._data = None
+        self._new_data = list
+        self._spans_only = False
         self._contiguous_token = False
         self._init_count = 0
         self._silence_length = 0
@@ -1226,15 +2876,19 @@ class StreamTokenizer:
         self._strict_min_length = (mode & self.STRICT_MIN_LENGTH) != 0
         self._drop_trailing_silence = (mode & self.DROP_TRAILING_SILENCE) != 0
 
-    def _reinitialize(self):
+    def _reinitialize(self, spans_only=False):
+        self._spans_only = spans_only
+        self._new_data = _FrameCounter if spans_only else list
         self._contiguous_token = False
-        self._data = []
+        self._data = self._new_data()
         self._tokens = []
         self._state = self.SILENCE
         self._current_frame = -1
         self._deliver = self._append_token
 
-    def tokenize(self, data_source, callback=None, generator=False):
+    def tokenize(
+        self, data_source, callback=None, generator=False, spans_only=False
+    ):
         """
         Read data from `data_source`, one frame a time, and process the read
         frames in order to detect sequences of frames that make up valid
@@ -1250,6 +2904,13 @@ class StreamTokenizer:
                If a `callback` function is given, it will be called each time
                a valid token is found.
 
+           `spans_only` : bool, default: False
+               If True, read frames are not kept by the tokenizer and tokens
+               are `(start, end)` tuples (`callback` should then take 2
+               arguments). Use this to avoid storing (and copying) frames if
+               token data can be retrieved from elsewhere (e.g., from a
+               seekable audio source).
+
 
         :Returns:
            A list of tokens if `callback` is None. Each token is tuple with the
@@ -1262,7 +2923,51 @@ class StreamTokenizer:
            where `data` is a list of read frames, `start`: index of the first
            frame in the original data and `end` : index of the last frame.
         """
-        token_gen = self._iter_tokens(data_source)
+        token_gen = self._iter_tokens(data_source, spans_only)
+        if callback:
+            for token in token_gen:
+                callback(*token)
+            return
+        if generator:
+            return token_gen
+        return list(token_gen)
+
+    def tokenize_mask(
+        self, mask, callback=None, generator=False, offset_mask=None
+    ):
+        """
+        Detect tokens using precomputed validity flags of frames instead of
+        reading and validating frames one by one. `mask` is run-length
+        encoded and tokenization rules are applied to runs of valid or
+        non-valid frames rather than to single frames. Computation cost is
+        thus proportional to the number of runs (and tokens) and not to the
+        number of frames. Tokens are the same as those returned by
+        `tokenize` for a data source whose frames have the validity given
+        by `mask`.
+
+        :Parameters:
+           `mask` : a numpy boolean array or a sequence of booleans
+               validity of each frame of the data to tokenize.
+
+           `callback` : an optional 2-argument function.
+               If a `callback` function is given, it will be called with the
+               start and end frames of each detected token.
+
+           `offset_mask` : a numpy boolean array or a sequence of booleans
+               validity of each frame for `offset_validator`. If given,
+               tokens are the same as those returned by `tokenize` with an
+               `offset_validator`.
+
+        :Returns:
+           A list of `(start, end)` tuples if `callback` is None, where
+           `start` and `end` are the indices of the first and last frames
+           of a token.
+        """
+        if offset_mask is None:
+            token_gen = self._iter_run_tokens(signal.run_lengths(mask))
+        else:
+            levels = signal.hysteresis_levels(mask, offset_mask)
+            token_gen = self._iter_run_tokens(signal.run_lengths(levels), True)
         if callback:
             for token in token_gen:
                 callback(*token)
@@ -1271,8 +2976,184 @@ class StreamTokenizer:
             return token_gen
         return list(token_gen)
 
-    def _iter_tokens(self, data_source):
-        self._reinitialize()
+    def _iter_run_tokens(self, runs, hysteresis=False):  # noqa: C901
+        # This mirrors the automaton implemented in `_process` but each step
+        # consumes as many frames as possible (i.e., until the next state
+        # change or token delivery) from a run of same validity frames.
+        # If `hysteresis` is True, runs are runs of hysteresis levels (see
+        # `signal.hysteresis_levels`) and the validity of frames depends on
+        # the current state.
+        min_length = self.min_length
+        max_length = self.max_length
+        max_silence = self.max_continuous_silence
+        init_min = self.init_min
+        init_max_silence = self.init_max_silent
+        state = self.SILENCE
+        length = 0
+        silence_length = 0
+        init_count = 0
+        start_frame = 0
+        contiguous_token = False
+
+        def end_of_detection(last_frame, truncated=False):
+            nonlocal length, start_frame, contiguous_token
+            if (
+                not truncated
+                and self._drop_trailing_silence
+                and silence_length > 0
+            ):
+                length = max(length - silence_length, 0)
+            token = None
+            if length >= min_length or (
+                length > 0
+                and not self._strict_min_length
+                and contiguous_token
+            ):
+                token = (start_frame, start_frame + length - 1)
+                if truncated:
+                    start_frame = last_frame + 1
+                    contiguous_token = True
+                else:
+                    contiguous_token = False
+            else:
+                contiguous_token = False
+            length = 0
+            return token
+
+        frame = 0
+        for run_value, run_length in runs:
+            run_end = frame + run_length
+            frame_is_valid = run_value
+            while frame < run_end:
+                remaining = run_end - frame
+                token = None
+                if hysteresis:
+                    if state in (self.NOISE, self.POSSIBLE_SILENCE):
+                        frame_is_valid = run_value & 1
+                    else:
+                        frame_is_valid = run_value & 2
+
+                if state == self.SILENCE:
+                    if not frame_is_valid:
+                        frame = run_end
+                        continue
+                    init_count = 1
+                    silence_length = 0
+                    start_frame = frame
+                    length = 1
+                    if init_count >= init_min:
+                        state = self.NOISE
+                        if length >= max_length:
+                            token = end_of_detection(frame, True)
+                    else:
+                        state = self.POSSIBLE_NOISE
+                    frame += 1
+
+                elif state == self.POSSIBLE_NOISE:
+                    if frame_is_valid:
+                        nb_frames = init_min - init_count
+                        silence_length = 0
+                        if remaining < nb_frames:
+                            init_count += remaining
+                            length += remaining
+                            frame = run_end
+                        else:
+                            init_count += nb_frames
+                            length += nb_frames
+                            frame += nb_frames
+                            state = self.NOISE
+                            if length >= max_length:
+                                token = end_of_detection(frame - 1, True)
+                    else:
+                        # number of frames until either init_max_silence or
+                        # max_length is reached, then back to silence
+                        nb_frames = max(
+                            1,
+                            min(
+                                init_max_silence - silence_length + 1,
+                                max_length - length,
+                            ),
+                        )
+                        if remaining < nb_frames:
+                            silence_length += remaining
+                            length += remaining
+                            frame = run_end
+                        else:
+                            silence_length += nb_frames
+                            length = 0
+                            state = self.SILENCE
+                            frame += nb_frames
+
+                elif state == self.NOISE:
+                    if frame_is_valid:
+                        nb_frames = max(1, max_length - length)
+                        if remaining < nb_frames:
+                            length += remaining
+                            frame = run_end
+                        else:
+                            length += nb_frames
+                            frame += nb_frames
+                            token = end_of_detection(frame - 1, True)
+                    elif max_silence <= 0:
+                        state = self.SILENCE
+                        token = end_of_detection(frame)
+                        frame += 1
+                    else:
+                        silence_length = 1
+                        length += 1
+                        state = self.POSSIBLE_SILENCE
+                        if length == max_length:
+                            token = end_of_detection(frame, True)
+                        frame += 1
+
+                else:  # POSSIBLE_SILENCE
+                    if frame_is_valid:
+                        length += 1
+                        silence_length = 0
+                        state = self.NOISE
+                        if length >= max_length:
+                            token = end_of_detection(frame, True)
+                        frame += 1
+                    elif silence_length >= max_silence:
+                        state = self.SILENCE
+                        if silence_length < length:
+                            token = end_of_detection(frame)
+                        else:
+                            length = 0
+                            silence_length = 0
+                        frame += 1
+                    else:
+                        # number of frames until either max_continuous_silence
+                        # or max_length is reached
+                        nb_frames = min(
+                            max_silence - silence_length,
+                            max(1, max_length - length),
+                        )
+                        if remaining < nb_frames:
+                            length += remaining
+                            silence_length += remaining
+                            frame = run_end
+                        else:
+                            length += nb_frames
+                            silence_length += nb_frames
+                            frame += nb_frames
+                            if length >= max_length:
+                                token = end_of_detection(frame - 1, True)
+
+                if token is not None:
+                    yield token
+
+        if state in (self.NOISE, self.POSSIBLE_SILENCE):
+            if length > 0 and length > silence_length:
+                token = end_of_detection(frame)
+                if token is not None:
+                    yield token
+
+    def _iter_tokens(self, data_source, spans_only=False):
+        self._reinitialize(spans_only)
+        if self._is_valid_batch is not None and self.batch_size is not None:
+            yield from self._iter_tokens_batch(data_source)
+            return
         while True:
             frame = data_source.read()
             self._current_frame += 1
@@ -1285,9 +3166,51 @@ class StreamTokenizer:
             if token is not None:
                 yield token
 
-    def _process(self, frame):  # noqa: C901
+    def _iter_tokens_batch(self, data_source):
+        # same as `_iter_tokens` but the validity of frames is checked with
+        # one call to `is_valid_batch` every `batch_size` frames
+        batch_size = max(1, self.batch_size)
+        while True:
+            frames = []
+            while len(frames) < batch_size:
+                frame = data_source.read()
+                if frame is None:
+                    break
+                frames.append(frame)
+            if frames:
+                mask = self._is_valid_batch(frames)
+                if self._is_offset_valid is None:
+                    offset_mask = mask
+                elif self._is_offset_valid_batch is not None:
+                    offset_mask = self._is_offset_valid_batch(frames)
+                else:
+                    offset_mask = [self._is_offset_valid(f) for f in frames]
+                for frame, onset, offset in zip(frames, mask, offset_mask):
+                    self._current_frame += 1
+                    if self._state in (self.NOISE, self.POSSIBLE_SILENCE):
+                        frame_is_valid = offset
+                    else:
+                        frame_is_valid = onset
+                    token = self._process(frame, bool(frame_is_valid))
+                    if token is not None:
+                        yield token
+            if len(frames) < batch_size:
+                self._current_frame += 1
+                token = self._post_process()
+                if token is not None:
+                    yield token
+                break
+
+    def _process(self, frame, frame_is_valid=None):  # noqa: C901
 
-        frame_is_valid = self._is_valid(frame)
+        if frame_is_valid is None:
+            if self._is_offset_valid is not None and self._state in (
+                self.NOISE,
+                self.POSSIBLE_SILENCE,
+            ):
+                frame_is_valid = self._is_offset_valid(frame)
+            else:
+                frame_is_valid = self._is_valid(frame)
 
         if self._state == self.SILENCE:
 
@@ -1324,7 +3247,7 @@ class StreamTokenizer:
                 ):
                     # either init_max_silent or max_length is reached
                     # before _init_count, back to silence
-                    self._data = []
+                    self._data = self._new_data()
                     self._state = self.SILENCE
                 else:
                     self._data.append(frame)
@@ -1367,7 +3290,7 @@ class StreamTokenizer:
                     if self._silence_length < len(self._data):
                         # _deliver only gathered frames aren't all silent
                         return self._process_end_of_detection()
-                    self._data = []
+                    self._data = self._new_data()
                     self._silence_length = 0
                 else:
                     self._data.append(frame)
@@ -1402,8 +3325,11 @@ class StreamTokenizer:
             start_frame = self._start_frame
             end_frame = self._start_frame + len(self._data) - 1
             data = self._data
-            self._data = []
-            token = (data, start_frame, end_frame)
+            self._data = self._new_data()
+            if self._spans_only:
+                token = (start_frame, end_frame)
+            else:
+                token = (data, start_frame, end_frame)
 
             if truncated:
                 # next token (if any) will start at _current_frame + 1
@@ -1416,7 +3342,7 @@ class StreamTokenizer:
         else:
             self._contiguous_token = False
 
-        self._data = []
+        self._data = self._new_data()
 
     def _append_token(self, data, start, end):
         self._tokens.append((data, start, end))
@@ -10,8 +10,11 @@ Class summary
         Rewindable
         BufferAudioSource
         WaveAudioSource
+        MmapRawAudioSource
+        MmapWaveAudioSource
         PyAudioSource
         StdinAudioSource
+        PrefetchAudioSource
         PyAudioPlayer
 
 Function summary
@@ -22,15 +25,32 @@ Function summary
         from_file
         to_file
         player_for
+        save_energy_track
+        load_energy_track
+        energy_track_path
 """
 import os
 import sys
+import mmap
 import wave
+import json
+import struct
+import hashlib
 import warnings
+import threading
+from io import BytesIO
+from queue import Queue, Empty, Full
 from abc import ABC, abstractmethod
 from functools import partial
 from .exceptions import AudioIOError, AudioParameterError
 
+try:
+    import numpy as np
+
+    _WITH_NUMPY = True
+except ImportError:
+    _WITH_NUMPY = False
+
 try:
     from pydub import AudioSegment
 
@@ -56,29 +76,51 @@ __all__ = [
     "BufferAudioSource",
     "RawAudioSource",
     "WaveAudioSource",
+    "MmapRawAudioSource",
+    "MmapWaveAudioSource",
     "PyAudioSource",
     "StdinAudioSource",
+    "PrefetchAudioSource",
     "PyAudioPlayer",
     "from_file",
     "to_file",
     "player_for",
+    "save_energy_track",
+    "load_energy_track",
+    "energy_track_path",
 ]
 
 DEFAULT_SAMPLING_RATE = 16000
 DEFAULT_SAMPLE_WIDTH = 2
 DEFAULT_NB_CHANNELS = 1
+_ENERGY_TRACK_MAGIC = b"AUDITOK-ETRACK"
+_ENERGY_TRACK_VERSION = 1
+_ENERGY_TRACK_ALIGNMENT = 64
 
 
 def check_audio_data(data, sample_width, channels):
     sample_size_bytes = int(sample_width * channels)
-    nb_samples = len(data) // sample_size_bytes
-    if nb_samples * sample_size_bytes != len(data):
+    nb_bytes = memoryview(data).nbytes
+    nb_samples = nb_bytes // sample_size_bytes
+    if nb_samples * sample_size_bytes != nb_bytes:
         raise AudioParameterError(
             "The length of audio data must be an integer "
             "multiple of `sample_width * channels`"
         )
 
 
+def to_byte_view(data):
+    """
+    Return `data` if it is a bytes object, otherwise return a memoryview of
+    `data` whose items are bytes. `data` can be any object that supports the
+    buffer protocol (e.g., `bytearray`, `memoryview`, `array` or
+    `numpy.ndarray`), slicing the returned object uses offsets in bytes.
+    """
+    if isinstance(data, bytes):
+        return data
+    return memoryview(data).cast("B")
+
+
 def _guess_audio_format(fmt, filename):
     if fmt is None:
         extension = os.path.splitext(filename.lower())[1][1:]
@@ -282,6 +324,17 @@ class BufferAudioSource(Rewindable):
     An :class:`AudioSource` that encapsulates and reads data from a memory
     buffer. It implements methods from :class:`Rewindable` and is therefore
     a navigable :class:`AudioSource`.
+
+    :Parameters:
+
+    `data`: bytes-like
+        audio data. Can be a `bytes` object or any object that supports the
+        buffer protocol (e.g., `bytearray`, `memoryview`, `array` or
+        `numpy.ndarray`).
+    `zero_copy`: bool
+        if True, :func:`read` returns `memoryview` slices of `data` instead
+        of copies. Returned data is then only valid as long as `data` is not
+        modified.
     """
 
     def __init__(
@@ -290,10 +343,15 @@ class BufferAudioSource(Rewindable):
         sampling_rate=DEFAULT_SAMPLING_RATE,
         sample_width=DEFAULT_SAMPLE_WIDTH,
         channels=DEFAULT_NB_CHANNELS,
+        zero_copy=False,
     ):
         AudioSource.__init__(self, sampling_rate, sample_width, channels)
         check_audio_data(data, sample_width, channels)
         self._data = data
+        self._buffer = to_byte_view(data)
+        if zero_copy and isinstance(self._buffer, bytes):
+            self._buffer = memoryview(self._buffer)
+        self._zero_copy = zero_copy
         self._sample_size_all_channels = sample_width * channels
         self._current_position_bytes = 0
         self._is_open = False
@@ -316,9 +374,11 @@ class BufferAudioSource(Rewindable):
         else:
             bytes_to_read = self._sample_size_all_channels * size
             offset = self._current_position_bytes + bytes_to_read
-        data = self._data[self._current_position_bytes : offset]
+        data = self._buffer[self._current_position_bytes : offset]
         if data:
             self._current_position_bytes += len(data)
+            if isinstance(data, memoryview) and not self._zero_copy:
+                return data.tobytes()
             return data
         return None
 
@@ -326,6 +386,21 @@ class BufferAudioSource(Rewindable):
     def data(self):
         return self._data
 
+    @property
+    def zero_copy(self):
+        return self._zero_copy
+
+    def view(self, start, stop=None):
+        """
+        Return a `memoryview` of audio data from sample `start` to sample
+        `stop` (or to the end of data if None), regardless of the current
+        position. Data is not copied.
+        """
+        sample_size = self._sample_size_all_channels
+        if stop is not None:
+            stop *= sample_size
+        return memoryview(self._buffer)[start * sample_size : stop]
+
     def rewind(self):
         self.position = 0
 
@@ -338,8 +413,8 @@ class BufferAudioSource(Rewindable):
     def position(self, position):
         position *= self._sample_size_all_channels
         if position < 0:
-            position += len(self.data)
-        if position < 0 or position > len(self.data):
+            position += len(self._buffer)
+        if position < 0 or position > len(self._buffer):
             raise IndexError("Position out of range")
         self._current_position_bytes = position
 
@@ -366,6 +441,12 @@ class FileAudioSource(AudioSource):
         if self.is_open():
             self.close()
 
+    def __getstate__(self):
+        # an open stream can't be pickled, an unpickled source is closed
+        state = self.__dict__.copy()
+        state["_audio_stream"] = None
+        return state
+
     def is_open(self):
         return self._audio_stream is not None
 
@@ -387,7 +468,13 @@ class FileAudioSource(AudioSource):
         return data
 
 
-class RawAudioSource(FileAudioSource):
+class RawAudioSource(FileAudioSource, Rewindable):
+    """
+    A class for an `AudioSource` that reads data from a raw (headerless)
+    audio file. It implements methods from :class:`Rewindable` and is
+    therefore a navigable :class:`AudioSource`.
+    """
+
     def __init__(self, file, sampling_rate, sample_width, channels):
         FileAudioSource.__init__(self, sampling_rate, sample_width, channels)
         self._file = file
@@ -406,12 +493,35 @@ class RawAudioSource(FileAudioSource):
         data = self._audio_stream.read(bytes_to_read)
         return data
 
+    def rewind(self):
+        self.position = 0
+
+    @property
+    def position(self):
+        """Stream position in number of samples"""
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        return self._audio_stream.tell() // self._sample_size
+
+    @position.setter
+    def position(self, position):
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        nb_samples = os.fstat(self._audio_stream.fileno()).st_size
+        nb_samples //= self._sample_size
+        if position < 0:
+            position += nb_samples
+        if position < 0 or position > nb_samples:
+            raise IndexError("Position out of range")
+        self._audio_stream.seek(position * self._sample_size)
+
 
-class WaveAudioSource(FileAudioSource):
+class WaveAudioSource(FileAudioSource, Rewindable):
     """
     A class for an `AudioSource` that reads data from a wave file.
     This class should be used for large wave files to avoid loading
-    the whole data to memory.
+    the whole data to memory. It implements methods from :class:`Rewindable`
+    and is therefore a navigable :class:`AudioSource`.
 
     :Parameters:
 
@@ -440,6 +550,212 @@ class WaveAudioSource(FileAudioSource):
             size = -1
         return self._audio_stream.readframes(size)
 
+    def rewind(self):
+        self.position = 0
+
+    @property
+    def position(self):
+        """Stream position in number of samples"""
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        return self._audio_stream.tell()
+
+    @position.setter
+    def position(self, position):
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        nb_samples = self._audio_stream.getnframes()
+        if position < 0:
+            position += nb_samples
+        if position < 0 or position > nb_samples:
+            raise IndexError("Position out of range")
+        self._audio_stream.setpos(position)
+
+
+class _MappedAudioSourceMixin(ABC):
+    """
+    Mixin for file audio sources whose audio data is memory-mapped when the
+    source is opened. Reads are slices of the mapped data, there is no system
+    call per read and audio data is never fully loaded to memory. Subclasses
+    should implement `_locate_audio_data` and define `_path`.
+    """
+
+    @abstractmethod
+    def _locate_audio_data(self, fp):
+        """
+        Return the offset and the size in bytes of audio data in open file
+        `fp`.
+        """
+
+    def open(self):
+        if self._audio_stream is not None:
+            return
+        with open(self._path, "rb") as fp:
+            offset, size = self._locate_audio_data(fp)
+            if size > 0:
+                # the mapping remains valid after file is closed
+                stream = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # an empty file can't be mapped
+                stream = mmap.mmap(-1, 1)
+                offset = 0
+        self._audio_stream = stream
+        self._buffer = memoryview(stream)[offset : offset + size]
+        self._sample_size = self.sample_width * self.channels
+        self._position_bytes = 0
+
+    def close(self):
+        if self._audio_stream is not None:
+            try:
+                self._buffer.release()
+                self._audio_stream.close()
+            except BufferError:
+                # zero-copy data returned by `read` is still referenced,
+                # mapping is closed when this data is garbage-collected
+                pass
+            self._audio_stream = None
+            self._buffer = None
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_buffer"] = None
+        return state
+
+    @property
+    def data(self):
+        """
+        Memory-mapped audio data, as a `memoryview`. Only available when
+        the source is open.
+        """
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        return self._buffer
+
+    @property
+    def zero_copy(self):
+        return self._zero_copy
+
+    def view(self, start, stop=None):
+        """
+        Return a `memoryview` of memory-mapped audio data from sample `start`
+        to sample `stop` (or to the end of data if None), regardless of the
+        current position. Only available when the source is open.
+        """
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        if stop is not None:
+            stop *= self._sample_size
+        return self._buffer[start * self._sample_size : stop]
+
+    def _read_from_stream(self, size):
+        start = self._position_bytes
+        if size is None or size < 0:
+            stop = len(self._buffer)
+        else:
+            stop = min(start + size * self._sample_size, len(self._buffer))
+        self._position_bytes = stop
+        data = self._buffer[start:stop]
+        if self._zero_copy:
+            return data
+        return data.tobytes()
+
+    def rewind(self):
+        self.position = 0
+
+    @property
+    def position(self):
+        """Stream position in number of samples"""
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        return self._position_bytes // self._sample_size
+
+    @position.setter
+    def position(self, position):
+        if not self.is_open():
+            raise AudioIOError("Audio stream is not open")
+        nb_samples = len(self._buffer) // self._sample_size
+        if position < 0:
+            position += nb_samples
+        if position < 0 or position > nb_samples:
+            raise IndexError("Position out of range")
+        self._position_bytes = position * self._sample_size
+
+
+class MmapRawAudioSource(_MappedAudioSourceMixin, RawAudioSource):
+    """
+    A :class:`RawAudioSource` that memory-maps audio file when it's opened
+    instead of reading data from file one window at a time.
+
+    :Parameters:
+
+        `file` :
+            path to a raw audio file.
+        `sampling_rate`, `sample_width`, `channels` : int
+            audio parameters of file.
+        `zero_copy` : bool
+            if True, :func:`read` returns `memoryview` slices of the mapped
+            data instead of copies (see :class:`BufferAudioSource`).
+    """
+
+    def __init__(
+        self, file, sampling_rate, sample_width, channels, zero_copy=False
+    ):
+        RawAudioSource.__init__(
+            self, file, sampling_rate, sample_width, channels
+        )
+        self._path = file
+        self._zero_copy = zero_copy
+
+    def _locate_audio_data(self, fp):
+        return 0, os.fstat(fp.fileno()).st_size
+
+
+class MmapWaveAudioSource(_MappedAudioSourceMixin, WaveAudioSource):
+    """
+    A :class:`WaveAudioSource` that memory-maps audio file when it's opened
+    instead of reading data from file one window at a time. Wave header is
+    parsed once to locate audio data in file.
+
+    :Parameters:
+
+        `filename` :
+            path to a valid wave file.
+        `zero_copy` : bool
+            if True, :func:`read` returns `memoryview` slices of the mapped
+            data instead of copies (see :class:`BufferAudioSource`).
+    """
+
+    def __init__(self, filename, zero_copy=False):
+        WaveAudioSource.__init__(self, filename)
+        self._path = filename
+        self._zero_copy = zero_copy
+
+    def _locate_audio_data(self, fp):
+        offset, size = _find_wave_data_chunk(fp)
+        sample_size = self.sample_width * self.channels
+        return offset, size // sample_size * sample_size
+
+
+def _find_wave_data_chunk(fp):
+    """
+    Return the offset and the size in bytes of the data chunk of open wave
+    file `fp`. Size is limited to the actual size of file.
+    """
+    header = fp.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+        raise AudioIOError("File is not a valid wave file")
+    file_size = os.fstat(fp.fileno()).st_size
+    offset = 12
+    while offset + 8 <= file_size:
+        fp.seek(offset)
+        chunk_id, chunk_size = struct.unpack("<4sI", fp.read(8))
+        offset += 8
+        if chunk_id == b"data":
+            return offset, min(chunk_size, file_size - offset)
+        # chunks are word-aligned
+        offset += chunk_size + (chunk_size & 1)
+    raise AudioIOError("Wave file has no data chunk")
+
 
 class PyAudioSource(AudioSource):
     """
@@ -535,6 +851,198 @@ class StdinAudioSource(FileAudioSource):
         return None
 
 
+class PrefetchAudioSource(AudioSource):
+    """
+    An :class:`AudioSource` that reads data from another audio source (e.g.,
+    a :class:`WaveAudioSource`, a :class:`RawAudioSource`, a
+    :class:`StdinAudioSource` or a :class:`BufferAudioSource`) on a
+    background thread. Data is read in chunks of `chunk_dur` seconds and
+    kept in a queue of at most `max_chunks` chunks, so that reading (and
+    decoding) audio data overlaps with its processing. Data returned by
+    :func:`read` is the same as that of `audio_source`. Like a stream, a
+    :class:`PrefetchAudioSource` is not rewindable.
+
+    Queue statistics (see :attr:`stats`) help choosing `chunk_dur` and
+    `max_chunks`: if the queue is often empty when data is read, reading is
+    slower than processing and prefetching can't help much; if it's often
+    full, a smaller queue would use less memory.
+
+    :Parameters:
+
+        `audio_source` : AudioSource
+            audio source to read data from.
+        `chunk_dur` : float, default: 0.5
+            duration in seconds of chunks read from `audio_source`.
+        `max_chunks` : int, default: 8
+            maximum number of chunks in queue.
+    """
+
+    def __init__(self, audio_source, chunk_dur=0.5, max_chunks=8):
+        AudioSource.__init__(
+            self, audio_source.sr, audio_source.sw, audio_source.ch
+        )
+        if chunk_dur <= 0:
+            raise ValueError(
+                "'chunk_dur' must be > 0, given: {}".format(chunk_dur)
+            )
+        if max_chunks < 1:
+            raise ValueError(
+                "'max_chunks' must be >= 1, given: {}".format(max_chunks)
+            )
+        self._audio_source = audio_source
+        self._chunk_size = max(1, round(chunk_dur * audio_source.sr))
+        self._max_chunks = max_chunks
+        self._sample_size = audio_source.sw * audio_source.ch
+        self._thread = None
+        self._queue = None
+        self._stop = threading.Event()
+        self._reset()
+
+    def _reset(self):
+        self._buffer = BytesIO()
+        self._end_of_stream = False
+        self._nb_chunks = 0
+        self._nb_gets = 0
+        self._sum_queue_depth = 0
+        self._max_queue_depth = 0
+        self._nb_empty_queue = 0
+        self._nb_full_queue = 0
+
+    @property
+    def audio_source(self):
+        return self._audio_source
+
+    @property
+    def queue_depth(self):
+        """Number of chunks currently in queue."""
+        if self._queue is None:
+            return 0
+        return self._queue.qsize()
+
+    @property
+    def stats(self):
+        """
+        Queue statistics as a dictionary with the following keys:
+
+        - "chunks": number of chunks of data read from queue.
+        - "mean_queue_depth": mean number of chunks in queue when one is
+          needed by :func:`read`.
+        - "max_queue_depth": maximum number of chunks in queue when one is
+          needed by :func:`read`.
+        - "empty_queue": number of times the queue was empty when a chunk
+          was needed (i.e., :func:`read` waited for data).
+        - "full_queue": number of times the queue was full when a chunk was
+          put in it (i.e., the background thread waited for :func:`read`).
+        """
+        mean_queue_depth = 0
+        if self._nb_gets > 0:
+            mean_queue_depth = self._sum_queue_depth / self._nb_gets
+        return {
+            "chunks": self._nb_chunks,
+            "mean_queue_depth": mean_queue_depth,
+            "max_queue_depth": self._max_queue_depth,
+            "empty_queue": self._nb_empty_queue,
+            "full_queue": self._nb_full_queue,
+        }
+
+    def is_open(self):
+        return self._thread is not None
+
+    def open(self):
+        if self._thread is not None:
+            return
+        self._audio_source.open()
+        self._reset()
+        self._stop.clear()
+        self._queue = Queue(self._max_chunks)
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._queue = None
+        self._audio_source.close()
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+            return
+        except Full:
+            self._nb_full_queue += 1
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+    def _prefetch(self):
+        # runs on background thread, None marks the end of stream and an
+        # exception raised by audio source is passed to the reading thread
+        try:
+            while not self._stop.is_set():
+                chunk = self._audio_source.read(self._chunk_size)
+                if isinstance(chunk, memoryview):
+                    chunk = chunk.tobytes()
+                self._put(chunk)
+                if chunk is None:
+                    return
+        except Exception as exc:
+            self._put(exc)
+
+    def _next_chunk(self):
+        # return next chunk from queue, or None at the end of stream
+        if self._end_of_stream:
+            return None
+        depth = self._queue.qsize()
+        if depth == 0:
+            self._nb_empty_queue += 1
+        chunk = self._queue.get()
+        self._nb_gets += 1
+        self._sum_queue_depth += depth
+        self._max_queue_depth = max(self._max_queue_depth, depth)
+        if chunk is None or isinstance(chunk, Exception):
+            self._end_of_stream = True
+            if chunk is not None:
+                raise chunk
+            return None
+        self._nb_chunks += 1
+        return chunk
+
+    def read(self, size):
+        if self._thread is None:
+            raise AudioIOError("Audio stream is not open")
+        if size is None or size < 0:
+            blocks = [self._buffer.read()]
+            chunk = self._next_chunk()
+            while chunk is not None:
+                blocks.append(chunk)
+                chunk = self._next_chunk()
+        else:
+            size_bytes = size * self._sample_size
+            block = self._buffer.read(size_bytes)
+            if len(block) == size_bytes:
+                return block
+            blocks = [block]
+            missing = size_bytes - len(block)
+            while missing > 0:
+                chunk = self._next_chunk()
+                if chunk is None:
+                    break
+                self._buffer = BytesIO(chunk)
+                block = self._buffer.read(missing)
+                blocks.append(block)
+                missing -= len(block)
+        data = b"".join(blocks)
+        if not data:
+            return None
+        return data
+
+
 def make_tqdm_progress_bar(iterable, total, duration, **tqdm_kwargs):
     fmt = tqdm_kwargs.get("bar_format", DEFAULT_BAR_FORMAT_TQDM)
     fmt = fmt.replace("{duration}", "{:.3f}".format(duration))
@@ -644,17 +1152,23 @@ def get_audio_source(input=None, **kwargs):
 
     Parameters:
 
-        ´input´ : str, bytes, "-" or None
+        ´input´ : str, bytes, bytearray, memoryview, "-" or None
         Source to read audio data from. If str, it should be a path to a valid
-        audio file. If bytes, it is interpreted as raw audio data. if equals to
+        audio file. If bytes, bytearray or memoryview, it is interpreted as
+        raw audio data (use `zero_copy=True` to read data without copying it,
+        see :class:`BufferAudioSource`). if equals to
         "-", raw data will be read from stdin. If None, read audio data from
         microphone using PyAudio.
     """
     if input == "-":
         return StdinAudioSource(*_get_audio_parameters(kwargs))
 
-    if isinstance(input, bytes):
-        return BufferAudioSource(input, *_get_audio_parameters(kwargs))
+    if isinstance(input, (bytes, bytearray, memoryview)):
+        return BufferAudioSource(
+            input,
+            *_get_audio_parameters(kwargs),
+            zero_copy=kwargs.get("zero_copy", False)
+        )
 
     # read data from a file
     if input is not None:
@@ -671,7 +1185,15 @@ def get_audio_source(input=None, **kwargs):
         )
 
 
-def _load_raw(file, sampling_rate, sample_width, channels, large_file=False):
+def _load_raw(
+    file,
+    sampling_rate,
+    sample_width,
+    channels,
+    large_file=False,
+    use_mmap=True,
+    zero_copy=False,
+):
     """
     Load a raw audio file with standard Python.
     If `large_file` is True, audio data will be lazily
@@ -691,6 +1213,12 @@ def _load_raw(file, sampling_rate, sample_width, channels, large_file=False):
         `large_file`: bool
             If True, return a `RawAudioSource` object that reads data lazily
             from disk, otherwise load all data and return a `BufferAudioSource`
+        `use_mmap`: bool
+            If True (default) and `large_file` is True, return a
+            `MmapRawAudioSource` that memory-maps `file` if it is a regular
+            file.
+        `zero_copy`: bool
+            passed to `MmapRawAudioSource` or `BufferAudioSource`.
 
     :Returns:
 
@@ -702,6 +1230,14 @@ def _load_raw(file, sampling_rate, sample_width, channels, large_file=False):
         )
 
     if large_file:
+        if use_mmap and _is_regular_file(file):
+            return MmapRawAudioSource(
+                file,
+                sampling_rate=sampling_rate,
+                sample_width=sample_width,
+                channels=channels,
+                zero_copy=zero_copy,
+            )
         return RawAudioSource(
             file,
             sampling_rate=sampling_rate,
@@ -716,17 +1252,26 @@ def _load_raw(file, sampling_rate, sample_width, channels, large_file=False):
         sampling_rate=sampling_rate,
         sample_width=sample_width,
         channels=channels,
+        zero_copy=zero_copy,
     )
 
 
-def _load_wave(filename, large_file=False):
+def _is_regular_file(file):
+    # pipes and character devices (e.g., /dev/stdin) can't be mapped
+    return isinstance(file, str) and os.path.isfile(file)
+
+
+def _load_wave(filename, large_file=False, use_mmap=True, zero_copy=False):
     """
     Load a wave audio file with standard Python.
     If `large_file` is True, audio data will be lazily
-    loaded to memory.
+    loaded to memory, using a memory-mapped `MmapWaveAudioSource` if
+    `use_mmap` is True (default) and `filename` is a regular file.
 
     """
     if large_file:
+        if use_mmap and _is_regular_file(filename):
+            return MmapWaveAudioSource(filename, zero_copy=zero_copy)
         return WaveAudioSource(filename)
     with wave.open(filename) as fp:
         channels = fp.getnchannels()
@@ -734,7 +1279,11 @@ def _load_wave(filename, large_file=False):
         swidth = fp.getsampwidth()
         data = fp.readframes(-1)
     return BufferAudioSource(
-        data, sampling_rate=srate, sample_width=swidth, channels=channels
+        data,
+        sampling_rate=srate,
+        sample_width=swidth,
+        channels=channels,
+        zero_copy=zero_copy,
     )
 
 
@@ -797,6 +1346,14 @@ def from_file(filename, audio_format=None, large_file=False, **kwargs):
 
     :kwargs:
 
+    `use_mmap`: bool, default: True
+        if `large_file` is True, memory-map a wave or raw file (see
+        :class:`MmapWaveAudioSource` and :class:`MmapRawAudioSource`) instead
+        of reading it one window at a time.
+    `zero_copy`: bool, default: False
+        if True, `read` returns `memoryview`s of audio data instead of copies
+        (see :class:`BufferAudioSource`).
+
     If an audio format other than `raw` is used, the following keyword
     arguments are required:
 
@@ -818,12 +1375,24 @@ def from_file(filename, audio_format=None, large_file=False, **kwargs):
     """
     audio_format = _guess_audio_format(audio_format, filename)
 
+    use_mmap = kwargs.get("use_mmap", True)
+    zero_copy = kwargs.get("zero_copy", False)
     if audio_format == "raw":
         srate, swidth, channels = _get_audio_parameters(kwargs)
-        return _load_raw(filename, srate, swidth, channels, large_file)
+        return _load_raw(
+            filename,
+            srate,
+            swidth,
+            channels,
+            large_file,
+            use_mmap=use_mmap,
+            zero_copy=zero_copy,
+        )
 
     if audio_format in ["wav", "wave"]:
-        return _load_wave(filename, large_file)
+        return _load_wave(
+            filename, large_file, use_mmap=use_mmap, zero_copy=zero_copy
+        )
     if large_file:
         err_msg = "if 'large_file` is True file format should be raw or wav"
         raise AudioIOError(err_msg)
@@ -927,3 +1496,158 @@ def to_file(data, file, audio_format=None, **kwargs):
     else:
         err_message = "cannot write file format {} (file name: {})"
         raise AudioIOError(err_message.format(audio_format, file))
+
+
+def energy_track_path(filename, analysis_window, use_channel=None):
+    """
+    Return the path of the energy track sidecar of audio file `filename`
+    computed with `analysis_window` and `use_channel`. Sidecars are saved
+    next to audio files, one for each combination of these parameters.
+    """
+    use_channel = _normalize_use_channel(use_channel)
+    key = "{!r}:{!r}".format(float(analysis_window), use_channel)
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    return "{}.{}.etrack".format(filename, digest)
+
+
+def _normalize_use_channel(use_channel):
+    if use_channel == "any":
+        return None
+    if use_channel in ("avg", "average"):
+        return "mix"
+    return use_channel
+
+
+def _file_content_hash(filename):
+    sha = hashlib.sha1()
+    with open(filename, "rb") as fp:
+        for chunk in iter(partial(fp.read, 1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def save_energy_track(
+    filename, energies, analysis_window, use_channel=None, **kwargs
+):
+    """
+    Save the log energy track of audio file `filename` into a sidecar file
+    (see :func:`energy_track_path`) so that it can later be loaded with
+    :func:`load_energy_track` instead of being recomputed. Requires numpy.
+
+    A sidecar starts with a small header (a magic string followed by the
+    size of a JSON header that stores the content hash of `filename`, the
+    parameters used to compute energies and the number of energies) padded
+    to a multiple of 64 bytes, followed by energies as little-endian 64-bit
+    floats.
+
+    :Parameters:
+
+    `filename`: str
+        path to audio file.
+    `energies`: array-like
+        log energy of each analysis window of `filename`, as returned by
+        :func:`auditok.util.AudioEnergyValidator.energy_track`.
+    `analysis_window`: float
+        duration of analysis window in seconds.
+    `use_channel`: None, "mix" or int
+        channel used to compute energies.
+
+    :kwargs:
+
+    `sampling_rate`, `sr`: int
+        sampling rate of audio data
+    `sample_width`, `sw`: int
+        sample width of audio data
+    `channels`, `ch`: int
+        number of channels of audio data
+
+    :Returns:
+
+    path of the saved sidecar file.
+    """
+    if not _WITH_NUMPY:
+        raise AudioIOError("numpy is required to save energy tracks")
+    sampling_rate, sample_width, channels = _get_audio_parameters(kwargs)
+    stat = os.stat(filename)
+    energies = np.ascontiguousarray(energies, dtype="<f8")
+    header = {
+        "version": _ENERGY_TRACK_VERSION,
+        "content_hash": _file_content_hash(filename),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "analysis_window": float(analysis_window),
+        "use_channel": _normalize_use_channel(use_channel),
+        "sampling_rate": sampling_rate,
+        "sample_width": sample_width,
+        "channels": channels,
+        "count": len(energies),
+    }
+    header = json.dumps(header).encode()
+    prefix_size = len(_ENERGY_TRACK_MAGIC) + 4
+    padding = -(prefix_size + len(header)) % _ENERGY_TRACK_ALIGNMENT
+    header += b" " * padding
+    path = energy_track_path(filename, analysis_window, use_channel)
+    # write to a temporary file first so that a sidecar is never partially
+    # written when it's read by another process
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as fp:
+        fp.write(_ENERGY_TRACK_MAGIC)
+        fp.write(struct.pack("<I", len(header)))
+        fp.write(header)
+        fp.write(energies.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_energy_track(filename, analysis_window, use_channel=None, **kwargs):
+    """
+    Load the log energy track of audio file `filename` saved with
+    :func:`save_energy_track`. Energies are memory-mapped, not read.
+
+    A sidecar is stale, and ignored, if it has been computed with other
+    parameters or if `filename` has changed since it was saved. If the size
+    or the modification time of `filename` are not the ones stored in the
+    sidecar, the content hash of `filename` is recomputed and compared to
+    the stored one.
+
+    See :func:`save_energy_track` for parameters.
+
+    :Returns:
+
+    A read-only `numpy.memmap` of energies, or None if there is no valid
+    sidecar for `filename` and parameters.
+    """
+    if not _WITH_NUMPY:
+        raise AudioIOError("numpy is required to load energy tracks")
+    sampling_rate, sample_width, channels = _get_audio_parameters(kwargs)
+    path = energy_track_path(filename, analysis_window, use_channel)
+    try:
+        with open(path, "rb") as fp:
+            if fp.read(len(_ENERGY_TRACK_MAGIC)) != _ENERGY_TRACK_MAGIC:
+                return None
+            (header_size,) = struct.unpack("<I", fp.read(4))
+            header = json.loads(fp.read(header_size).decode())
+        stat = os.stat(filename)
+    except (OSError, ValueError, struct.error):
+        return None
+    expected = {
+        "version": _ENERGY_TRACK_VERSION,
+        "analysis_window": float(analysis_window),
+        "use_channel": _normalize_use_channel(use_channel),
+        "sampling_rate": sampling_rate,
+        "sample_width": sample_width,
+        "channels": channels,
+        "size": stat.st_size,
+    }
+    if any(header.get(key) != value for key, value in expected.items()):
+        return None
+    if header["mtime_ns"] != stat.st_mtime_ns:
+        if header["content_hash"] != _file_content_hash(filename):
+            return None
+    offset = len(_ENERGY_TRACK_MAGIC) + 4 + header_size
+    count = header["count"]
+    if os.path.getsize(path) != offset + count * 8:
+        return None
+    if count == 0:
+        return np.empty(0, dtype="<f8")
+    return np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=count)
@@ -1,25 +1,42 @@
 from array import array
-import audioop
+from itertools import groupby
+from operator import mul
 import math
 
+try:
+    # audioop was removed from the standard library in Python 3.13
+    import audioop
+
+    _WITH_AUDIOOP = True
+except ImportError:
+    _WITH_AUDIOOP = False
+
 FORMAT = {1: "b", 2: "h", 4: "i"}
 _EPSILON = 1e-10
 
 
+def _frombuffer(data, fmt):
+    # unlike `array(fmt, data)`, also works for memoryviews and other
+    # objects that support the buffer protocol
+    samples = array(fmt)
+    samples.frombytes(memoryview(data).cast("B"))
+    return samples
+
+
 def to_array(data, sample_width, channels):
     fmt = FORMAT[sample_width]
     if channels == 1:
-        return array(fmt, data)
+        return _frombuffer(data, fmt)
     return separate_channels(data, fmt, channels)
 
 
 def extract_single_channel(data, fmt, channels, selected):
-    samples = array(fmt, data)
+    samples = _frombuffer(data, fmt)
     return samples[selected::channels]
 
 
 def average_channels(data, fmt, channels):
-    all_channels = array(fmt, data)
+    all_channels = _frombuffer(data, fmt)
     mono_channels = [
         array(fmt, all_channels[ch::channels]) for ch in range(channels)
     ]
@@ -32,23 +49,58 @@ def average_channels(data, fmt, channels):
 
 def average_channels_stereo(data, sample_width):
     fmt = FORMAT[sample_width]
-    arr = array(fmt, audioop.tomono(data, sample_width, 0.5, 0.5))
-    return arr
+    if _WITH_AUDIOOP:
+        return array(fmt, audioop.tomono(data, sample_width, 0.5, 0.5))
+    # same as audioop.tomono: the average is rounded towards -inf
+    samples = _frombuffer(data, fmt)
+    return array(
+        fmt, ((x + y) >> 1 for x, y in zip(samples[0::2], samples[1::2]))
+    )
 
 
 def separate_channels(data, fmt, channels):
-    all_channels = array(fmt, data)
+    all_channels = _frombuffer(data, fmt)
     mono_channels = [
         array(fmt, all_channels[ch::channels]) for ch in range(channels)
     ]
     return mono_channels
 
 
+def calculate_rms(x, sample_width):
+    """
+    Compute the RMS of audio samples `x` (an `array` or raw audio data).
+    As with `audioop.rms`, the result is truncated to an integer value.
+    """
+    if _WITH_AUDIOOP:
+        return audioop.rms(x, sample_width)
+    if not isinstance(x, array):
+        x = _frombuffer(x, FORMAT[sample_width])
+    if len(x) == 0:
+        return 0
+    return int(math.sqrt(sum(map(mul, x, x)) / len(x)))
+
+
 def calculate_energy_single_channel(x, sample_width):
-    energy_sqrt = max(audioop.rms(x, sample_width), _EPSILON)
+    energy_sqrt = max(calculate_rms(x, sample_width), _EPSILON)
     return 20 * math.log10(energy_sqrt)
 
 
 def calculate_energy_multichannel(x, sample_width, aggregation_fn=max):
     energies = (calculate_energy_single_channel(xi, sample_width) for xi in x)
     return aggregation_fn(energies)
+
+
+def run_lengths(mask):
+    """
+    Run-length encode a sequence of boolean values (or of hysteresis levels,
+    see `hysteresis_levels`). Return a list of `(value, length)` tuples.
+    """
+    return [(value, len(list(group))) for value, group in groupby(mask)]
+
+
+def hysteresis_levels(mask, offset_mask):
+    """
+    Encode the onset and offset validity of each frame into one integer:
+    `2 * mask[i] + offset_mask[i]`.
+    """
+    return [2 * bool(x) + bool(y) for x, y in zip(mask, offset_mask)]
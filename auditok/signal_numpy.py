@@ -1,11 +1,9 @@
+import math
 import numpy as np
-from .signal import (
-    average_channels_stereo,
-    calculate_energy_single_channel,
-    calculate_energy_multichannel,
-)
 
 FORMAT = {1: np.int8, 2: np.int16, 4: np.int32}
+_EPSILON = 1e-10
+_LOG_ENERGY_TABLES = {}
 
 
 def to_array(data, sample_width, channels):
@@ -25,6 +23,156 @@ def average_channels(data, fmt, channels):
     return array.reshape(-1, channels).mean(axis=1).round().astype(fmt)
 
 
+def average_channels_stereo(data, sample_width):
+    fmt = FORMAT[sample_width]
+    array = np.frombuffer(data, dtype=fmt).reshape(-1, 2)
+    return mix_frames(array)
+
+
 def separate_channels(data, fmt, channels):
     array = np.frombuffer(data, dtype=fmt)
     return np.asanyarray(array.reshape(-1, channels).T, order="C")
+
+
+def to_frames(data, fmt, channels, frame_size, hop_size=None):
+    """
+    Reshape interleaved audio data into an array of shape
+    `(n_frames, frame_size, channels)` without copying it. Trailing samples
+    that do not fill a whole frame are ignored. If `hop_size` is given,
+    frames start every `hop_size` samples and overlap: the returned array is
+    a read-only strided view of `data`.
+    """
+    array = np.frombuffer(data, dtype=fmt)
+    if hop_size is None:
+        n_frames = len(array) // (frame_size * channels)
+        array = array[: n_frames * frame_size * channels]
+        return array.reshape(n_frames, frame_size, channels)
+    n_samples = len(array) // channels
+    n_frames = 0
+    if n_samples >= frame_size:
+        n_frames = (n_samples - frame_size) // hop_size + 1
+    sample_stride = array.itemsize * channels
+    return np.lib.stride_tricks.as_strided(
+        array,
+        shape=(n_frames, frame_size, channels),
+        strides=(hop_size * sample_stride, sample_stride, array.itemsize),
+        writeable=False,
+    )
+
+
+def mix_frames(frames):
+    """
+    Down-mix audio frames whose last axis is the channel axis (e.g., frames
+    of shape `(n_frames, frame_size, channels)` returned by `to_frames`).
+    Results are the same as those of the "mix" channel selector: stereo
+    samples are averaged as with `audioop.tomono` (i.e., the average is
+    rounded towards -inf), other samples are averaged with `average_channels`
+    (i.e., the average is rounded to the nearest even integer).
+    """
+    if frames.shape[-1] == 2:
+        # sums of two samples, even 32 bit ones, fit in an int64
+        left = frames[..., 0].astype(np.int64)
+        return ((left + frames[..., 1]) >> 1).astype(frames.dtype)
+    # sums of samples are exact, same as `mean` but faster for many channels
+    sums = np.einsum("...i->...", frames, dtype=np.float64)
+    return np.round(sums / frames.shape[-1]).astype(frames.dtype)
+
+
+def calculate_rms_frames(frames, sample_width):
+    """
+    Compute the RMS of each frame (i.e., along the last axis) of `frames`.
+    As with `audioop.rms`, the result is truncated to an integer value.
+    """
+    # squares and sums of squares of 8 and 16 bit samples are exactly
+    # represented by float64 values, whatever the summation order is
+    if frames.shape[-1] == 0:
+        return np.zeros(frames.shape[:-1])
+    # samples are converted on the fly rather than copied, `frames` might
+    # be a large non-contiguous view (e.g., with channels as second axis)
+    sum_squares = np.einsum("...i,...i->...", frames, frames, dtype=np.float64)
+    return np.floor(np.sqrt(sum_squares / frames.shape[-1]))
+
+
+def calculate_rms(x, sample_width):
+    """
+    Compute the RMS of audio samples `x` (an array-like object or raw audio
+    data). As with `audioop.rms`, the result is truncated to an integer value.
+    """
+    if isinstance(x, (bytes, bytearray, memoryview)):
+        x = np.frombuffer(x, dtype=FORMAT[sample_width])
+    if len(x) == 0:
+        return 0
+    # faster than `calculate_rms_frames` for one single window
+    samples = np.asarray(x, dtype=np.float64)
+    return int(math.sqrt(samples.dot(samples) / len(samples)))
+
+
+def _log_energy_table(sample_width):
+    table = _LOG_ENERGY_TABLES.get(sample_width)
+    if table is None:
+        max_rms = 2 ** (8 * sample_width - 1)
+        table = np.array(
+            [20 * math.log10(max(rms, _EPSILON)) for rms in range(max_rms + 1)]
+        )
+        _LOG_ENERGY_TABLES[sample_width] = table
+    return table
+
+
+def rms_to_log_energy(rms, sample_width):
+    """
+    Convert integer RMS values into log energies. Results are exactly equal
+    to those of `calculate_energy_single_channel` which uses `math.log10`
+    (`numpy.log10` might differ in the last bit for some values).
+    """
+    if sample_width in (1, 2):
+        return _log_energy_table(sample_width)[rms.astype(np.intp)]
+    unique_rms, inverse = np.unique(rms, return_inverse=True)
+    unique_energies = np.array(
+        [20 * math.log10(max(x, _EPSILON)) for x in unique_rms.tolist()]
+    )
+    return unique_energies[inverse.reshape(rms.shape)]
+
+
+def calculate_energy_frames(frames, sample_width):
+    """
+    Compute the log energy of each frame (i.e., along the last axis) of
+    `frames` (e.g., a 2D array of shape `(n_frames, frame_size)`).
+    """
+    rms = calculate_rms_frames(frames, sample_width)
+    return rms_to_log_energy(rms, sample_width)
+
+
+def calculate_energy_single_channel(x, sample_width):
+    energy_sqrt = max(calculate_rms(x, sample_width), _EPSILON)
+    return 20 * math.log10(energy_sqrt)
+
+
+def calculate_energy_multichannel(x, sample_width, aggregation_fn=max):
+    # all channels (i.e. the first axis of `x`) are processed at once
+    energies = calculate_energy_frames(np.asarray(x), sample_width)
+    return aggregation_fn(energies.tolist())
+
+
+def run_lengths(mask):
+    """
+    Run-length encode a sequence of boolean values (or of hysteresis levels,
+    see `hysteresis_levels`). Return a list of `(value, length)` tuples.
+    """
+    mask = np.asarray(mask)
+    if mask.dtype.kind not in "iu":
+        mask = mask.astype(bool)
+    if len(mask) == 0:
+        return []
+    starts = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.append(starts, len(mask)))
+    return list(zip(mask[starts].tolist(), lengths.tolist()))
+
+
+def hysteresis_levels(mask, offset_mask):
+    """
+    Encode the onset and offset validity of each frame into one integer:
+    `2 * mask[i] + offset_mask[i]`.
+    """
+    mask = np.asarray(mask, dtype=np.int8)
+    return 2 * mask + np.asarray(offset_mask, dtype=np.int8)
@@ -5,22 +5,32 @@ Class summary
 .. autosummary::
 
         AudioEnergyValidator
+        AdaptiveEnergyValidator
+        BandEnergyValidator
+        ZeroCrossingRateValidator
+        SpectralFlatnessValidator
         AudioReader
         Recorder
 """
 from __future__ import division
 import sys
+import mmap
 from abc import ABC, abstractmethod
 import warnings
 from functools import partial
-from audioop import tomono
+from collections import deque
+from io import BytesIO
+from tempfile import TemporaryFile
 from .io import (
     AudioIOError,
     AudioSource,
     from_file,
     BufferAudioSource,
+    MmapRawAudioSource,
+    MmapWaveAudioSource,
     PyAudioSource,
     get_audio_source,
+    to_byte_view,
 )
 from .exceptions import (
     DuplicateArgument,
@@ -29,10 +39,15 @@ from .exceptions import (
 )
 
 try:
+    import numpy as np
     from . import signal_numpy as signal
+
+    _WITH_NUMPY = True
 except ImportError:
     from . import signal
 
+    _WITH_NUMPY = False
+
 
 __all__ = [
     "make_duration_formatter",
@@ -44,6 +59,10 @@ __all__ = [
     "AudioReader",
     "Recorder",
     "AudioEnergyValidator",
+    "AdaptiveEnergyValidator",
+    "BandEnergyValidator",
+    "ZeroCrossingRateValidator",
+    "SpectralFlatnessValidator",
 ]
 
 
@@ -108,7 +127,8 @@ def make_channel_selector(sample_width, channels, selected=None):
 
     if selected in ("mix", "avg", "average"):
         if channels == 2:
-            # when data is stereo, using audioop when possible is much faster
+            # stereo data is mixed down as with `audioop.tomono`, which is
+            # much faster than `average_channels` when audioop is available
             return partial(
                 signal.average_channels_stereo, sample_width=sample_width
             )
@@ -152,12 +172,40 @@ class DataValidator(ABC):
         Check whether `data` is valid
         """
 
+    def is_valid_batch(self, frames):
+        """
+        Check the validity of many frames at once. `StreamTokenizer` and
+        `split` detect when this method is overridden and then call it,
+        instead of `is_valid`, with large blocks of frames. Override it to
+        amortize the cost of validation (e.g., by processing all frames with
+        numpy or with one call to a model). This default implementation
+        calls `is_valid` for each frame.
+
+        Parameters
+        ----------
+        frames : numpy.ndarray or list
+            frames to validate. When called by `split` and numpy is
+            available, an array of audio samples of shape
+            `(n_windows, window_len)` for mono data or
+            `(n_windows, window_len, channels)` for multichannel data (the
+            last window might be passed alone in a second call if it's
+            shorter). Otherwise, a list of frames as they would be passed to
+            `is_valid`.
+
+        Returns
+        -------
+        mask : sequence of bool
+            validity of each frame.
+        """
+        return [self.is_valid(frame) for frame in frames]
+
 
 class AudioEnergyValidator(DataValidator):
     def __init__(
         self, energy_threshold, sample_width, channels, use_channel=None
     ):
         self._sample_width = sample_width
+        self._channels = channels
         self._selector = make_channel_selector(
             sample_width, channels, use_channel
         )
@@ -165,12 +213,590 @@ class AudioEnergyValidator(DataValidator):
             self._energy_fn = signal.calculate_energy_single_channel
         else:
             self._energy_fn = signal.calculate_energy_multichannel
+        if isinstance(use_channel, int) and use_channel < 0:
+            use_channel += channels
+        self._use_channel = use_channel
         self._energy_threshold = energy_threshold
 
+    def __reduce__(self):
+        # channel selector might be a lambda, rebuild validator when unpickled
+        args = (
+            self._energy_threshold,
+            self._sample_width,
+            self._channels,
+            self._use_channel,
+        )
+        return (self.__class__, args)
+
+    @property
+    def energy_threshold(self):
+        return self._energy_threshold
+
+    @property
+    def use_channel(self):
+        return self._use_channel
+
     def is_valid(self, data):
         log_energy = self._energy_fn(self._selector(data), self._sample_width)
         return log_energy >= self._energy_threshold
 
+    def is_valid_batch(self, frames):
+        """
+        Check the validity of many frames at once, see
+        `DataValidator.is_valid_batch`. If numpy is available, all frames
+        are processed at once.
+        """
+        if not _WITH_NUMPY or len(frames) == 0:
+            return super(AudioEnergyValidator, self).is_valid_batch(frames)
+        return self.is_valid_energies(self._batch_energies(frames))
+
+    def _batch_energies(self, frames):
+        # log energy of each frame of `frames`, see `is_valid_batch`
+        if _WITH_NUMPY and isinstance(frames, np.ndarray):
+            if frames.ndim == 2:
+                frames = frames[:, :, np.newaxis]
+            return self._frames_energy(frames)
+        # frames of raw data read from an `AudioReader`, all of the same size
+        # except, maybe, the last one
+        frame_bytes = len(frames[0]) if len(frames) > 0 else 0
+        if (
+            frame_bytes == 0
+            or len(frames[-1]) > frame_bytes
+            or any(len(frame) != frame_bytes for frame in frames[:-1])
+        ):
+            return [
+                self._energy_fn(self._selector(frame), self._sample_width)
+                for frame in frames
+            ]
+        window_size = frame_bytes // (self._sample_width * self._channels)
+        return self.energy_track(b"".join(frames), window_size)
+
+    def energy_track(
+        self, data, window_size, per_channel=False, hop_size=None
+    ):
+        """
+        Compute the log energy of every analysis window of `data`. Results
+        are the same as those obtained by reading `data` one window at a time
+        and computing the energy of each window but, if numpy is available,
+        all windows are processed at once.
+
+        Parameters
+        ----------
+        data : bytes-like
+            audio data with the sample width and number of channels of this
+            validator. Can be any object that supports the buffer protocol.
+        window_size : int
+            number of samples of one analysis window. If the number of samples
+            in `data` is not a multiple of `window_size`, the last window is
+            shorter.
+        per_channel : bool, default: False
+            if True, compute the energy of each channel of each window,
+            regardless of the `use_channel` of this validator.
+        hop_size : int, default: None
+            if given, number of samples between the starts of two consecutive
+            (overlapping) windows. Windows are the same as those read by an
+            `AudioReader` with a `hop_dur`: the last windows might be shorter.
+            If numpy is available, windows are a strided view of `data`, they
+            are not copied.
+
+        Returns
+        -------
+        energies : numpy.ndarray or list
+            log energy of each window (a list if numpy is not available). If
+            `per_channel` is True, an array of shape `(n_windows, channels)`
+            (or a list of lists).
+        """
+        data = to_byte_view(data)
+        bytes_per_sample = self._sample_width * self._channels
+        window_bytes = window_size * bytes_per_sample
+        step_bytes = window_bytes
+        if hop_size is not None:
+            step_bytes = hop_size * bytes_per_sample
+        # windows start before `stop`, the last one(s) end at end of data
+        stop = 0
+        if len(data) > 0:
+            stop = max(len(data) - window_bytes, 0) + step_bytes
+        if not _WITH_NUMPY:
+            if per_channel:
+                fmt = signal.FORMAT[self._sample_width]
+                return [
+                    [
+                        signal.calculate_energy_single_channel(
+                            x, self._sample_width
+                        )
+                        for x in signal.separate_channels(
+                            data[i : i + window_bytes], fmt, self._channels
+                        )
+                    ]
+                    for i in range(0, stop, step_bytes)
+                ]
+            return [
+                self._energy_fn(
+                    self._selector(data[i : i + window_bytes]),
+                    self._sample_width,
+                )
+                for i in range(0, stop, step_bytes)
+            ]
+        fmt = signal.FORMAT[self._sample_width]
+        frames = signal.to_frames(
+            data, fmt, self._channels, window_size, hop_size
+        )
+        energies = [self._frames_energy(frames, per_channel)]
+        # shorter last window(s)
+        for i in range(len(frames) * step_bytes, stop, step_bytes):
+            tail = data[i : i + window_bytes]
+            tail_frames = signal.to_frames(
+                tail, fmt, self._channels, len(tail) // bytes_per_sample
+            )
+            energies.append(self._frames_energy(tail_frames, per_channel))
+        if len(energies) == 1:
+            return energies[0]
+        return np.concatenate(energies)
+
+    def _frames_energy(self, frames, per_channel=False):
+        # `frames` has a shape of (n_frames, frame_size, channels), all
+        # frames are processed at once whatever the number of channels is
+        if per_channel:
+            return signal.calculate_energy_frames(
+                frames.transpose(0, 2, 1), self._sample_width
+            )
+        if self._channels == 1:
+            frames = frames[:, :, 0]
+        elif isinstance(self._use_channel, int):
+            frames = frames[:, :, self._use_channel]
+        elif self._use_channel in (None, "any"):
+            # energy of each channel of each frame, keep the maximum one
+            return self._frames_energy(frames, True).max(axis=1)
+        else:
+            frames = signal.mix_frames(frames)
+        return signal.calculate_energy_frames(frames, self._sample_width)
+
+    def is_valid_buffer(
+        self, data, window_size, per_channel=False, hop_size=None
+    ):
+        """
+        Check the validity of every analysis window of `data`. This is the
+        batch version of `is_valid`, see `energy_track` for parameters.
+
+        Returns
+        -------
+        mask : numpy.ndarray or list
+            a boolean value for each window of `data` (or for each channel
+            of each window if `per_channel` is True).
+        """
+        energies = self.energy_track(
+            data, window_size, per_channel=per_channel, hop_size=hop_size
+        )
+        if per_channel and not _WITH_NUMPY:
+            return [self.is_valid_energies(row) for row in energies]
+        return self.is_valid_energies(energies)
+
+    def is_valid_energies(self, energies):
+        """
+        Compare log energies, as returned by `energy_track`, to the energy
+        threshold of this validator.
+
+        Returns
+        -------
+        mask : numpy.ndarray or list
+            a boolean value for each energy in `energies`.
+        """
+        if _WITH_NUMPY:
+            return np.asarray(energies) >= self._energy_threshold
+        return [energy >= self._energy_threshold for energy in energies]
+
+
+class AdaptiveEnergyValidator(DataValidator):
+    """
+    A validator that compares the log energy of audio data, computed as with
+    `AudioEnergyValidator`, to a threshold that follows the noise floor of
+    the signal rather than to a fixed one. The noise floor is tracked online
+    using minimum statistics: it's the minimum log energy of the latest
+    `horizon` windows, updated in O(1) (amortized) time per window. A window
+    is valid if its energy is at least `margin` dB above the noise floor.
+
+    As the noise floor depends on the previous windows, windows must be
+    validated in order, one time each, as `StreamTokenizer` and `split` do.
+    Call `reset` before processing a new stream. The first windows of a
+    stream are compared to the noise floor of the windows seen so far, so
+    audio activity at the very beginning of a stream might be missed.
+
+    Parameters
+    ----------
+    sample_width : int
+        number of bytes of one audio sample.
+    channels : int
+        number of channels of audio data.
+    use_channel : {None, "any", "mix", "avg", "average"} or int
+        channel to use. See `AudioEnergyValidator`.
+    margin : float, default: 10
+        minimum difference, in dB, between the log energy of a valid window
+        and the noise floor.
+    horizon : int, default: 100
+        number of windows over which the noise floor is tracked (e.g., 100
+        windows of 50 ms, i.e., 5 seconds). It should be longer than the
+        longest audio event to detect.
+    min_threshold : float, default: None
+        if not None, the lowest possible threshold. Use it to avoid detecting
+        very low level noise when the noise floor is null (e.g., digital
+        silence).
+    """
+
+    def __init__(
+        self,
+        sample_width,
+        channels,
+        use_channel=None,
+        margin=10,
+        horizon=100,
+        min_threshold=None,
+    ):
+        if horizon < 1:
+            raise ValueError(
+                "'horizon' must be >= 1, given: {}".format(horizon)
+            )
+        self._energy_validator = AudioEnergyValidator(
+            0, sample_width, channels, use_channel
+        )
+        self._margin = margin
+        self._horizon = horizon
+        self._min_threshold = min_threshold
+        self.reset()
+
+    @property
+    def use_channel(self):
+        return self._energy_validator.use_channel
+
+    @property
+    def margin(self):
+        return self._margin
+
+    @property
+    def horizon(self):
+        return self._horizon
+
+    @property
+    def min_threshold(self):
+        return self._min_threshold
+
+    @property
+    def noise_floor(self):
+        """Current noise floor (None before the first window)."""
+        if not self._minima:
+            return None
+        return self._minima[0][1]
+
+    @property
+    def energy_threshold(self):
+        """Current energy threshold (None before the first window)."""
+        if not self._minima:
+            return None
+        threshold = self._minima[0][1] + self._margin
+        if self._min_threshold is not None:
+            threshold = max(threshold, self._min_threshold)
+        return threshold
+
+    def reset(self):
+        """Forget the noise floor of previously validated windows."""
+        self._nb_windows = 0
+        # (window index, energy) pairs of the latest `horizon` windows with
+        # increasing energies, the first energy is the noise floor
+        self._minima = deque()
+
+    def is_valid(self, data):
+        validator = self._energy_validator
+        energy = validator._energy_fn(
+            validator._selector(data), validator._sample_width
+        )
+        return self._update(energy)
+
+    def is_valid_batch(self, frames):
+        """
+        Check the validity of many frames at once, see
+        `DataValidator.is_valid_batch`. If numpy is available, the energies
+        of all frames are computed at once. The noise floor is then updated
+        for each frame, in order.
+        """
+        energies = self._energy_validator._batch_energies(frames)
+        if _WITH_NUMPY:
+            energies = np.asarray(energies).tolist()
+        return [self._update(energy) for energy in energies]
+
+    def _update(self, energy):
+        # update noise floor with `energy` and return the validity of window
+        minima = self._minima
+        while minima and minima[-1][1] >= energy:
+            minima.pop()
+        minima.append((self._nb_windows, energy))
+        if minima[0][0] <= self._nb_windows - self._horizon:
+            minima.popleft()
+        self._nb_windows += 1
+        return energy >= self.energy_threshold
+
+
+class _FrameFeatureValidator(DataValidator):
+    """
+    Base class for validators that compute one feature (e.g., a spectral
+    feature) for each analysis window and compare it to some threshold.
+    Requires numpy. Many windows are processed at once by `is_valid_batch`,
+    `is_valid` processes a batch of one window. Subclasses implement
+    `_frames_feature`, that computes the feature of each window of an array
+    of audio samples of shape `(..., window_len)`, and `_is_valid_feature`.
+    """
+
+    def __init__(self, sample_width, channels, use_channel=None):
+        if not _WITH_NUMPY:
+            raise ImportError(
+                "numpy is required by '{}'".format(self.__class__.__name__)
+            )
+        # raises a ValueError if sample_width or use_channel is not valid
+        make_channel_selector(sample_width, channels, use_channel)
+        if isinstance(use_channel, int) and use_channel < 0:
+            use_channel += channels
+        self._sample_width = sample_width
+        self._channels = channels
+        self._use_channel = use_channel
+
+    @property
+    def use_channel(self):
+        return self._use_channel
+
+    def is_valid(self, data):
+        return bool(self.is_valid_batch([data])[0])
+
+    def is_valid_batch(self, frames):
+        """
+        Check the validity of many frames at once, see
+        `DataValidator.is_valid_batch`. All frames are processed at once. If
+        `use_channel` is None or "any", a frame is valid if it's valid for at
+        least one channel.
+        """
+        if not isinstance(frames, np.ndarray):
+            frames = [to_byte_view(frame) for frame in frames]
+            if len(frames) == 0:
+                return np.zeros(0, dtype=bool)
+            frame_bytes = len(frames[0])
+            if any(len(frame) != frame_bytes for frame in frames):
+                return np.concatenate(
+                    [self.is_valid_batch([frame]) for frame in frames]
+                )
+            window_size = frame_bytes // (self._sample_width * self._channels)
+            fmt = signal.FORMAT[self._sample_width]
+            frames = np.frombuffer(b"".join(frames), dtype=fmt).reshape(
+                len(frames), window_size, self._channels
+            )
+        if frames.ndim == 2:
+            frames = frames[:, :, np.newaxis]
+        if self._channels == 1:
+            frames = frames[:, :, 0]
+        elif isinstance(self._use_channel, int):
+            frames = frames[:, :, self._use_channel]
+        elif self._use_channel in ("mix", "avg", "average"):
+            frames = signal.mix_frames(frames)
+        else:
+            features = self._frames_feature(frames.transpose(0, 2, 1))
+            return self._is_valid_feature(features).any(axis=1)
+        return self._is_valid_feature(self._frames_feature(frames))
+
+    @abstractmethod
+    def _frames_feature(self, frames):
+        """
+        Return the feature of each window of `frames`, an array of audio
+        samples of shape `(..., window_len)`, as an array of shape `(...)`.
+        """
+
+    @abstractmethod
+    def _is_valid_feature(self, features):
+        """
+        Return an array of booleans, True for each valid feature.
+        """
+
+
+class BandEnergyValidator(_FrameFeatureValidator):
+    """
+    A validator that checks the log energy of audio data within a frequency
+    band. Unlike `AudioEnergyValidator`, that uses the energy of the whole
+    signal, it ignores noise outside of the band of interest (e.g., the low
+    frequency noise of HVAC systems or traffic). Requires numpy.
+
+    Parameters
+    ----------
+    energy_threshold : float
+        minimum log energy of a valid window within `band`. Log energies
+        have the same scale as those of `AudioEnergyValidator` and are very
+        close to them if `band` covers the whole spectrum (the latter are
+        computed from an RMS truncated to an integer).
+    band : tuple
+        `(low_freq, high_freq)` frequencies in Hz of the band. `high_freq`
+        can be None to use all frequencies up to half the sampling rate.
+    sampling_rate : int
+        sampling rate of audio data.
+    sample_width : int
+        number of bytes of one audio sample.
+    channels : int
+        number of channels of audio data.
+    use_channel : {None, "any", "mix", "avg", "average"} or int
+        channel to use. See `AudioEnergyValidator`.
+    """
+
+    def __init__(
+        self,
+        energy_threshold,
+        band,
+        sampling_rate,
+        sample_width,
+        channels,
+        use_channel=None,
+    ):
+        super(BandEnergyValidator, self).__init__(
+            sample_width, channels, use_channel
+        )
+        low_freq, high_freq = band
+        if high_freq is None:
+            high_freq = sampling_rate / 2
+        if not 0 <= low_freq < high_freq:
+            raise ValueError(
+                "'band' must be a (low_freq, high_freq) tuple with "
+                "0 <= low_freq < high_freq, given: {}".format(band)
+            )
+        self._band = (low_freq, high_freq)
+        self._sampling_rate = sampling_rate
+        self._energy_threshold = energy_threshold
+        self._weights = {}
+
+    @property
+    def energy_threshold(self):
+        return self._energy_threshold
+
+    @property
+    def band(self):
+        return self._band
+
+    def _band_weights(self, window_size):
+        weights = self._weights.get(window_size)
+        if weights is None:
+            freqs = np.fft.rfftfreq(window_size, 1 / self._sampling_rate)
+            low_freq, high_freq = self._band
+            in_band = (freqs >= low_freq) & (freqs <= high_freq)
+            # Parseval's theorem: all bins but the first one and (for an even
+            # window size) the last one stand for two conjugate bins
+            weights = np.where(in_band, 2.0, 0.0)
+            weights[0] /= 2
+            if window_size % 2 == 0:
+                weights[-1] /= 2
+            weights /= window_size ** 2
+            self._weights[window_size] = weights
+        return weights
+
+    def _frames_feature(self, frames):
+        window_size = frames.shape[-1]
+        if window_size == 0:
+            mean_squares = np.zeros(frames.shape[:-1])
+        else:
+            spectrum = np.fft.rfft(frames, axis=-1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            mean_squares = power @ self._band_weights(window_size)
+        # same floor as the energy of `AudioEnergyValidator`
+        return 10 * np.log10(np.maximum(mean_squares, signal._EPSILON ** 2))
+
+    def _is_valid_feature(self, energies):
+        return energies >= self._energy_threshold
+
+
+class ZeroCrossingRateValidator(_FrameFeatureValidator):
+    """
+    A validator that checks the zero-crossing rate of audio data (i.e., the
+    fraction of consecutive samples with a different sign). Broadband noise
+    has a high zero-crossing rate, voiced speech a low one. Requires numpy.
+
+    Parameters
+    ----------
+    max_rate : float
+        maximum zero-crossing rate, between 0 and 1, of a valid window.
+    sample_width : int
+        number of bytes of one audio sample.
+    channels : int
+        number of channels of audio data.
+    use_channel : {None, "any", "mix", "avg", "average"} or int
+        channel to use. See `AudioEnergyValidator`.
+    min_rate : float, default: 0
+        minimum zero-crossing rate of a valid window. Use a positive value
+        to reject digital silence, whose zero-crossing rate is 0.
+    """
+
+    def __init__(
+        self, max_rate, sample_width, channels, use_channel=None, min_rate=0
+    ):
+        super(ZeroCrossingRateValidator, self).__init__(
+            sample_width, channels, use_channel
+        )
+        self._min_rate = min_rate
+        self._max_rate = max_rate
+
+    @property
+    def min_rate(self):
+        return self._min_rate
+
+    @property
+    def max_rate(self):
+        return self._max_rate
+
+    def _frames_feature(self, frames):
+        if frames.shape[-1] < 2:
+            return np.zeros(frames.shape[:-1])
+        signs = frames >= 0
+        return (signs[..., 1:] != signs[..., :-1]).mean(axis=-1)
+
+    def _is_valid_feature(self, rates):
+        return (rates >= self._min_rate) & (rates <= self._max_rate)
+
+
+class SpectralFlatnessValidator(_FrameFeatureValidator):
+    """
+    A validator that checks the spectral flatness of audio data (i.e., the
+    ratio of the geometric mean to the arithmetic mean of the power spectrum
+    of a window, computed with a Hann window). Spectral flatness is close to
+    1 for white noise and to 0 for tonal sounds such as voiced speech or
+    music. Silent windows have a flatness of 1. Requires numpy.
+
+    Parameters
+    ----------
+    max_flatness : float
+        maximum spectral flatness, between 0 and 1, of a valid window.
+    sample_width : int
+        number of bytes of one audio sample.
+    channels : int
+        number of channels of audio data.
+    use_channel : {None, "any", "mix", "avg", "average"} or int
+        channel to use. See `AudioEnergyValidator`.
+    """
+
+    def __init__(self, max_flatness, sample_width, channels, use_channel=None):
+        super(SpectralFlatnessValidator, self).__init__(
+            sample_width, channels, use_channel
+        )
+        self._max_flatness = max_flatness
+        self._windows = {}
+
+    @property
+    def max_flatness(self):
+        return self._max_flatness
+
+    def _frames_feature(self, frames):
+        window_size = frames.shape[-1]
+        if window_size == 0:
+            return np.ones(frames.shape[:-1])
+        window = self._windows.get(window_size)
+        if window is None:
+            window = self._windows[window_size] = np.hanning(window_size)
+        spectrum = np.fft.rfft(frames * window, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2 + signal._EPSILON
+        geometric_mean = np.exp(np.log(power).mean(axis=-1))
+        return geometric_mean / power.mean(axis=-1)
+
+    def _is_valid_feature(self, flatness):
+        return flatness <= self._max_flatness
+
 
 class StringDataSource(DataSource):
     """
@@ -736,193 +1362,115 @@ class _AudioSourceProxy:
         return getattr(self._audio_source, name)
 
 
-class _Recorder(_AudioSourceProxy):
+class _ReadAheadBuffer(_AudioSourceProxy):
     """
-    A class for AudioSource objects that can record all audio data they read,
-    with a rewind facility.
+    A class for AudioSource objects that read large chunks of data from their
+    audio source and serve smaller reads from these chunks. This reduces the
+    number of reads (i.e., system calls) on file and stream audio sources.
+    If `max_read` is given, no more than `max_read` seconds are read from the
+    audio source.
     """
 
-    def __init__(self, audio_source):
-        super(_Recorder, self).__init__(audio_source)
-        self._cache = []
-        self._read_block = self._read_and_cache
-        self._read_from_cache = False
-        self._data = None
-
-    def read(self, size):
-        return self._read_block(size)
-
-    @property
-    def data(self):
-        if self._data is None:
-            err_msg = "Unrewinded recorder. Call rewind before accessing "
-            err_msg += "recorded data"
-            raise RuntimeError(err_msg)
-        return self._data
-
-    def rewindable(self):
-        return True
-
-    def rewind(self):
-        if self._read_from_cache:
-            self._audio_source.rewind()
-        else:
-            self._data = b"".join(self._cache)
-            self._cache = None
-            self._audio_source = BufferAudioSource(
-                self._data, self.sr, self.sw, self.ch
+    def __init__(self, audio_source, read_ahead, max_read=None):
+        super(_ReadAheadBuffer, self).__init__(audio_source)
+        if read_ahead <= 0:
+            raise ValueError(
+                "read_ahead must be > 0, given: {}".format(read_ahead)
             )
-            self._read_block = self._audio_source.read
-            self.open()
-            self._read_from_cache = True
-
-    def _read_and_cache(self, size):
-        # Read and save read data
-        block = self._audio_source.read(size)
-        if block is not None:
-            self._cache.append(block)
-        return block
-
-
-class _Limiter(_AudioSourceProxy):
-    """
-    A class for AudioDataSource objects that can read a fixed amount of data.
-    This can be useful when reading data from the microphone or from large
-    audio files.
-    """
-
-    def __init__(self, audio_source, max_read):
-        super(_Limiter, self).__init__(audio_source)
-        self._max_read = max_read
-        self._max_samples = round(max_read * self.sr)
+        self._read_ahead = read_ahead
+        self._chunk_size = max(1, round(read_ahead * self.sr))
         self._bytes_per_sample = self.sw * self.ch
-        self._read_samples = 0
+        self._max_samples = None
+        if max_read is not None:
+            self._max_samples = max(round(max_read * self.sr), 0)
+        self._clear()
 
-    @property
-    def data(self):
-        data = self._audio_source.data
-        max_read_bytes = self._max_samples * self._bytes_per_sample
-        return data[:max_read_bytes]
+    def _clear(self):
+        self._buffer = BytesIO()
+        self._fetched_samples = 0
+        # position of audio source at the end of buffered data
+        self._buffer_stop = None
 
     @property
-    def max_read(self):
-        return self._max_read
+    def read_ahead(self):
+        return self._read_ahead
+
+    def _fetch(self, block, size):
+        # read at least `size` samples, one chunk at a time, return them
+        # after `block` (i.e., the remaining buffered data) and buffer the
+        # rest of read data
+        chunks = [block]
+        while size > 0:
+            chunk_size = max(self._chunk_size, size)
+            if self._max_samples is not None:
+                chunk_size = min(
+                    chunk_size, self._max_samples - self._fetched_samples
+                )
+                if chunk_size <= 0:
+                    break
+            chunk = self._audio_source.read(chunk_size)
+            if chunk is None:
+                break
+            chunks.append(chunk)
+            nb_samples = len(chunk) // self._bytes_per_sample
+            self._fetched_samples += nb_samples
+            size -= nb_samples
+        data = b"".join(chunks)
+        block_bytes = len(data) - max(-size, 0) * self._bytes_per_sample
+        self._buffer = BytesIO(data)
+        self._buffer.seek(block_bytes)
+        if getattr(self._audio_source, "rewindable", False):
+            self._buffer_stop = self._audio_source.position
+        return data[:block_bytes]
 
     def read(self, size):
-        size = min(self._max_samples - self._read_samples, size)
-        if size <= 0:
-            return None
-        block = self._audio_source.read(size)
-        if block is None:
+        size_bytes = size * self._bytes_per_sample
+        block = self._buffer.read(size_bytes)
+        if len(block) < size_bytes:
+            missing = size - len(block) // self._bytes_per_sample
+            block = self._fetch(block, missing)
+        if not block:
             return None
-        self._read_samples += len(block) // self._bytes_per_sample
         return block
 
     def rewind(self):
-        super(_Limiter, self).rewind()
-        self._read_samples = 0
-
-
-class _FixedSizeAudioReader(_AudioSourceProxy):
-    def __init__(self, audio_source, block_dur):
-        super(_FixedSizeAudioReader, self).__init__(audio_source)
-
-        if block_dur <= 0:
-            raise ValueError(
-                "block_dur must be > 0, given: {}".format(block_dur)
-            )
-
-        self._block_size = int(block_dur * self.sr)
-        if self._block_size == 0:
-            err_msg = "Too small block_dur ({0:f}) for sampling rate ({1}). "
-            err_msg += "block_dur should cover at least one sample "
-            err_msg += "(i.e. 1/{1})"
-            raise TooSamllBlockDuration(
-                err_msg.format(block_dur, self.sr), block_dur, self.sr
-            )
-
-    def read(self):
-        return self._audio_source.read(self._block_size)
-
-    @property
-    def block_size(self):
-        return self._block_size
-
-    @property
-    def block_dur(self):
-        return self._block_size / self.sr
-
-    def __getattr__(self, name):
-        return getattr(self._audio_source, name)
-
-
-class _OverlapAudioReader(_FixedSizeAudioReader):
-    """
-    A class for AudioDataSource objects that can read and return overlapping
-    audio frames
-    """
-
-    def __init__(self, audio_source, block_dur, hop_dur):
-
-        if hop_dur >= block_dur:
-            raise ValueError('"hop_dur" should be < "block_dur"')
-
-        super(_OverlapAudioReader, self).__init__(audio_source, block_dur)
-
-        self._hop_size = int(hop_dur * self.sr)
-        self._blocks = self._iter_blocks_with_overlap()
-
-    def _iter_blocks_with_overlap(self):
-        while not self.is_open():
-            yield AudioIOError
-        block = self._audio_source.read(self._block_size)
-        if block is None:
-            yield None
-
-        _hop_size_bytes = (
-            self._hop_size * self._audio_source.sw * self._audio_source.ch
-        )
-        cache = block[_hop_size_bytes:]
-        yield block
-
-        while True:
-            block = self._audio_source.read(self._hop_size)
-            if block:
-                block = cache + block
-                cache = block[_hop_size_bytes:]
-                yield block
-                continue
-            yield None
-
-    def read(self):
-        try:
-            block = next(self._blocks)
-            if block == AudioIOError:
-                raise AudioIOError("Audio Stream is not open.")
-            return block
-        except StopIteration:
-            return None
-
-    def rewind(self):
-        super(_OverlapAudioReader, self).rewind()
-        self._blocks = self._iter_blocks_with_overlap()
+        super(_ReadAheadBuffer, self).rewind()
+        self._clear()
 
     @property
-    def hop_size(self):
-        return self._hop_size
-
-    @property
-    def hop_dur(self):
-        return self._hop_size / self.sr
-
-    def __getattr__(self, name):
-        return getattr(self._audio_source, name)
+    def position(self):
+        if self._buffer_stop is None:
+            return self._audio_source.position
+        buffer = self._buffer
+        buffered_bytes = len(buffer.getbuffer()) - buffer.tell()
+        return self._buffer_stop - buffered_bytes // self._bytes_per_sample
 
 
 class AudioReader(DataSource):
     """
     Base class for AudioReader objects.
     It inherits from DataSource and encapsulates an AudioSource object.
+
+    Windows of `block_dur` seconds (overlapping windows if `hop_dur` is
+    given) are read from the audio source, limited to `max_read` seconds if
+    given, and read data is recorded if `record` is True. All these options
+    are resolved when the reader is created so that each call to
+    :func:`read` is as cheap as possible.
+
+    If `read_ahead` is given, data is read from the audio source in chunks
+    of `read_ahead` seconds (or more if a window is longer) and windows are
+    served from these chunks, rather than with one read per window. Windows
+    and `max_read` are the same as without read-ahead, but the position of
+    the audio source is ahead of the last read window. `read_ahead` is
+    ignored for audio data already in memory (i.e., `BufferAudioSource` or
+    memory-mapped files). A large `read_ahead` delays the first window when
+    reading from microphone.
+
+    Recorded data is kept in memory or, if `record_max_memory` is given,
+    written to a temporary file once it exceeds `record_max_memory` bytes.
+    Recorded data is not copied on first call to `rewind`, it is read back
+    from memory or from the memory-mapped temporary file. `data` is then a
+    `bytes` object or a read-only `memoryview` of the temporary file.
     """
 
     def __init__(
@@ -932,21 +1480,76 @@ class AudioReader(DataSource):
         hop_dur=None,
         record=False,
         max_read=None,
+        read_ahead=None,
+        record_max_memory=None,
         **kwargs
     ):
         if not isinstance(input, AudioSource):
             input = get_audio_source(input, **kwargs)
+        if read_ahead is not None and not isinstance(
+            input, (BufferAudioSource, MmapRawAudioSource, MmapWaveAudioSource)
+        ):
+            input = _ReadAheadBuffer(input, read_ahead, max_read)
+        self._audio_source = input
         self._record = record
+        self._max_read = max_read
+        self._bytes_per_sample = input.sw * input.ch
+
+        if hop_dur is not None and hop_dur >= block_dur:
+            raise ValueError('"hop_dur" should be < "block_dur"')
+        if block_dur <= 0:
+            raise ValueError(
+                "block_dur must be > 0, given: {}".format(block_dur)
+            )
+        self._block_size = int(block_dur * input.sr)
+        if self._block_size == 0:
+            err_msg = "Too small block_dur ({0:f}) for sampling rate ({1}). "
+            err_msg += "block_dur should cover at least one sample "
+            err_msg += "(i.e. 1/{1})"
+            raise TooSamllBlockDuration(
+                err_msg.format(block_dur, input.sr), block_dur, input.sr
+            )
+        self._hop_size = None
+        if hop_dur is not None:
+            self._hop_size = int(hop_dur * input.sr)
+            if self._hop_size < 1:
+                err_msg = "Too small hop_dur ({0:f}) for sampling rate ({1}). "
+                err_msg += "hop_dur should cover at least one sample "
+                err_msg += "(i.e. 1/{1})"
+                raise ValueError(err_msg.format(hop_dur, input.sr))
+
+        # recorded data, `_record_block` writes blocks to memory without
+        # checking data size if `record_max_memory` is None
+        self._cache = None
+        self._record_max_memory = record_max_memory
         if record:
-            input = _Recorder(input)
+            self._cache = BytesIO()
+            self._record_block = self._cache.write
+            if record_max_memory is not None:
+                self._record_block = self._record_block_with_limit
+        self._data = None
+        # limit of data to read
+        self._max_samples = None
         if max_read is not None:
-            input = _Limiter(input, max_read)
-            self._max_read = max_read
+            self._max_samples = round(max_read * input.sr)
+        self._read_samples = 0
+        # `_read_source` reads data from audio source, with limit and/or
+        # record if required, and `_read_block` reads one window
+        if record and max_read is not None:
+            self._read_source = self._read_limited_recorded
+        elif record:
+            self._read_source = self._read_recorded
+        elif max_read is not None:
+            self._read_source = self._read_limited
+        else:
+            self._read_source = input.read
+        self._zero_copy = getattr(input, "zero_copy", False)
+        self._overlap_cache = None
         if hop_dur is not None:
-            input = _OverlapAudioReader(input, block_dur, hop_dur)
+            self._hop_size_bytes = self._hop_size * self._bytes_per_sample
+            self._read_block = self._read_overlap
         else:
-            input = _FixedSizeAudioReader(input, block_dur)
-        self._audio_source = input
+            self._read_block = partial(self._read_source, self._block_size)
 
     def __repr__(self):
         block_dur, hop_dur, max_read = None, None, None
@@ -968,41 +1571,135 @@ class AudioReader(DataSource):
             max_read=max_read,
         )
 
+    def _read_limited(self, size):
+        size = min(self._max_samples - self._read_samples, size)
+        if size <= 0:
+            return None
+        block = self._audio_source.read(size)
+        if block is None:
+            return None
+        self._read_samples += len(block) // self._bytes_per_sample
+        return block
+
+    def _read_recorded(self, size):
+        block = self._audio_source.read(size)
+        if block is not None and self._cache is not None:
+            self._record_block(block)
+        return block
+
+    def _read_limited_recorded(self, size):
+        block = self._read_limited(size)
+        if block is not None and self._cache is not None:
+            self._record_block(block)
+        return block
+
+    def _record_block_with_limit(self, block):
+        self._cache.write(block)
+        if self._cache.tell() > self._record_max_memory:
+            # spill recorded data to disk, next blocks are written to file
+            tmp_file = TemporaryFile()
+            tmp_file.write(self._cache.getbuffer())
+            self._cache = tmp_file
+            self._record_block = tmp_file.write
+
+    def _get_recorded_data(self):
+        cache = self._cache
+        self._cache = None
+        if isinstance(cache, BytesIO):
+            # `getvalue` shares BytesIO's buffer, data is not copied
+            return cache.getvalue()
+        cache.flush()
+        mapped = mmap.mmap(cache.fileno(), 0, access=mmap.ACCESS_READ)
+        cache.close()
+        return memoryview(mapped)
+
+    def _read_overlap(self):
+        cache = self._overlap_cache
+        if cache is None:
+            # first window
+            if not self._audio_source.is_open():
+                raise AudioIOError("Audio Stream is not open.")
+            block = self._read_source(self._block_size)
+            if block is not None:
+                self._overlap_cache = block[self._hop_size_bytes :]
+            return block
+        block = self._read_source(self._hop_size)
+        if not block:
+            return None
+        if self._zero_copy and isinstance(block, memoryview):
+            # zero-copy source: instead of joining blocks, take a view of
+            # the window from the source's data. Window ends at the current
+            # position of source
+            stop = self._audio_source.position
+            start = stop - (len(cache) + len(block)) // self._bytes_per_sample
+            block = self._audio_source.view(start, stop)
+        else:
+            block = cache + block
+        self._overlap_cache = block[self._hop_size_bytes :]
+        return block
+
+    def _rewind(self):
+        if self._data is None:
+            # first rewind, recorded data is read from memory from now on
+            self._data = self._get_recorded_data()
+            self._audio_source = BufferAudioSource(
+                self._data, self.sr, self.sw, self.ch
+            )
+            self._audio_source.open()
+            self._zero_copy = False
+        else:
+            self._audio_source.rewind()
+        self._read_samples = 0
+        self._overlap_cache = None
+
+    @property
+    def _recorded_data(self):
+        if self._data is None:
+            err_msg = "Unrewinded recorder. Call rewind before accessing "
+            err_msg += "recorded data"
+            raise RuntimeError(err_msg)
+        return self._data
+
     @property
     def rewindable(self):
         return self._record
 
+    @property
+    def block_size(self):
+        return self._block_size
+
     @property
     def block_dur(self):
-        return self._audio_source.block_size / self._audio_source.sr
+        return self._block_size / self.sr
 
     @property
     def hop_dur(self):
-        if hasattr(self._audio_source, "hop_dur"):
-            return self._audio_source.hop_size / self._audio_source.sr
+        if self._hop_size is not None:
+            return self._hop_size / self.sr
         return self.block_dur
 
     @property
     def hop_size(self):
-        if hasattr(self._audio_source, "hop_size"):
-            return self._audio_source.hop_size
-        return self.block_size
+        if self._hop_size is not None:
+            return self._hop_size
+        return self._block_size
 
     @property
     def max_read(self):
-        try:
-            return self._audio_source.max_read
-        except AttributeError:
-            return None
+        return self._max_read
 
     def read(self):
-        return self._audio_source.read()
+        return self._read_block()
 
     def __getattr__(self, name):
-        if name in ("data", "rewind") and not self.rewindable:
-            raise AttributeError(
-                "'AudioReader' has no attribute '{}'".format(name)
-            )
+        if name in ("data", "rewind"):
+            if not self._record:
+                raise AttributeError(
+                    "'AudioReader' has no attribute '{}'".format(name)
+                )
+            if name == "data":
+                return self._recorded_data
+            return self._rewind
         try:
             return getattr(self._audio_source, name)
         except AttributeError:
@@ -1018,7 +1715,14 @@ AudioDataSource = AudioReader
 
 class Recorder(AudioReader):
     def __init__(
-        self, input, block_dur=0.01, hop_dur=None, max_read=None, **kwargs
+        self,
+        input,
+        block_dur=0.01,
+        hop_dur=None,
+        max_read=None,
+        read_ahead=None,
+        record_max_memory=None,
+        **kwargs
     ):
         super().__init__(
             input,
@@ -1026,5 +1730,7 @@ class Recorder(AudioReader):
             hop_dur=hop_dur,
             record=True,
             max_read=max_read,
+            read_ahead=read_ahead,
+            record_max_memory=record_max_memory,
             **kwargs
         )
@@ -0,0 +1,94 @@
+"""
+Measure the time it takes `split` to detect short audio events in mostly
+silent audio with and without a coarse pass (i.e., `coarse_window`).
+
+Usage: python benchmarks/coarse_to_fine.py [duration]
+
+Audio data is `duration` seconds (default: 600) of 16 bit mono audio at
+16 kHz made of low energy noise with a 0.2 second burst of louder noise every
+10 seconds. Events are detected with 10 ms analysis windows, in data in
+memory and in a raw audio file read in shards (`large_file=True`), with
+coarse windows of 0.1, 0.5 and 1 second. Coarse windows are only used
+without numpy, run with the pure Python backend to measure their effect.
+"""
+
+import os
+import sys
+import timeit
+from array import array
+from random import Random
+from tempfile import TemporaryDirectory
+from auditok import split
+
+SAMPLING_RATE = 16000
+SAMPLE_WIDTH = 2
+ANALYSIS_WINDOW = 0.01
+EVENT_PERIOD = 10
+EVENT_DURATION = 0.2
+
+
+def _make_data(duration):
+    rng = Random(0)
+    samples = array("h", (rng.randint(-20, 20) for _ in range(SAMPLING_RATE)))
+    samples *= int(duration)
+    event_size = int(EVENT_DURATION * SAMPLING_RATE)
+    event = array("h", (rng.randint(-5000, 5000) for _ in range(event_size)))
+    for start in range(0, len(samples), EVENT_PERIOD * SAMPLING_RATE):
+        samples[start : start + event_size] = event
+    return samples.tobytes()
+
+
+def _time(function, repeat=3):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(duration=600):
+    data = _make_data(duration)
+    params = {
+        "sr": SAMPLING_RATE,
+        "sw": SAMPLE_WIDTH,
+        "ch": 1,
+        "min_dur": 0.1,
+        "max_silence": 0.1,
+        "analysis_window": ANALYSIS_WINDOW,
+    }
+    print(
+        "{:.0f} s of audio, {:.0f} ms analysis windows".format(
+            duration, ANALYSIS_WINDOW * 1000
+        )
+    )
+    print("{:>14} {:>12} {:>12}".format("coarse_window", "bytes", "raw file"))
+    with TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "audio.raw")
+        with open(filename, "wb") as fp:
+            fp.write(data)
+        expected = None
+        for coarse_window in (None, 0.1, 0.5, 1):
+            timings = []
+            inputs = ((data, {}), (filename, {"large_file": True}))
+            for input, kwargs in inputs:
+
+                def detect():
+                    return [
+                        (region.meta.start, region.meta.end)
+                        for region in split(
+                            input,
+                            coarse_window=coarse_window,
+                            **kwargs,
+                            **params,
+                        )
+                    ]
+
+                if expected is None:
+                    expected = detect()
+                assert detect() == expected
+                timings.append(_time(detect))
+            print(
+                "{:>14} {:>10.4f} s {:>10.4f} s".format(
+                    str(coarse_window), *timings
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,72 @@
+"""
+Measure the time it takes `AudioEnergyValidator` to compute the energy of
+all analysis windows of multichannel audio data, with `use_channel` set to
+None ("any") and to "mix".
+
+Usage: python benchmarks/multichannel_energy.py [duration]
+
+Energies are computed on `duration` seconds (default: 60) of random 16 bit
+audio data at 16 kHz with 2, 8 and 32 channels, one 50 ms window at a time
+(i.e., as `AudioEnergyValidator.is_valid` does) and with one single call to
+`AudioEnergyValidator.energy_track`.
+"""
+
+import os
+import sys
+import timeit
+from auditok import AudioEnergyValidator
+
+SAMPLING_RATE = 16000
+SAMPLE_WIDTH = 2
+WINDOW_SIZE = 800
+
+
+def _time(function, repeat=3):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(duration=60):
+    nb_samples = int(duration * SAMPLING_RATE)
+    print(
+        "{:.0f} s of {} bit audio, windows of {} samples".format(
+            duration, SAMPLE_WIDTH * 8, WINDOW_SIZE
+        )
+    )
+    print(
+        "{:>8} {:>12} {:>14} {:>14}".format(
+            "channels", "use_channel", "per window", "energy_track"
+        )
+    )
+    for channels in (2, 8, 32):
+        data = os.urandom(nb_samples * SAMPLE_WIDTH * channels)
+        window_bytes = WINDOW_SIZE * SAMPLE_WIDTH * channels
+        windows = [
+            data[i : i + window_bytes]
+            for i in range(0, len(data), window_bytes)
+        ]
+        for use_channel in (None, "mix"):
+            validator = AudioEnergyValidator(
+                50, SAMPLE_WIDTH, channels, use_channel
+            )
+
+            def per_window():
+                return [
+                    validator._energy_fn(
+                        validator._selector(window), SAMPLE_WIDTH
+                    )
+                    for window in windows
+                ]
+
+            per_window_time = _time(per_window)
+            batch_time = _time(
+                lambda: validator.energy_track(data, WINDOW_SIZE)
+            )
+            print(
+                "{:>8} {:>12} {:>12.4f} s {:>12.4f} s".format(
+                    channels, str(use_channel), per_window_time, batch_time
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
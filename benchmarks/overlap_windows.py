@@ -0,0 +1,65 @@
+"""
+Measure the time it takes `split` to detect audio events in data in memory
+with overlapping analysis windows (i.e., with `hop_dur`).
+
+Usage: python benchmarks/overlap_windows.py [duration]
+
+Audio data is `duration` seconds (default: 600) of 16 bit mono audio at
+16 kHz made of low energy noise with a 0.2 second burst of louder noise every
+10 seconds. Events are detected with 20 ms analysis windows and hops of 10
+and 5 ms.
+"""
+
+import sys
+import timeit
+from array import array
+from random import Random
+from auditok import split
+
+SAMPLING_RATE = 16000
+ANALYSIS_WINDOW = 0.02
+EVENT_PERIOD = 10
+EVENT_DURATION = 0.2
+
+
+def _make_data(duration):
+    rng = Random(0)
+    samples = array("h", (rng.randint(-20, 20) for _ in range(SAMPLING_RATE)))
+    samples *= int(duration)
+    event_size = int(EVENT_DURATION * SAMPLING_RATE)
+    event = array("h", (rng.randint(-5000, 5000) for _ in range(event_size)))
+    for start in range(0, len(samples), EVENT_PERIOD * SAMPLING_RATE):
+        samples[start : start + event_size] = event
+    return samples.tobytes()
+
+
+def main(duration=600):
+    data = _make_data(duration)
+    params = {
+        "sr": SAMPLING_RATE,
+        "sw": 2,
+        "ch": 1,
+        "min_dur": 0.1,
+        "max_silence": 0.1,
+        "analysis_window": ANALYSIS_WINDOW,
+    }
+    print(
+        "{:.0f} s of audio, {:.0f} ms analysis windows".format(
+            duration, ANALYSIS_WINDOW * 1000
+        )
+    )
+    print("{:>8} {:>8} {:>12}".format("hop_dur", "regions", "split"))
+    for hop_dur in (0.01, 0.005):
+
+        def detect():
+            return list(split(data, hop_dur=hop_dur, **params))
+
+        nb_regions = len(detect())
+        duration_s = min(timeit.repeat(detect, number=1, repeat=3))
+        print(
+            "{:>8} {:>8} {:>10.4f} s".format(hop_dur, nb_regions, duration_s)
+        )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+"""
+Measure the number of windows per second `AudioReader.read` returns when
+reading from a `BufferAudioSource`, with and without `max_read`, recording
+and overlapping windows.
+
+Usage: python benchmarks/reader_throughput.py [duration]
+
+Windows of 10 ms (with a hop of 5 ms for overlapping windows) are read from
+`duration` seconds (default: 600) of 16 bit mono audio data at 16 kHz.
+"""
+
+import sys
+import timeit
+from auditok import AudioReader, BufferAudioSource
+
+SAMPLING_RATE = 16000
+SAMPLE_WIDTH = 2
+BLOCK_DUR = 0.01
+HOP_DUR = 0.005
+
+
+def _read_all(reader):
+    reader.open()
+    nb_reads = 0
+    read = reader.read
+    while read() is not None:
+        nb_reads += 1
+    reader.close()
+    return nb_reads
+
+
+def main(duration=600):
+    data = b"\0" * int(duration * SAMPLING_RATE) * SAMPLE_WIDTH
+    configs = [
+        ("plain", {}),
+        ("max_read", {"max_read": duration}),
+        ("record", {"record": True}),
+        ("record + max_read", {"record": True, "max_read": duration}),
+        ("overlap", {"hop_dur": HOP_DUR}),
+        ("overlap + max_read", {"hop_dur": HOP_DUR, "max_read": duration}),
+    ]
+    print(
+        "{:.0f} s of audio, {:.0f} ms windows".format(
+            duration, BLOCK_DUR * 1000
+        )
+    )
+    print("{:<20} {:>10} {:>16}".format("reader", "reads", "reads/s"))
+    for name, kwargs in configs:
+
+        def read_all():
+            audio_source = BufferAudioSource(
+                data, SAMPLING_RATE, SAMPLE_WIDTH, 1
+            )
+            reader = AudioReader(audio_source, block_dur=BLOCK_DUR, **kwargs)
+            return _read_all(reader)
+
+        nb_reads = read_all()
+        duration_s = min(timeit.repeat(read_all, number=1, repeat=7))
+        print(
+            "{:<20} {:>10} {:>16,.0f}".format(
+                name, nb_reads, nb_reads / duration_s
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
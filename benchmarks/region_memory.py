@@ -0,0 +1,52 @@
+"""
+Measure memory footprint and construction time of `AudioRegion` objects.
+
+Usage: python benchmarks/region_memory.py [nb_regions]
+
+Regions are built as `split` builds them: with a short piece of data and
+`start`/`end` metadata. Memory is measured with `tracemalloc` and doesn't
+include audio data, which is shared by all regions.
+"""
+
+import sys
+import timeit
+import tracemalloc
+from auditok import AudioRegion
+
+
+def build_regions(data, nb_regions):
+    return [
+        AudioRegion(
+            data, 16000, 2, 1, {"start": i * 0.1, "end": i * 0.1 + 0.1}
+        )
+        for i in range(nb_regions)
+    ]
+
+
+def main(nb_regions=100000):
+    data = b"\0" * 3200
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    regions = build_regions(data, nb_regions)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # metadata and views are accessed as a user of `split` would do
+    for region in regions[:10]:
+        region.meta.start, region.sec[0.01:0.05], region.ms.len
+    del regions
+    duration = min(
+        timeit.repeat(lambda: build_regions(data, nb_regions), number=1)
+    )
+    print("regions: {}".format(nb_regions))
+    print(
+        "memory per region: {:.0f} bytes".format((after - before) / nb_regions)
+    )
+    print(
+        "construction time per region: {:.3f} us".format(
+            duration / nb_regions * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
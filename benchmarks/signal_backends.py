@@ -0,0 +1,118 @@
+"""
+Compare the pure Python (`auditok.signal`, with and without audioop) and the
+numpy (`auditok.signal_numpy`) signal backends.
+
+Usage: python benchmarks/signal_backends.py [duration]
+
+Each function is timed on `duration` seconds (default: 60) of random 16 bit
+stereo audio data at 16 kHz, processed one 50 ms window at a time, as
+`AudioEnergyValidator.is_valid` does, and, for the numpy backend, on all
+windows at once.
+"""
+
+import os
+import sys
+import timeit
+from unittest.mock import patch
+from auditok import signal as signal_python
+from auditok import signal_numpy
+
+SAMPLING_RATE = 16000
+SAMPLE_WIDTH = 2
+CHANNELS = 2
+WINDOW_SIZE = 800
+
+
+def _time(function, repeat=3):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def _windows(data):
+    window_bytes = WINDOW_SIZE * SAMPLE_WIDTH * CHANNELS
+    return [
+        data[i : i + window_bytes] for i in range(0, len(data), window_bytes)
+    ]
+
+
+def per_window_functions(signal):
+    fmt = signal.FORMAT[SAMPLE_WIDTH]
+    return {
+        "rms": lambda x: signal.calculate_rms(x, SAMPLE_WIDTH),
+        "mix stereo": lambda x: signal.average_channels_stereo(
+            x, SAMPLE_WIDTH
+        ),
+        "average channels": lambda x: signal.average_channels(
+            x, fmt, CHANNELS
+        ),
+        "extract channel": lambda x: signal.extract_single_channel(
+            x, fmt, CHANNELS, 1
+        ),
+        "energy (any)": lambda x: signal.calculate_energy_multichannel(
+            signal.separate_channels(x, fmt, CHANNELS), SAMPLE_WIDTH
+        ),
+    }
+
+
+def batch_functions():
+    fmt = signal_numpy.FORMAT[SAMPLE_WIDTH]
+
+    def frames(data):
+        return signal_numpy.to_frames(data, fmt, CHANNELS, WINDOW_SIZE)
+
+    return {
+        "rms": lambda x: signal_numpy.calculate_rms_frames(
+            frames(x).reshape(-1, WINDOW_SIZE * CHANNELS), SAMPLE_WIDTH
+        ),
+        "mix stereo": lambda x: signal_numpy.mix_frames(frames(x)),
+        "extract channel": lambda x: frames(x)[:, :, 1].copy(),
+        "energy (any)": lambda x: signal_numpy.calculate_energy_frames(
+            frames(x).transpose(0, 2, 1), SAMPLE_WIDTH
+        ).max(axis=1),
+    }
+
+
+def main(duration=60):
+    data = os.urandom(int(duration * SAMPLING_RATE) * SAMPLE_WIDTH * CHANNELS)
+    windows = _windows(data)
+    results = {}
+    backends = [
+        ("python", signal_python, False),
+        ("numpy", signal_numpy, False),
+    ]
+    if signal_python._WITH_AUDIOOP:
+        backends.insert(0, ("python+audioop", signal_python, True))
+    for name, signal, with_audioop in backends:
+        with patch.object(signal_python, "_WITH_AUDIOOP", with_audioop):
+            for fn_name, function in per_window_functions(signal).items():
+                results.setdefault(fn_name, {})[name] = _time(
+                    lambda: [function(x) for x in windows]
+                )
+    for fn_name, function in batch_functions().items():
+        results[fn_name]["numpy (batch)"] = _time(lambda: function(data))
+
+    columns = [name for name, _, _ in backends] + ["numpy (batch)"]
+    print(
+        "{:.0f} s of {} bit stereo audio, {} windows of {} samples".format(
+            duration, SAMPLE_WIDTH * 8, len(windows), WINDOW_SIZE
+        )
+    )
+    print(
+        "{:<22}".format("function")
+        + "".join("{:>16}".format(column) for column in columns)
+    )
+    for fn_name, timings in results.items():
+        print(
+            "{:<22}".format(fn_name)
+            + "".join(
+                "{:>16}".format(
+                    "-"
+                    if column not in timings
+                    else "{:.4f} s".format(timings[column])
+                )
+                for column in columns
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,75 @@
+"""
+Measure the throughput of spectral validators (`BandEnergyValidator`,
+`ZeroCrossingRateValidator` and `SpectralFlatnessValidator`) compared to
+`AudioEnergyValidator`.
+
+Usage: python benchmarks/spectral_validators.py [duration]
+
+Validators are called on `duration` seconds (default: 60) of random 16 bit
+mono audio data at 16 kHz, one 50 ms window at a time (i.e., with `is_valid`,
+as a per-frame Python validator would be) and on all windows at once with
+`is_valid_batch` (i.e., as `split` calls them).
+"""
+
+import os
+import sys
+import timeit
+from auditok import (
+    AudioEnergyValidator,
+    BandEnergyValidator,
+    ZeroCrossingRateValidator,
+    SpectralFlatnessValidator,
+)
+from auditok import signal_numpy
+
+SAMPLING_RATE = 16000
+SAMPLE_WIDTH = 2
+WINDOW_SIZE = 800
+
+
+def _time(function, repeat=3):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main(duration=60):
+    data = os.urandom(int(duration * SAMPLING_RATE) * SAMPLE_WIDTH)
+    window_bytes = WINDOW_SIZE * SAMPLE_WIDTH
+    windows = [
+        data[i : i + window_bytes] for i in range(0, len(data), window_bytes)
+    ]
+    frames = signal_numpy.to_frames(
+        data, signal_numpy.FORMAT[SAMPLE_WIDTH], 1, WINDOW_SIZE
+    )[:, :, 0]
+    validators = [
+        AudioEnergyValidator(50, SAMPLE_WIDTH, 1),
+        BandEnergyValidator(50, (300, 3400), SAMPLING_RATE, SAMPLE_WIDTH, 1),
+        ZeroCrossingRateValidator(0.2, SAMPLE_WIDTH, 1),
+        SpectralFlatnessValidator(0.3, SAMPLE_WIDTH, 1),
+    ]
+    print(
+        "{:.0f} s of {} bit audio, {} windows of {} samples".format(
+            duration, SAMPLE_WIDTH * 8, len(windows), WINDOW_SIZE
+        )
+    )
+    print(
+        "{:<26} {:>14} {:>14} {:>18}".format(
+            "validator", "is_valid", "is_valid_batch", "windows/s (batch)"
+        )
+    )
+    for validator in validators:
+        per_window_time = _time(
+            lambda: [validator.is_valid(window) for window in windows]
+        )
+        batch_time = _time(lambda: validator.is_valid_batch(frames))
+        print(
+            "{:<26} {:>12.4f} s {:>12.4f} s {:>18.0f}".format(
+                validator.__class__.__name__,
+                per_window_time,
+                batch_time,
+                len(windows) / batch_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -8,6 +8,7 @@ import unittest
 from functools import partial
 import sys
 import wave
+from unittest.mock import patch
 from genty import genty, genty_dataset
 from auditok import (
     dataset,
@@ -19,6 +20,7 @@ from auditok import (
     WaveAudioSource,
     DuplicateArgument,
 )
+from auditok.io import get_audio_source
 
 
 class TestADSFactoryFileAudioSource(unittest.TestCase):
@@ -1054,6 +1056,185 @@ class TestAudioReader(unittest.TestCase):
             self.assertEqual(data, reader.data)
         reader.close()
 
+    @genty_dataset(
+        in_memory=(10 ** 6, None, None, False),
+        spilled=(1000, None, None, True),
+        spilled_first_block=(0, None, None, True),
+        spilled_overlap=(1000, 0.03, None, True),
+        spilled_max_read=(1000, None, 0.77, True),
+        in_memory_max_read=(73920, None, 0.77, False),
+    )
+    def test_Recorder_max_memory(self, max_memory, hop_dur, max_read, spill):
+        input_wav = "tests/data/test_16KHZ_3channel_400-800-1600Hz.wav"
+        reader = AudioReader(
+            input_wav,
+            block_dur=0.1,
+            hop_dur=hop_dur,
+            max_read=max_read,
+            record=True,
+            record_max_memory=max_memory,
+        )
+        reader.open()
+        expected = _read_all_data(reader)
+        reader.rewind()
+        if spill:
+            # data is a view of the memory-mapped temporary file
+            self.assertIsInstance(reader.data, memoryview)
+            self.assertTrue(reader.data.readonly)
+        else:
+            self.assertIsInstance(reader.data, bytes)
+        # rewind many times
+        for _ in range(3):
+            data = _read_all_data(reader)
+            self.assertEqual(data, expected)
+            if hop_dur is None:
+                self.assertEqual(reader.data, expected)
+            reader.rewind()
+        reader.close()
+
+    def test_too_small_hop_dur(self):
+        with self.assertRaises(ValueError) as val_err:
+            AudioReader(
+                b"\0" * 20, block_dur=0.2, hop_dur=0.05, sr=10, sw=1, ch=1
+            )
+        err_msg = "Too small hop_dur (0.050000) for sampling rate (10). "
+        err_msg += "hop_dur should cover at least one sample (i.e. 1/10)"
+        self.assertEqual(err_msg, str(val_err.exception))
+
+    @genty_dataset(
+        no_overlap=(None, None),
+        no_overlap_max_read=(None, 0.77),
+        overlap=(0.03, None),
+        overlap_max_read=(0.03, 0.77),
+        overlap_small_hop=(0.007, 0.77),
+    )
+    def test_zero_copy(self, hop_dur, max_read):
+        input_raw = "tests/data/test_16KHZ_3channel_400-800-1600Hz.raw"
+        with open(input_raw, "rb") as fp:
+            data = fp.read()
+        params = {"sr": 16000, "sw": 2, "ch": 3}
+        reader = AudioReader(
+            data, block_dur=0.05, hop_dur=hop_dur, max_read=max_read, **params
+        )
+        reader_zc = AudioReader(
+            data,
+            block_dur=0.05,
+            hop_dur=hop_dur,
+            max_read=max_read,
+            zero_copy=True,
+            **params
+        )
+        reader.open()
+        reader_zc.open()
+        while True:
+            block = reader.read()
+            block_zc = reader_zc.read()
+            if block is None:
+                self.assertIsNone(block_zc)
+                break
+            self.assertIsInstance(block_zc, memoryview)
+            self.assertEqual(block_zc, block)
+        reader.close()
+        reader_zc.close()
+
+    @genty_dataset(
+        no_overlap=(0.1, None, None, False),
+        no_overlap_max_read=(0.1, None, 0.77, False),
+        window_larger_than_chunk=(0.3, None, None, False),
+        overlap=(0.1, 0.03, 0.77, False),
+        record=(0.1, None, None, True),
+        record_max_read=(0.07, None, 0.77, True),
+    )
+    def test_read_ahead(self, block_dur, hop_dur, max_read, record):
+        input_raw = "tests/data/test_16KHZ_3channel_400-800-1600Hz.raw"
+        params = {"sr": 16000, "sw": 2, "ch": 3}
+        reader = AudioReader(
+            input_raw,
+            block_dur=block_dur,
+            hop_dur=hop_dur,
+            record=record,
+            max_read=max_read,
+            **params
+        )
+        audio_source = get_audio_source(
+            input_raw, large_file=True, use_mmap=False, **params
+        )
+        reader_ra = AudioReader(
+            audio_source,
+            block_dur=block_dur,
+            hop_dur=hop_dur,
+            record=record,
+            max_read=max_read,
+            read_ahead=0.25,
+        )
+        reader.open()
+        reader_ra.open()
+        nb_windows = 0
+        with patch.object(
+            audio_source, "read", wraps=audio_source.read
+        ) as read:
+            while True:
+                block = reader.read()
+                self.assertEqual(reader_ra.read(), block)
+                if block is None:
+                    break
+                nb_windows += 1
+        self.assertGreater(nb_windows, 2)
+        # one read per chunk (or per window if windows are larger) and two
+        # reads at the end of file
+        chunk_dur = max(block_dur, 0.25)
+        self.assertLessEqual(
+            read.call_count, -(-(max_read or 1) // chunk_dur) + 2
+        )
+        if record:
+            reader.rewind()
+            reader_ra.rewind()
+            self.assertEqual(reader_ra.data, reader.data)
+            self.assertEqual(_read_all_data(reader_ra), _read_all_data(reader))
+        reader.close()
+        reader_ra.close()
+
+    def test_read_ahead_max_read(self):
+        input_raw = "tests/data/test_16KHZ_mono_400Hz.raw"
+        reader = AudioReader(
+            input_raw,
+            block_dur=0.1,
+            max_read=0.5,
+            read_ahead=2,
+            large_file=True,
+            use_mmap=False,
+            sr=16000,
+            sw=2,
+            ch=1,
+        )
+        reader.open()
+        data = _read_all_data(reader)
+        self.assertEqual(len(data), 16000)
+        # no data is read from audio source beyond `max_read`
+        self.assertEqual(reader.position, 8000)
+        reader.close()
+
+    def test_read_ahead_position(self):
+        input_raw = "tests/data/test_16KHZ_mono_400Hz.raw"
+        with open(input_raw, "rb") as fp:
+            expected = fp.read()
+        audio_source = get_audio_source(
+            input_raw, large_file=True, use_mmap=False, sr=16000, sw=2, ch=1
+        )
+        reader = AudioReader(audio_source, block_dur=0.1, read_ahead=0.5)
+        reader.open()
+        self.assertEqual(reader.read(), expected[:3200])
+        # audio source is ahead of reader
+        self.assertEqual(audio_source.position, 8000)
+        self.assertEqual(reader.position, 1600)
+        # reading from audio source while reader is used doesn't change
+        # the windows returned by reader
+        audio_source.position = 0
+        audio_source.read(100)
+        self.assertEqual(reader.read(), expected[3200:6400])
+        self.assertEqual(reader.position, 3200)
+        reader.close()
+
     @genty_dataset(mono=("mono_400",), multichannel=("3channel_400-800-1600",))
     def test_Recorder_alias(self, file_id):
         input_wav = "tests/data/test_16KHZ_{}Hz.wav".format(file_id)
@@ -1,14 +1,26 @@
 """
 @author: Amine Sehili <amine.sehili@gmail.com>
 """
+import os
+import sys
+import struct
+from io import BytesIO
 from array import array
+from tempfile import TemporaryDirectory
 import unittest
+from unittest.mock import patch
 from genty import genty, genty_dataset
 from auditok.io import (
+    AudioIOError,
     AudioParameterError,
     BufferAudioSource,
     RawAudioSource,
     WaveAudioSource,
+    MmapRawAudioSource,
+    MmapWaveAudioSource,
+    StdinAudioSource,
+    PrefetchAudioSource,
+    _MappedAudioSourceMixin,
 )
 from auditok.signal import FORMAT
 from test_util import PURE_TONE_DICT, _sample_generator
@@ -108,6 +120,271 @@ class TestAudioSource(unittest.TestCase):
         audio_source.close()
         self.assertEqual(data_read_all, expected)
 
+    @genty_dataset(
+        raw_mono=("raw", "mono_400Hz", 1),
+        raw_multichannel=("raw", "3channel_400-800-1600Hz", 3),
+        wave_mono=("wav", "mono_400Hz", 1),
+        wave_multichannel=("wav", "3channel_400-800-1600Hz", 3),
+    )
+    def test_file_audio_source_position(self, ext, file_suffix, channels):
+        file = "tests/data/test_16KHZ_{}.{}".format(file_suffix, ext)
+        if ext == "raw":
+            audio_source = RawAudioSource(file, 16000, 2, channels)
+        else:
+            audio_source = WaveAudioSource(file)
+        audio_source.open()
+        expected = audio_source.read(None)
+        nb_samples = len(expected) // (2 * channels)
+        self.assertEqual(audio_source.position, nb_samples)
+        audio_source.rewind()
+        self.assertEqual(audio_source.position, 0)
+
+        audio_source.position = 100
+        data = audio_source.read(50)
+        self.assertEqual(data, expected[200 * channels : 300 * channels])
+        self.assertEqual(audio_source.position, 150)
+
+        audio_source.position = -10
+        self.assertEqual(audio_source.position, nb_samples - 10)
+        self.assertEqual(audio_source.read(None), expected[-20 * channels :])
+
+        with self.assertRaises(IndexError):
+            audio_source.position = nb_samples + 1
+        audio_source.close()
+
+    @genty_dataset(
+        raw_mono=("raw", "mono_400Hz", 1),
+        raw_multichannel=("raw", "3channel_400-800-1600Hz", 3),
+        wave_mono=("wav", "mono_400Hz", 1),
+        wave_multichannel=("wav", "3channel_400-800-1600Hz", 3),
+    )
+    def test_mmap_audio_source(self, ext, file_suffix, channels):
+        file = "tests/data/test_16KHZ_{}.{}".format(file_suffix, ext)
+        if ext == "raw":
+            audio_source = RawAudioSource(file, 16000, 2, channels)
+            mmap_source = MmapRawAudioSource(file, 16000, 2, channels)
+        else:
+            audio_source = WaveAudioSource(file)
+            mmap_source = MmapWaveAudioSource(file)
+        audio_source.open()
+        mmap_source.open()
+        for size in (160, 1, 333, None):
+            self.assertEqual(mmap_source.read(size), audio_source.read(size))
+            self.assertEqual(mmap_source.position, audio_source.position)
+        self.assertIsNone(mmap_source.read(10))
+        mmap_source.position = -100
+        audio_source.position = -100
+        self.assertEqual(mmap_source.read(None), audio_source.read(None))
+        with self.assertRaises(IndexError):
+            mmap_source.position = audio_source.position + 1
+        audio_source.close()
+        mmap_source.rewind()
+        data = mmap_source.read(None)
+        self.assertEqual(bytes(mmap_source.data), data)
+        mmap_source.close()
+        self.assertFalse(mmap_source.is_open())
+
+    def test_mmap_audio_source_zero_copy(self):
+        file = "tests/data/test_16KHZ_mono_400Hz.raw"
+        with open(file, "rb") as fp:
+            expected = fp.read()
+        audio_source = MmapRawAudioSource(file, 16000, 2, 1, zero_copy=True)
+        audio_source.open()
+        data = audio_source.read(1000)
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(data, expected[:2000])
+        # data is still referenced, source can still be closed
+        audio_source.close()
+        self.assertEqual(data, expected[:2000])
+
+    @genty_dataset(
+        raw_mono=("raw", "mono_400Hz", 1),
+        wave_multichannel=("wav", "3channel_400-800-1600Hz", 3),
+    )
+    def test_mmap_audio_source_view(self, ext, file_suffix, channels):
+        file = "tests/data/test_16KHZ_{}.{}".format(file_suffix, ext)
+        if ext == "raw":
+            mmap_source = MmapRawAudioSource(file, 16000, 2, channels)
+        else:
+            mmap_source = MmapWaveAudioSource(file)
+        with self.assertRaises(AudioIOError):
+            mmap_source.view(0, 10)
+        mmap_source.open()
+        data = mmap_source.read(None)
+        sample_size = 2 * channels
+        view = mmap_source.view(100, 250)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view, data[100 * sample_size : 250 * sample_size])
+        # view doesn't depend on position
+        mmap_source.rewind()
+        self.assertEqual(mmap_source.view(100), data[100 * sample_size :])
+        self.assertEqual(mmap_source.position, 0)
+        view.release()
+        mmap_source.close()
+
+    def test_mmap_wave_audio_source_extra_chunk(self):
+        # data chunk is not necessarily the first chunk after "fmt "
+        file = "tests/data/test_16KHZ_mono_400Hz.wav"
+        with open(file, "rb") as fp:
+            content = fp.read()
+        data_offset = content.index(b"data")
+        extra_chunk = b"LIST" + struct.pack("<I", 3) + b"abc\0"
+        content = (
+            content[:data_offset] + extra_chunk + content[data_offset:]
+        )
+        riff_size = struct.pack("<I", len(content) - 8)
+        content = content[:4] + riff_size + content[8:]
+        with TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "audio.wav")
+            with open(filename, "wb") as fp:
+                fp.write(content)
+            audio_source = MmapWaveAudioSource(filename)
+            audio_source.open()
+            data = audio_source.read(None)
+            audio_source.close()
+        audio_source = WaveAudioSource(file)
+        audio_source.open()
+        self.assertEqual(data, audio_source.read(None))
+        audio_source.close()
+
+    def test_mmap_audio_source_empty_file(self):
+        with TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "audio.raw")
+            open(filename, "wb").close()
+            audio_source = MmapRawAudioSource(filename, 16000, 2, 1)
+            audio_source.open()
+            self.assertIsNone(audio_source.read(10))
+            self.assertEqual(audio_source.position, 0)
+            audio_source.close()
+
+    def test_mmap_audio_source_requires_locate_audio_data(self):
+        class _MmapRawAudioSource(_MappedAudioSourceMixin, RawAudioSource):
+            pass
+
+        with self.assertRaises(TypeError):
+            _MmapRawAudioSource("audio.raw", 16000, 2, 1)
+
+
+class _FailingAudioSource(BufferAudioSource):
+    def read(self, size):
+        if self.position >= 400:
+            raise IOError("read error")
+        return super().read(size)
+
+
+@genty
+class TestPrefetchAudioSource(unittest.TestCase):
+    def _make_audio_source(self, source_type, filename):
+        if source_type == "raw":
+            return RawAudioSource(filename, 16000, 2, 3)
+        if source_type == "wave":
+            return WaveAudioSource(filename.replace(".raw", ".wav"))
+        with open(filename, "rb") as fp:
+            data = fp.read()
+        if source_type == "stdin":
+            stdin = type("stdin", (), {"buffer": BytesIO(data)})
+            with patch.object(sys, "stdin", stdin):
+                return StdinAudioSource(16000, 2, 3)
+        return BufferAudioSource(data, 16000, 2, 3)
+
+    @genty_dataset(
+        raw=("raw", 0.1, 4, 1600),
+        wave=("wave", 0.1, 4, 1600),
+        stdin=("stdin", 0.1, 4, 1600),
+        buffer=("buffer", 0.1, 4, 1600),
+        window_larger_than_chunk=("raw", 0.01, 2, 1000),
+        odd_sizes=("wave", 0.033, 1, 777),
+    )
+    def test_read(self, source_type, chunk_dur, max_chunks, size):
+        filename = "tests/data/test_16KHZ_3channel_400-800-1600Hz.raw"
+        with open(filename, "rb") as fp:
+            expected = fp.read()
+        audio_source = PrefetchAudioSource(
+            self._make_audio_source(source_type, filename),
+            chunk_dur=chunk_dur,
+            max_chunks=max_chunks,
+        )
+        self.assertEqual(
+            (audio_source.sr, audio_source.sw, audio_source.ch), (16000, 2, 3)
+        )
+        audio_source.open()
+        blocks = list(audio_source_read_all_gen(audio_source, size))
+        self.assertIsNone(audio_source.read(size))
+        audio_source.close()
+        self.assertEqual(b"".join(blocks), expected)
+        for block in blocks[:-1]:
+            self.assertEqual(len(block), size * 6)
+        stats = audio_source.stats
+        nb_chunks = -(-len(expected) // (round(chunk_dur * 16000) * 6))
+        self.assertEqual(stats["chunks"], nb_chunks)
+        self.assertLessEqual(stats["max_queue_depth"], max_chunks)
+        self.assertLessEqual(stats["mean_queue_depth"], max_chunks)
+        self.assertLessEqual(stats["empty_queue"], nb_chunks + 1)
+
+    def test_read_all(self):
+        filename = "tests/data/test_16KHZ_3channel_400-800-1600Hz.raw"
+        with open(filename, "rb") as fp:
+            expected = fp.read()
+        audio_source = PrefetchAudioSource(
+            RawAudioSource(filename, 16000, 2, 3), chunk_dur=0.1
+        )
+        audio_source.open()
+        data = audio_source.read(100) + audio_source.read(None)
+        self.assertIsNone(audio_source.read(-1))
+        audio_source.close()
+        self.assertEqual(data, expected)
+
+    def test_queue_depth(self):
+        audio_source = PrefetchAudioSource(
+            BufferAudioSource(b"\0" * 32000, 16000, 2, 1),
+            chunk_dur=0.1,
+            max_chunks=3,
+        )
+        self.assertEqual(audio_source.queue_depth, 0)
+        audio_source.open()
+        # queue is filled by background thread before any read
+        audio_source._thread.join(timeout=0.1)
+        self.assertEqual(audio_source.queue_depth, 3)
+        audio_source.read(1600)
+        stats = audio_source.stats
+        self.assertEqual(stats["chunks"], 1)
+        self.assertEqual(stats["max_queue_depth"], 3)
+        self.assertEqual(stats["empty_queue"], 0)
+        self.assertGreaterEqual(stats["full_queue"], 1)
+        # closing source with a full queue stops background thread
+        audio_source.close()
+        self.assertFalse(audio_source.is_open())
+        self.assertEqual(audio_source.queue_depth, 0)
+
+    def test_read_error(self):
+        audio_source = PrefetchAudioSource(
+            _FailingAudioSource(b"\0" * 3200, 16000, 2, 1), chunk_dur=0.01
+        )
+        audio_source.open()
+        self.assertEqual(audio_source.read(300), b"\0" * 600)
+        with self.assertRaises(IOError) as io_err:
+            audio_source.read(300)
+        self.assertEqual(str(io_err.exception), "read error")
+        self.assertIsNone(audio_source.read(300))
+        audio_source.close()
+
+    def test_read_not_open(self):
+        audio_source = PrefetchAudioSource(
+            BufferAudioSource(b"\0" * 3200, 16000, 2, 1)
+        )
+        with self.assertRaises(AudioIOError):
+            audio_source.read(10)
+
+    @genty_dataset(
+        chunk_dur=({"chunk_dur": 0}, "'chunk_dur' must be > 0, given: 0"),
+        max_chunks=({"max_chunks": 0}, "'max_chunks' must be >= 1, given: 0"),
+    )
+    def test_wrong_parameters(self, kwargs, err_msg):
+        audio_source = BufferAudioSource(b"\0" * 3200, 16000, 2, 1)
+        with self.assertRaises(ValueError) as val_err:
+            PrefetchAudioSource(audio_source, **kwargs)
+        self.assertEqual(str(val_err.exception), err_msg)
+
 
 @genty
 class TestBufferAudioSource_SR10_SW1_CH1(unittest.TestCase):
@@ -446,6 +723,14 @@ class TestBufferAudioSource_SR10_SW1_CH1(unittest.TestCase):
         with self.assertRaises(Exception):
             self.audio_source.read(1)
 
+    def test_sr10_sw1_ch1_view(self):
+        self.audio_source.read(4)
+        view = self.audio_source.view(2, 7)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view, b"CDEFG")
+        self.assertEqual(self.audio_source.view(30), b"45")
+        self.assertEqual(self.audio_source.position, 4)
+
 
 @genty
 class TestBufferAudioSource_SR16_SW2_CH1(unittest.TestCase):
@@ -5,6 +5,7 @@ September 2015
 """
 
 import unittest
+from unittest.mock import patch
 from auditok import StreamTokenizer, StringDataSource, DataValidator
 
 
@@ -1025,5 +1026,370 @@ class TestStreamTokenizerCallback(unittest.TestCase):
         )
 
 
+class TestStreamTokenizerSpansOnly(unittest.TestCase):
+    def setUp(self):
+        self.A_validator = AValidator()
+
+    def test_spans_only_same_as_tokens(self):
+        data = "aAaaaAaAaaAaAaaaaaaaAAAAAAAAaaaaAAAaaAaaaaaaAAAAAAAAAAAAa"
+        for mode in (
+            StreamTokenizer.NORMAL,
+            StreamTokenizer.STRICT_MIN_LENGTH,
+            StreamTokenizer.DROP_TRAILING_SILENCE,
+            StreamTokenizer.STRICT_MIN_LENGTH
+            | StreamTokenizer.DROP_TRAILING_SILENCE,
+        ):
+            for min_length, max_length, max_silence, init_min in (
+                (5, 20, 4, 0),
+                (1, 1, 0, 0),
+                (3, 4, 0, 0),
+                (4, 5, 2, 0),
+                (5, 10, 3, 3),
+            ):
+                tokenizer = StreamTokenizer(
+                    self.A_validator,
+                    min_length=min_length,
+                    max_length=max_length,
+                    max_continuous_silence=max_silence,
+                    init_min=init_min,
+                    init_max_silence=2,
+                    mode=mode,
+                )
+                tokens = tokenizer.tokenize(StringDataSource(data))
+                spans = tokenizer.tokenize(
+                    StringDataSource(data), spans_only=True
+                )
+                expected = [(start, end) for _, start, end in tokens]
+                self.assertEqual(spans, expected)
+                self.assertTrue(len(spans) > 0)
+
+    def test_spans_only_callback(self):
+        spans = []
+
+        def callback(start, end):
+            spans.append((start, end))
+
+        tokenizer = StreamTokenizer(
+            self.A_validator,
+            min_length=5,
+            max_length=8,
+            max_continuous_silence=3,
+            init_min=3,
+            init_max_silence=3,
+            mode=0,
+        )
+        data_source = StringDataSource("aaAAAAAAAAAAAAa")
+        tokenizer.tokenize(data_source, callback=callback, spans_only=True)
+        self.assertEqual(spans, [(2, 9), (10, 14)])
+
+
+class _MaskStreamTokenizer(StreamTokenizer):
+    """
+    A StreamTokenizer that reads and validates all frames first, then
+    tokenizes the resulting validity mask with `tokenize_mask`. Used to run
+    all the above test cases against the run-length tokenization engine.
+    """
+
+    def tokenize(self, data_source, callback=None, generator=False):
+        frames = []
+        while True:
+            frame = data_source.read()
+            if frame is None:
+                break
+            frames.append(frame)
+        mask = [self._is_valid(frame) for frame in frames]
+        tokens = [
+            (frames[start : end + 1], start, end)
+            for start, end in self.tokenize_mask(mask)
+        ]
+        if callback:
+            for token in tokens:
+                callback(*token)
+            return
+        if generator:
+            return iter(tokens)
+        return tokens
+
+
+class _MaskTokenizationMixin:
+    def setUp(self):
+        super().setUp()
+        patcher = patch(__name__ + ".StreamTokenizer", _MaskStreamTokenizer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestMaskTokenizationInitParams(
+    _MaskTokenizationMixin, TestStreamTokenizerInitParams
+):
+    pass
+
+
+class TestMaskTokenizationMinMaxLength(
+    _MaskTokenizationMixin, TestStreamTokenizerMinMaxLength
+):
+    pass
+
+
+class TestMaskTokenizationMaxContinuousSilence(
+    _MaskTokenizationMixin, TestStreamTokenizerMaxContinuousSilence
+):
+    pass
+
+
+class TestMaskTokenizationModes(
+    _MaskTokenizationMixin, TestStreamTokenizerModes
+):
+    pass
+
+
+class TestMaskTokenizationCallback(
+    _MaskTokenizationMixin, TestStreamTokenizerCallback
+):
+    pass
+
+
+class _BatchAValidator(AValidator):
+    """
+    An AValidator that checks the validity of frames in batches, records the
+    size of each batch.
+    """
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def is_valid_batch(self, frames):
+        self.batch_sizes.append(len(frames))
+        return [frame == "A" for frame in frames]
+
+
+class _BatchStreamTokenizer(StreamTokenizer):
+    """
+    A StreamTokenizer that checks the validity of frames in batches by
+    default.
+    """
+
+    def __init__(self, *args, batch_size=256, **kwargs):
+        super().__init__(*args, batch_size=batch_size, **kwargs)
+
+
+class _BatchTokenizationMixin:
+    def setUp(self):
+        for name, new in (
+            ("AValidator", _BatchAValidator),
+            ("StreamTokenizer", _BatchStreamTokenizer),
+        ):
+            patcher = patch(__name__ + "." + name, new)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+class TestBatchTokenizationInitParams(
+    _BatchTokenizationMixin, TestStreamTokenizerInitParams
+):
+    pass
+
+
+class TestBatchTokenizationMinMaxLength(
+    _BatchTokenizationMixin, TestStreamTokenizerMinMaxLength
+):
+    pass
+
+
+class TestBatchTokenizationMaxContinuousSilence(
+    _BatchTokenizationMixin, TestStreamTokenizerMaxContinuousSilence
+):
+    pass
+
+
+class TestBatchTokenizationModes(
+    _BatchTokenizationMixin, TestStreamTokenizerModes
+):
+    pass
+
+
+class TestBatchTokenizationCallback(
+    _BatchTokenizationMixin, TestStreamTokenizerCallback
+):
+    pass
+
+
+class TestBatchTokenization(unittest.TestCase):
+    def test_batch_same_as_frame_by_frame(self):
+        data = "aAaaaAaAaaAaAaaaaaaaAAAAAAAAaaaaAAAaaAaaaaaaAAAAAAAAAAAAa"
+        for batch_size in (1, 3, 7, 57, 100):
+            for min_length, max_length, max_silence, init_min in (
+                (5, 20, 4, 0),
+                (1, 1, 0, 0),
+                (4, 5, 2, 0),
+                (5, 10, 3, 3),
+            ):
+                params = {
+                    "min_length": min_length,
+                    "max_length": max_length,
+                    "max_continuous_silence": max_silence,
+                    "init_min": init_min,
+                    "init_max_silence": 2,
+                }
+                tokenizer = StreamTokenizer(AValidator(), **params)
+                expected = tokenizer.tokenize(StringDataSource(data))
+                validator = _BatchAValidator()
+                tokenizer = StreamTokenizer(
+                    validator, batch_size=batch_size, **params
+                )
+                tokens = tokenizer.tokenize(StringDataSource(data))
+                self.assertEqual(tokens, expected)
+                nb_batches = -(-len(data) // batch_size)
+                self.assertEqual(len(validator.batch_sizes), nb_batches)
+                self.assertEqual(sum(validator.batch_sizes), len(data))
+
+    def test_no_batch_by_default(self):
+        # with default `batch_size`, a token is delivered as soon as its end
+        # is detected, even if validator supports batches
+        data = "aaAAAAaaa" + "A" * 500
+        validator = _BatchAValidator()
+        tokenizer = StreamTokenizer(validator, 3, 20, 1)
+        data_source = StringDataSource(data)
+        tokens = tokenizer.tokenize(data_source, generator=True)
+        self.assertEqual(next(tokens)[1:], (2, 6))
+        self.assertEqual(data_source._current, 8)
+        self.assertEqual(validator.batch_sizes, [])
+
+    def test_is_valid_batch_not_overridden(self):
+        validator = AValidator()
+        tokenizer = StreamTokenizer(validator, 1, 5, 2)
+        self.assertIsNone(tokenizer._is_valid_batch)
+        self.assertEqual(
+            validator.is_valid_batch(["a", "A", "A"]), [False, True, True]
+        )
+
+
+class TestStreamTokenizerHysteresis(unittest.TestCase):
+    # "A" frames are valid to start and to continue a token, "a" frames are
+    # only valid to continue a token
+    def setUp(self):
+        self.A_validator = AValidator()
+        self.offset_validator = lambda frame: frame in "Aa"
+
+    def test_offset_validator(self):
+        data = "aaAaaa-aa-Aa-"
+        tokenizer = StreamTokenizer(self.A_validator, 2, 20, 0)
+        self.assertEqual(tokenizer.tokenize(StringDataSource(data)), [])
+        tokenizer = StreamTokenizer(
+            self.A_validator,
+            2,
+            20,
+            0,
+            offset_validator=self.offset_validator,
+        )
+        tokens = tokenizer.tokenize(StringDataSource(data))
+        self.assertEqual(
+            tokens, [(["A", "a", "a", "a"], 2, 5), (["A", "a"], 10, 11)]
+        )
+
+    def test_offset_validator_same_as_mask_and_batch(self):
+        data = "aAaaaAaAaa-Aa-Aaaaa-aa-AAAAAAaAaa--aAAAaaAaaa-aa-aAAAAAaAAa"
+        mask = [frame == "A" for frame in data]
+        offset_mask = [frame in "Aa" for frame in data]
+        for mode in (
+            StreamTokenizer.NORMAL,
+            StreamTokenizer.STRICT_MIN_LENGTH,
+            StreamTokenizer.DROP_TRAILING_SILENCE,
+        ):
+            for min_length, max_length, max_silence, init_min in (
+                (5, 20, 4, 0),
+                (1, 1, 0, 0),
+                (3, 4, 0, 0),
+                (4, 5, 2, 0),
+                (5, 10, 3, 3),
+                (2, 5, 1, 2),
+            ):
+                params = {
+                    "min_length": min_length,
+                    "max_length": max_length,
+                    "max_continuous_silence": max_silence,
+                    "init_min": init_min,
+                    "init_max_silence": 2,
+                    "mode": mode,
+                }
+                tokenizer = StreamTokenizer(
+                    self.A_validator,
+                    offset_validator=self.offset_validator,
+                    **params
+                )
+                tokens = tokenizer.tokenize(StringDataSource(data))
+                self.assertTrue(len(tokens) > 0)
+                expected = [(start, end) for _, start, end in tokens]
+                spans = tokenizer.tokenize_mask(mask, offset_mask=offset_mask)
+                self.assertEqual(spans, expected)
+                for batch_size in (1, 7, 256):
+                    tokenizer = StreamTokenizer(
+                        _BatchAValidator(),
+                        offset_validator=self.offset_validator,
+                        batch_size=batch_size,
+                        **params
+                    )
+                    batch_tokens = tokenizer.tokenize(StringDataSource(data))
+                    self.assertEqual(batch_tokens, tokens)
+
+    def test_same_offset_validator(self):
+        data = "aAaaaAaAaaAaAaaaaaaaAAAAAAAAaaaaAAAaaAaaaaaaAAAAAAAAAAAAa"
+        tokenizer = StreamTokenizer(self.A_validator, 3, 8, 2, init_min=2)
+        expected = tokenizer.tokenize(StringDataSource(data))
+        tokenizer = StreamTokenizer(
+            self.A_validator,
+            3,
+            8,
+            2,
+            init_min=2,
+            offset_validator=self.A_validator,
+        )
+        tokens = tokenizer.tokenize(StringDataSource(data))
+        self.assertEqual(tokens, expected)
+
+    def test_wrong_offset_validator(self):
+        with self.assertRaises(TypeError):
+            StreamTokenizer(self.A_validator, 3, 8, 2, offset_validator="A")
+
+
+class TestMaskTokenization(unittest.TestCase):
+    def test_tokenize_mask_same_as_tokenize(self):
+        data = "aAaaaAaAaaAaAaaaaaaaAAAAAAAAaaaaAAAaaAaaaaaaAAAAAAAAAAAAa"
+        mask = [frame == "A" for frame in data]
+        for mode in (
+            StreamTokenizer.NORMAL,
+            StreamTokenizer.STRICT_MIN_LENGTH,
+            StreamTokenizer.DROP_TRAILING_SILENCE,
+            StreamTokenizer.STRICT_MIN_LENGTH
+            | StreamTokenizer.DROP_TRAILING_SILENCE,
+        ):
+            for min_length, max_length, max_silence, init_min in (
+                (5, 20, 4, 0),
+                (1, 1, 0, 0),
+                (3, 4, 0, 0),
+                (4, 5, 2, 0),
+                (5, 10, 3, 3),
+                (2, 5, 4, 4),
+            ):
+                tokenizer = StreamTokenizer(
+                    AValidator(),
+                    min_length=min_length,
+                    max_length=max_length,
+                    max_continuous_silence=max_silence,
+                    init_min=init_min,
+                    init_max_silence=2,
+                    mode=mode,
+                )
+                tokens = tokenizer.tokenize(StringDataSource(data))
+                expected = [(start, end) for _, start, end in tokens]
+                spans = tokenizer.tokenize_mask(mask)
+                self.assertEqual(spans, expected)
+
+    def test_tokenize_mask_empty(self):
+        tokenizer = StreamTokenizer(AValidator(), 1, 5, 2)
+        self.assertEqual(tokenizer.tokenize_mask([]), [])
+
+
 if __name__ == "__main__":
     unittest.main()
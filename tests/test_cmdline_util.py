@@ -40,12 +40,14 @@ _ArgsNamespece = namedtuple(
         "save_detections_as",
         "plot",
         "save_image",
+        "record_max_memory",
         "min_duration",
         "max_duration",
         "max_silence",
         "drop_trailing_silence",
         "strict_min_duration",
         "energy_threshold",
+        "offset_energy_threshold",
         "echo",
         "progress_bar",
         "command",
@@ -112,12 +114,14 @@ class TestCmdLineUtil(TestCase):
             save_detections_as,
             plot,
             save_image,
+            None,
             0.2,
             10,
             0.3,
             False,
             False,
             55,
+            50,
         )
         misc = (
             False,
@@ -146,6 +150,7 @@ class TestCmdLineUtil(TestCase):
             "frames_per_buffer": None,
             "input_device_index": 1,
             "record": exp_record,
+            "record_max_memory": None,
         }
 
         split_kwargs = {
@@ -155,6 +160,7 @@ class TestCmdLineUtil(TestCase):
             "drop_trailing_silence": False,
             "strict_min_dur": False,
             "energy_threshold": 55,
+            "offset_energy_threshold": 50,
         }
 
         miscellaneous = {
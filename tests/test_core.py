@@ -1,21 +1,41 @@
 import os
 import math
-from random import random
+from random import random, Random
 from tempfile import TemporaryDirectory
 from array import array as array_
 import unittest
 from unittest import TestCase, mock
 from unittest.mock import patch
 from genty import genty, genty_dataset
-from auditok import split, AudioRegion, AudioParameterError
+from auditok import (
+    split,
+    sweep,
+    split_channels,
+    AudioRegion,
+    LazyAudioRegion,
+    AudioParameterError,
+)
 from auditok.core import (
+    _coarse_energy_threshold,
+    _make_coarse_to_fine_validator,
     _duration_to_nb_windows,
     _make_audio_region,
     _read_chunks_online,
     _read_offline,
 )
-from auditok.util import AudioDataSource
-from auditok.io import get_audio_source
+from auditok.util import (
+    AudioDataSource,
+    AudioEnergyValidator,
+    AdaptiveEnergyValidator,
+    BandEnergyValidator,
+    DataValidator,
+)
+from auditok.io import (
+    _WITH_NUMPY,
+    get_audio_source,
+    load_energy_track,
+    BufferAudioSource,
+)
 
 mock._magics.add("__round__")
 
@@ -940,6 +960,1005 @@ class TestSplit(TestCase):
         )
         self.assertEqual(err_msg, str(val_err.exception))
 
+    def _make_silence_interleaved_data(self, channels=1, trailing=None):
+        # 400 Hz tone (400 and 800 Hz tones on 2 channels) cut in two halves
+        # with 0.2 second of silence before, between and after them, unless
+        # `trailing` data is given to be used after the second half
+        filename = "tests/data/test_16KHZ_mono_400Hz.raw"
+        if channels == 2:
+            filename = "tests/data/test_16KHZ_3channel_400-800-1600Hz.raw"
+        with open(filename, "rb") as fp:
+            data = fp.read()
+        if channels == 2:
+            # keep 2 of 3 channels
+            samples = array_("h", data)
+            samples = array_("h", [x for i, x in enumerate(samples) if i % 3])
+            data = bytes(samples)
+        silence = b"\0" * 6400 * channels
+        if trailing is None:
+            trailing = silence
+        half = len(data) // 2 // (2 * channels) * (2 * channels)
+        return silence + data[:half] + silence + data[half:] + trailing
+
+    def _silence_interleaved_split_kwargs(self, **kwargs):
+        # split parameters that detect a few regions in silence interleaved
+        # data, `kwargs` are added to (or override) them
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 0.3,
+            "max_silence": 0.05,
+            "analysis_window": 0.03,
+            "eth": 60,
+        }
+        split_kwargs.update(kwargs)
+        return split_kwargs
+
+    def _make_silence_interleaved_file(
+        self, tmpdir, audio_format, data, channels=1
+    ):
+        # save `data` to an audio file of `audio_format` in `tmpdir`
+        filename = os.path.join(tmpdir, "audio." + audio_format)
+        AudioRegion(data, 16000, 2, channels).save(filename)
+        return filename
+
+    @genty_dataset(
+        mono_aw_10ms=(1, None, 0.01, None),
+        mono_aw_13ms_max_read=(1, None, 0.013, 1.25),
+        stereo_uc_any=(2, None, 0.02, None),
+        stereo_uc_mix=(2, "mix", 0.02, None),
+        stereo_uc_1=(2, 1, 0.02, 0.5),
+    )
+    def test_split_in_memory_same_as_window_by_window(
+        self, channels, use_channel, analysis_window, max_read
+    ):
+        # when all data is in memory, window validity is computed at once
+        # for all windows. Regions must be the same as those we get when
+        # reading and validating one window at a time (i.e., from a reader)
+        data = self._make_silence_interleaved_data(channels)
+        params = {"sr": 16000, "sw": 2, "ch": channels}
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 0.2,
+            "max_silence": 0.05,
+            "use_channel": use_channel,
+            "eth": 60,
+        }
+        regions = split(
+            data,
+            analysis_window=analysis_window,
+            max_read=max_read,
+            **split_kwargs,
+            **params
+        )
+        reader = AudioDataSource(
+            data, block_dur=analysis_window, max_read=max_read, **params
+        )
+        expected = split(reader, **split_kwargs)
+        regions = [(r.meta.start, r.meta.end, r) for r in regions]
+        expected = [(r.meta.start, r.meta.end, r) for r in expected]
+        self.assertTrue(len(regions) > 1)
+        self.assertEqual(regions, expected)
+
+    def test_split_audio_source_with_non_zero_position(self):
+        # regions are read back from a seekable audio source, they should
+        # be read relative to the source's position when split started
+        with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
+            data = fp.read()
+        source = BufferAudioSource(data, 10, 2, 1)
+        source.open()
+        source.position = 10
+        regions = split(
+            source,
+            min_dur=0.2,
+            max_dur=5,
+            max_silence=0.2,
+            analysis_window=0.1,
+            max_read=6,
+            eth=50,
+        )
+        expected = list(
+            split(
+                data[20:140],
+                min_dur=0.2,
+                max_dur=5,
+                max_silence=0.2,
+                analysis_window=0.1,
+                sr=10,
+                sw=2,
+                ch=1,
+                eth=50,
+            )
+        )
+        regions = list(regions)
+        self.assertEqual(len(regions), 3)
+        self.assertEqual(regions, expected)
+        for region, exp in zip(regions, expected):
+            self.assertEqual(region.meta.start, exp.meta.start)
+            self.assertEqual(region.meta.end, exp.meta.end)
+
+    @genty_dataset(
+        raw=("raw", None),
+        wav=("wav", None),
+        raw_max_read=("raw", 1.37),
+        wav_max_read=("wav", 1.37),
+    )
+    def test_split_workers(self, audio_format, max_read):
+        # windows are validated in parallel, one shard at a time, but tokens
+        # are detected over all shards and must be the same as with one
+        # single process, including tokens that span several shards
+        data = self._make_silence_interleaved_data()
+        params = {"sr": 16000, "sw": 2, "ch": 1}
+        split_kwargs = self._silence_interleaved_split_kwargs(
+            max_read=max_read
+        )
+        expected = list(split(data, **split_kwargs, **params))
+        with TemporaryDirectory() as tmpdir:
+            filename = self._make_silence_interleaved_file(
+                tmpdir, audio_format, data
+            )
+            with patch("auditok.core._SHARD_DURATION", 0.1):
+                if audio_format == "raw":
+                    regions = split(
+                        filename, workers=2, **split_kwargs, **params
+                    )
+                else:
+                    regions = split(filename, workers=2, **split_kwargs)
+                regions = list(regions)
+        self.assertTrue(len(expected) > 1)
+        self.assertEqual(regions, expected)
+        for region, exp in zip(regions, expected):
+            self.assertEqual(region.meta.start, exp.meta.start)
+            self.assertEqual(region.meta.end, exp.meta.end)
+
+    @genty_dataset(
+        grid_dict=(
+            {
+                "energy_threshold": [40, 50, 60],
+                "min_dur": [0.1, 0.3],
+                "max_silence": [0.05, 0.2],
+            },
+            12,
+        ),
+        grid_list=(
+            [
+                {"eth": 50},
+                {"max_dur": 0.5, "strict_min_dur": True},
+                {"drop_trailing_silence": True, "max_silence": 0.1},
+            ],
+            3,
+        ),
+    )
+    def test_sweep(self, grid, nb_configs):
+        with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
+            data = fp.read()
+        params = {"sr": 10, "sw": 2, "ch": 1}
+        results = sweep(data, grid, analysis_window=0.1, **params)
+        self.assertEqual(len(results), nb_configs)
+        for config, regions in results:
+            expected = list(
+                split(data, analysis_window=0.1, **config, **params)
+            )
+            self.assertEqual(regions, expected)
+            for region, exp in zip(regions, expected):
+                self.assertEqual(region.meta.start, exp.meta.start)
+                self.assertEqual(region.meta.end, exp.meta.end)
+
+    def test_sweep_workers(self):
+        grid = {"energy_threshold": [40, 50], "max_dur": [0.5, 1, 5]}
+        results = sweep("tests/data/test_16KHZ_mono_400Hz.wav", grid)
+        results_workers = sweep(
+            "tests/data/test_16KHZ_mono_400Hz.wav", grid, workers=2
+        )
+        self.assertEqual(results_workers, results)
+
+    @genty_dataset(
+        raw=("raw", None),
+        wav=("wav", None),
+        raw_max_read=("raw", 1.37),
+        wav_max_read=("wav", 1.37),
+    )
+    @unittest.skipIf(not _WITH_NUMPY, "numpy is not installed")
+    def test_split_energy_sidecar(self, audio_format, max_read):
+        data = self._make_silence_interleaved_data()
+        params = {"sr": 16000, "sw": 2, "ch": 1}
+        split_kwargs = self._silence_interleaved_split_kwargs(
+            max_read=max_read
+        )
+        expected = list(split(data, **split_kwargs, **params))
+        with TemporaryDirectory() as tmpdir:
+            filename = self._make_silence_interleaved_file(
+                tmpdir, audio_format, data
+            )
+            regions = list(
+                split(filename, energy_sidecar=True, **split_kwargs, **params)
+            )
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            # energies are now loaded from sidecar, only the energy of a
+            # partial last window (due to max_read) may be computed
+            with patch(
+                "auditok.util.AudioEnergyValidator.energy_track",
+                autospec=True,
+                side_effect=AudioEnergyValidator.energy_track,
+            ) as energy_track:
+                regions_sidecar = list(
+                    split(
+                        filename,
+                        energy_sidecar=True,
+                        **split_kwargs,
+                        **params
+                    )
+                )
+                for (_, window_data, _), _ in energy_track.call_args_list:
+                    self.assertLess(len(window_data), 480 * 2)
+        self.assertTrue(len(expected) > 1)
+        self.assertEqual(regions, expected)
+        self.assertEqual(regions_sidecar, expected)
+        for region, exp in zip(regions_sidecar, expected):
+            self.assertEqual(region.meta.start, exp.meta.start)
+            self.assertEqual(region.meta.end, exp.meta.end)
+
+    @genty_dataset(
+        raw=("raw", {}),
+        wav=("wav", {}),
+        raw_large_file=("raw", {"large_file": True, "use_mmap": False}),
+        wav_mmap=("wav", {"large_file": True}),
+    )
+    @unittest.skipIf(not _WITH_NUMPY, "numpy is not installed")
+    def test_split_energy_sidecar_shards(self, audio_format, kwargs):
+        # length of data is not a multiple of the analysis window size
+        data = self._make_silence_interleaved_data(trailing=b"\0" * 6410)
+        params = {"sr": 16000, "sw": 2, "ch": 1}
+        split_kwargs = self._silence_interleaved_split_kwargs()
+        expected = list(split(data, **split_kwargs, **params))
+        validator = AudioEnergyValidator(60, 2, 1)
+        expected_energies = validator.energy_track(data, 480)
+        with TemporaryDirectory() as tmpdir:
+            filename = self._make_silence_interleaved_file(
+                tmpdir, audio_format, data
+            )
+            # the energy track is computed one shard of 10 windows at a time
+            with patch("auditok.core._SHARD_DURATION", 0.3), patch(
+                "auditok.util.AudioEnergyValidator.energy_track",
+                autospec=True,
+                side_effect=AudioEnergyValidator.energy_track,
+            ) as energy_track:
+                regions = list(
+                    split(
+                        filename,
+                        energy_sidecar=True,
+                        **split_kwargs,
+                        **kwargs,
+                        **params
+                    )
+                )
+            self.assertEqual(
+                energy_track.call_count, -(-len(data) // (4800 * 2))
+            )
+            for (_, shard_data, _), _ in energy_track.call_args_list:
+                self.assertLessEqual(len(shard_data), 4800 * 2)
+            energies = load_energy_track(filename, 0.03, **params)
+            self.assertEqual(energies.tolist(), expected_energies.tolist())
+            del energies
+        self.assertTrue(len(expected) > 1)
+        self.assertEqual(regions, expected)
+
+    @genty_dataset(
+        raw=("raw", {}),
+        wav=("wav", {}),
+        raw_large_file=("raw", {"large_file": True}),
+        wav_large_file=("wav", {"large_file": True}),
+        wav_max_read=("wav", {"large_file": True, "max_read": 1.37}),
+        wav_workers=("wav", {"workers": 2}),
+        raw_read_ahead=(
+            "raw",
+            {"large_file": True, "use_mmap": False, "read_ahead": 0.5},
+        ),
+        wav_read_ahead_max_read=(
+            "wav",
+            {
+                "large_file": True,
+                "use_mmap": False,
+                "read_ahead": 0.5,
+                "max_read": 1.37,
+            },
+        ),
+    )
+    def test_split_lazy(self, audio_format, kwargs):
+        data = self._make_silence_interleaved_data()
+        params = {"sr": 16000, "sw": 2, "ch": 1}
+        split_kwargs = self._silence_interleaved_split_kwargs(
+            max_read=kwargs.pop("max_read", None)
+        )
+        expected = list(split(data, **split_kwargs, **params))
+        with TemporaryDirectory() as tmpdir:
+            filename = self._make_silence_interleaved_file(
+                tmpdir, audio_format, data
+            )
+            regions = list(
+                split(filename, lazy=True, **split_kwargs, **kwargs, **params)
+            )
+            for region, exp in zip(regions, expected):
+                self.assertIsInstance(region, LazyAudioRegion)
+                self.assertIsNone(region._loaded_data)
+                self.assertEqual(len(region), len(exp))
+                self.assertEqual(region.duration, exp.duration)
+                self.assertEqual(region.meta.start, exp.meta.start)
+                self.assertEqual(region.meta.end, exp.meta.end)
+            self.assertTrue(len(expected) > 1)
+            self.assertEqual(regions, expected)
+
+    @genty_dataset(
+        mono=(1, {}),
+        mono_small_hop=(1, {"hop_dur": 0.01}),
+        mono_hysteresis=(1, {"oeth": 50}),
+        mono_max_read=(1, {"max_read": 1.37}),
+        stereo_mix=(2, {"use_channel": "mix"}),
+    )
+    def test_split_hop_dur_buffer(self, channels, kwargs):
+        data = self._make_silence_interleaved_data(channels)
+        params = {"sr": 16000, "sw": 2, "ch": channels}
+        split_kwargs = self._silence_interleaved_split_kwargs(hop_dur=0.02)
+        split_kwargs.update(kwargs)
+        with TemporaryDirectory() as tmpdir:
+            filename = self._make_silence_interleaved_file(
+                tmpdir, "raw", data, channels
+            )
+            # windows are read one by one from file
+            expected = list(
+                split(
+                    filename,
+                    large_file=True,
+                    use_mmap=False,
+                    **split_kwargs,
+                    **params
+                )
+            )
+        with patch(
+            "auditok.util.AudioEnergyValidator.energy_track",
+            autospec=True,
+            side_effect=AudioEnergyValidator.energy_track,
+        ) as energy_track:
+            regions = list(split(data, **split_kwargs, **params))
+        if _WITH_NUMPY:
+            # all windows are validated at once
+            self.assertEqual(energy_track.call_count, 1)
+            self.assertEqual(
+                energy_track.call_args[1]["hop_size"],
+                round(split_kwargs["hop_dur"] * 16000),
+            )
+        self.assertTrue(len(expected) > 1)
+        self.assertEqual(regions, expected)
+        for region, exp in zip(regions, expected):
+            self.assertEqual(region.meta.start, exp.meta.start)
+            self.assertEqual(region.meta.end, exp.meta.end)
+
+    @genty_dataset(
+        raw=("raw", {}),
+        raw_mmap=("raw", {"use_mmap": True}),
+        wav=("wav", {}),
+        wav_refinement_window=("wav", {"refinement_window": 0.01}),
+        raw_max_read=("raw", {"max_read": 5}),
+    )
+    def test_split_lazy_partial_last_window(self, audio_format, kwargs):
+        # 179 samples, i.e., not a multiple of the analysis window size, and
+        # an event that lasts until the end of data
+        samples = array_("h", [0] * 179 * 3)
+        for i in range(120 * 3, 179 * 3):
+            samples[i] = 5000 if i % 2 else -5000
+        data = samples.tobytes()
+        params = {"sr": 100, "sw": 2, "ch": 3, "large_file": True}
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 5,
+            "max_silence": 0.1,
+            "analysis_window": 0.03,
+            "use_mmap": kwargs.pop("use_mmap", False),
+        }
+        split_kwargs.update(kwargs)
+        with TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "audio." + audio_format)
+            AudioRegion(data, 100, 2, 3).save(filename)
+            expected = list(split(filename, **split_kwargs, **params))
+            regions = list(
+                split(filename, lazy=True, **split_kwargs, **params)
+            )
+            self.assertEqual(len(regions), 1)
+            self.assertEqual(regions, expected)
+            for region, exp in zip(regions, expected):
+                self.assertIsInstance(region, LazyAudioRegion)
+                self.assertEqual(len(region), len(exp))
+                self.assertEqual(len(region), len(bytes(region)) // 6)
+                self.assertEqual(region.duration, exp.duration)
+                self.assertEqual(region.meta.start, exp.meta.start)
+                self.assertEqual(region.meta.end, exp.meta.end)
+            self.assertEqual(expected[-1].meta.end, 1.79)
+
+    def test_split_lazy_non_seekable_source(self):
+        with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
+            data = fp.read()
+        params = {"sr": 10, "sw": 2, "ch": 1}
+        split_kwargs = {"analysis_window": 0.2, "hop_dur": 0.1}
+        expected = list(split(data, **split_kwargs, **params))
+        regions = list(split(data, lazy=True, **split_kwargs, **params))
+        for region in regions:
+            self.assertNotIsInstance(region, LazyAudioRegion)
+        self.assertEqual(regions, expected)
+
+    @genty_dataset(
+        mono=(1, 0.03, {}),
+        mono_short_last_window=(1, 0.07, {}),
+        stereo=(2, 0.03, {}),
+        stereo_max_read=(2, 0.03, {"max_read": 0.77}),
+    )
+    def test_split_batch_validator(self, channels, analysis_window, kwargs):
+        class EnergyValidator(DataValidator):
+            def __init__(self):
+                self.validator = AudioEnergyValidator(55, 2, channels)
+
+            def is_valid(self, frame):
+                return self.validator.is_valid(frame)
+
+        class BatchEnergyValidator(EnergyValidator):
+            def __init__(self):
+                super().__init__()
+                self.batches = []
+
+            def is_valid_batch(self, frames):
+                self.batches.append(frames)
+                if _WITH_NUMPY:
+                    frames = [frame.tobytes() for frame in frames]
+                return [self.is_valid(frame) for frame in frames]
+
+        data = self._make_multichannel_data(channels)
+        params = {"sr": 16000, "sw": 2, "ch": channels}
+        split_kwargs = {
+            "min_dur": 0.05,
+            "max_dur": 0.3,
+            "max_silence": 0.03,
+            "analysis_window": analysis_window,
+            **kwargs,
+        }
+        expected = list(
+            split(data, validator=EnergyValidator(), **split_kwargs, **params)
+        )
+        validator = BatchEnergyValidator()
+        regions = list(
+            split(data, validator=validator, **split_kwargs, **params)
+        )
+        self.assertTrue(len(expected) > 1)
+        self.assertEqual(regions, expected)
+        self.assertTrue(len(validator.batches) > 0)
+        if _WITH_NUMPY:
+            batch = validator.batches[0]
+            expected_shape = (int(analysis_window * 16000),)
+            if channels > 1:
+                expected_shape += (channels,)
+            self.assertEqual(batch.shape[1:], expected_shape)
+        else:
+            self.assertIsInstance(validator.batches[0], list)
+
+    @unittest.skipIf(not _WITH_NUMPY, "numpy is not installed")
+    def test_split_band_energy_validator(self):
+        # low frequency noise all along, 400 Hz tone bursts from 0.2 to 0.5
+        # and from 0.8 to 1 second
+        samples = array_("h")
+        for i in range(16000):
+            sample = 3000 * math.sin(2 * math.pi * 50 * i / 16000)
+            if 3200 <= i < 8000 or 12800 <= i:
+                sample += 3000 * math.sin(2 * math.pi * 400 * i / 16000)
+            samples.append(int(sample))
+        params = {"sr": 16000, "sw": 2, "ch": 1}
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 1,
+            "max_silence": 0.05,
+            "drop_trailing_silence": True,
+        }
+        regions = list(split(samples.tobytes(), **split_kwargs, **params))
+        self.assertEqual(len(regions), 1)
+        validator = BandEnergyValidator(55, (300, 3400), 16000, 2, 1)
+        regions = split(
+            samples.tobytes(), validator=validator, **split_kwargs, **params
+        )
+        spans = [(region.meta.start, region.meta.end) for region in regions]
+        self.assertEqual(spans, [(0.2, 0.5), (0.8, 1)])
+
+    def test_split_energy_threshold_auto(self):
+        # white noise at about 63 dB all along, 400 Hz tone bursts at about
+        # 77 dB from 1 to 1.5 and from 3 to 3.3 seconds
+        rng = Random(1)
+        samples = array_("h")
+        for i in range(32000):
+            sample = rng.gauss(0, 1500)
+            if 8000 <= i < 12000 or 24000 <= i < 26400:
+                sample += 10000 * math.sin(2 * math.pi * 400 * i / 8000)
+            samples.append(int(sample))
+        params = {"sr": 8000, "sw": 2, "ch": 1}
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 5,
+            "max_silence": 0.1,
+            "drop_trailing_silence": True,
+        }
+        regions = list(split(samples.tobytes(), **split_kwargs, **params))
+        self.assertEqual(len(regions), 1)
+        for input in (samples.tobytes(), AudioRegion(samples, 8000, 2, 1)):
+            regions = split(input, eth="auto", **split_kwargs, **params)
+            spans = [
+                (region.meta.start, region.meta.end) for region in regions
+            ]
+            self.assertEqual(spans, [(1, 1.5), (3, 3.3)])
+
+    @genty_dataset(
+        reader=(True, 0.1, 0.05, 100),
+        reader_no_hop=(True, 0.1, None, 50),
+        bytes=(False, 0.1, 0.05, 100),
+        bytes_no_hop=(False, 0.03, None, 167),
+    )
+    def test_split_energy_threshold_auto_horizon(
+        self, use_reader, analysis_window, hop_dur, horizon
+    ):
+        # the noise floor is tracked over the last 5 seconds of windows, as
+        # read by the reader (i.e., every `hop_dur` seconds if given)
+        params = {"sr": 8000, "sw": 2, "ch": 1}
+        data = b"\0" * 16000
+        if use_reader:
+            input = AudioDataSource(
+                data, block_dur=analysis_window, hop_dur=hop_dur, **params
+            )
+            kwargs = {}
+        else:
+            input = data
+            kwargs = {"analysis_window": analysis_window, "hop_dur": hop_dur}
+            kwargs.update(params)
+        with patch(
+            "auditok.core.AdaptiveEnergyValidator",
+            wraps=AdaptiveEnergyValidator,
+        ) as validator_class:
+            list(split(input, eth="auto", **kwargs))
+        self.assertEqual(validator_class.call_args[1]["horizon"], horizon)
+
+    @genty_dataset(
+        bytes=(None, {}),
+        raw_large_file=("raw", {"large_file": True}),
+        raw_no_mmap=("raw", {"large_file": True, "use_mmap": False}),
+        wav_workers=("wav", {"workers": 2}),
+        wav_energy_sidecar=("wav", {"energy_sidecar": True}),
+    )
+    def test_split_offset_energy_threshold(self, audio_format, kwargs):
+        if kwargs.get("energy_sidecar") and not _WITH_NUMPY:
+            self.skipTest("numpy is not installed")
+        # 400 Hz tone whose energy alternates every 0.1 second between about
+        # 63 dB and 55 dB, from 0.5 to 1.5 seconds
+        samples = array_("h", [0] * 16000)
+        for i in range(4000, 12000):
+            amplitude = 2000 if (i - 4000) // 800 % 2 == 0 else 800
+            sample = amplitude * math.sin(2 * math.pi * 400 * i / 8000)
+            samples[i] = int(sample)
+        params = {"sr": 8000, "sw": 2, "ch": 1}
+        split_kwargs = {
+            "min_dur": 0.05,
+            "max_dur": 5,
+            "max_silence": 0.05,
+            "drop_trailing_silence": True,
+            "eth": 60,
+            **kwargs,
+        }
+        data = samples.tobytes()
+        with TemporaryDirectory() as tmpdir:
+            input = data
+            if audio_format is not None:
+                input = os.path.join(tmpdir, "audio." + audio_format)
+                AudioRegion(data, 8000, 2, 1).save(input)
+            regions = split(input, **split_kwargs, **params)
+            spans = [
+                (round(region.meta.start, 3), round(region.meta.end, 3))
+                for region in regions
+            ]
+            self.assertEqual(
+                spans,
+                [(0.5, 0.6), (0.7, 0.8), (0.9, 1), (1.1, 1.2), (1.3, 1.4)],
+            )
+            regions = split(input, oeth=50, **split_kwargs, **params)
+            spans = [
+                (round(region.meta.start, 3), round(region.meta.end, 3))
+                for region in regions
+            ]
+            self.assertEqual(spans, [(0.5, 1.5)])
+
+    @genty_dataset(
+        auto=(
+            {"eth": "auto", "oeth": 50},
+            "'offset_energy_threshold' can not be used with "
+            "energy_threshold='auto'",
+        ),
+        higher_than_eth=(
+            {"eth": 50, "offset_energy_threshold": 55},
+            "'offset_energy_threshold' (55) must be <= 'energy_threshold' "
+            "(50)",
+        ),
+    )
+    def test_split_wrong_offset_energy_threshold(self, kwargs, err_msg):
+        with self.assertRaises(ValueError) as val_err:
+            list(split(b"\0" * 16000, sr=8000, sw=2, ch=1, **kwargs))
+        self.assertEqual(err_msg, str(val_err.exception))
+
+    def _make_noise_bursts_data(self):
+        # short bursts of noise of random length and amplitude in a silence
+        # of very low energy, different on each of 2 channels
+        rng = Random(7)
+        samples = array_("h", [rng.randint(-10, 10) for _ in range(160000)])
+        for _ in range(30):
+            start = rng.randrange(0, len(samples) - 4000)
+            length = rng.randrange(40, 4000)
+            amplitude = rng.choice([200, 400, 1000, 5000])
+            for i in range(start, start + length):
+                samples[i] = rng.randint(-amplitude, amplitude)
+        return samples.tobytes()
+
+    @genty_dataset(
+        bytes=(None, {}),
+        bytes_hysteresis=(None, {"oeth": 45}),
+        bytes_use_channel=(None, {"use_channel": 1}),
+        bytes_mix=(None, {"use_channel": "mix"}),
+        raw_large_file=("raw", {"large_file": True}),
+        wav=("wav", {}),
+        wav_hysteresis=("wav", {"oeth": 45, "max_read": 7.3}),
+        wav_workers=("wav", {"workers": 2}),
+        not_multiple=(None, {"coarse_window": 0.33}),
+    )
+    def test_split_coarse_window(self, audio_format, kwargs):
+        data = self._make_noise_bursts_data()
+        params = {"sr": 8000, "sw": 2, "ch": 2}
+        split_kwargs = {
+            "min_dur": 0.02,
+            "max_dur": 2,
+            "max_silence": 0.05,
+            "analysis_window": 0.01,
+            "eth": 50,
+            **kwargs,
+        }
+        coarse_window = split_kwargs.pop("coarse_window", 0.4)
+        with TemporaryDirectory() as tmpdir:
+            input = data
+            if audio_format is not None:
+                input = os.path.join(tmpdir, "audio." + audio_format)
+                AudioRegion(data, 8000, 2, 2).save(input)
+            expected = [
+                (region.meta.start, region.meta.end, region)
+                for region in split(input, **split_kwargs, **params)
+            ]
+            with patch(
+                "auditok.core._make_coarse_to_fine_validator",
+                wraps=_make_coarse_to_fine_validator,
+            ) as make_validator:
+                regions = split(
+                    input,
+                    coarse_window=coarse_window,
+                    **split_kwargs,
+                    **params,
+                )
+                result = [
+                    (region.meta.start, region.meta.end, region)
+                    for region in regions
+                ]
+        self.assertGreater(len(expected), 5)
+        self.assertEqual(result, expected)
+        # with numpy, all windows are validated at once without coarse pass
+        self.assertEqual(make_validator.called, not _WITH_NUMPY)
+
+    @genty_dataset(
+        mono=(1, None, 0.4),
+        stereo=(2, None, 0.4),
+        stereo_mix=(2, "mix", 0.33),
+        stereo_use_channel=(2, 1, 0.5),
+    )
+    def test_coarse_to_fine_validator(
+        self, channels, use_channel, coarse_window
+    ):
+        # whatever the signal backend, windows have the same validity with
+        # and without a coarse pass
+        data = self._make_noise_bursts_data()
+        data = data[: len(data) // (2 * channels) * 2 * channels]
+        params = {"sr": 8000, "sw": 2, "ch": channels}
+        validator = AudioEnergyValidator(50, 2, channels, use_channel)
+        reader = AudioDataSource(data, block_dur=0.01, **params)
+        coarse_validator = _make_coarse_to_fine_validator(
+            validator, 50, reader, coarse_window
+        )
+        self.assertIsNot(coarse_validator, validator)
+        mask = coarse_validator.is_valid_buffer(data, 80)
+        expected = validator.is_valid_buffer(data, 80)
+        self.assertGreater(sum(expected), 5)
+        self.assertEqual(list(mask), list(expected))
+
+    @genty_dataset(
+        low=(10, 4),
+        default=(50, 25),
+        high=(80, 25),
+        large_factor=(60, 400),
+    )
+    def test_coarse_energy_threshold(self, energy_threshold, factor):
+        coarse_threshold = _coarse_energy_threshold(energy_threshold, factor)
+        # one valid window with the smallest possible RMS followed by silent
+        # windows must be in a coarse window above the coarse threshold
+        min_rms = math.ceil(10 ** (energy_threshold / 20))
+        window = array_("h", [min_rms] * 80)
+        data = window.tobytes() + b"\0" * 160 * (factor - 1)
+        validator = AudioEnergyValidator(energy_threshold, 2, 1)
+        self.assertTrue(validator.is_valid(window.tobytes()))
+        if coarse_threshold is None:
+            self.assertLess(min_rms, math.sqrt(factor) * 2)
+            return
+        coarse_validator = AudioEnergyValidator(coarse_threshold, 2, 1)
+        self.assertTrue(coarse_validator.is_valid(data))
+
+    def _make_refinement_data(self, channels=1):
+        # 440 Hz tone bursts whose boundaries are not on window edges, on
+        # the last channel only
+        samples = array_("h", [0] * 24000 * channels)
+        for start, stop in ((1234, 5678), (9001, 12007), (16003, 20111)):
+            for i in range(start, stop):
+                sample = 3000 * math.sin(2 * math.pi * 440 * i / 8000)
+                samples[(i + 1) * channels - 1] = int(sample)
+        return samples.tobytes()
+
+    @genty_dataset(
+        bytes=(None, {}),
+        bytes_lazy=(None, {"lazy": True}),
+        bytes_hysteresis=(None, {"oeth": 40}),
+        bytes_stereo=(None, {"ch": 2}),
+        bytes_stereo_use_channel=(None, {"ch": 2, "use_channel": 1}),
+        raw_large_file=("raw", {"large_file": True}),
+        wav_workers=("wav", {"workers": 2}),
+        wav_max_read=("wav", {"max_read": 2.6}),
+    )
+    def test_split_refinement_window(self, audio_format, kwargs):
+        channels = kwargs.pop("ch", 1)
+        params = {"sr": 8000, "sw": 2, "ch": channels}
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 5,
+            "max_silence": 0.1,
+            "analysis_window": 0.1,
+            "drop_trailing_silence": True,
+            **kwargs,
+        }
+        data = self._make_refinement_data(channels)
+        with TemporaryDirectory() as tmpdir:
+            input = data
+            if audio_format is not None:
+                input = os.path.join(tmpdir, "audio." + audio_format)
+                AudioRegion(data, 8000, 2, channels).save(input)
+            regions = split(
+                input, refinement_window=1 / 8000, **split_kwargs, **params
+            )
+            spans = [
+                (
+                    round(region.meta.start * 8000),
+                    round(region.meta.end * 8000),
+                    len(region),
+                )
+                for region in regions
+            ]
+        self.assertEqual(
+            spans,
+            [(1234, 5678, 4444), (9001, 12007, 3006), (16003, 20111, 4108)],
+        )
+
+    @genty_dataset(
+        bytes=(None, {}),
+        bytes_lazy=(None, {"lazy": True}),
+        raw_large_file=("raw", {"large_file": True, "use_mmap": False}),
+        raw_mmap_coarse_window=(
+            "raw",
+            {"large_file": True, "coarse_window": 0.3},
+        ),
+        wav_workers=("wav", {"workers": 2}),
+    )
+    def test_split_refinement_window_partial_last_window(
+        self, audio_format, kwargs
+    ):
+        # data ends within the last tone burst and within an analysis
+        # window, last region is active until the end of data
+        nb_samples = 20050
+        data = self._make_refinement_data()[: nb_samples * 2]
+        params = {"sr": 8000, "sw": 2, "ch": 1}
+        split_kwargs = {
+            "min_dur": 0.1,
+            "max_dur": 5,
+            "max_silence": 0.1,
+            "drop_trailing_silence": True,
+            "analysis_window": 0.1,
+            "refinement_window": 0.001,
+        }
+        input = data
+        with TemporaryDirectory() as tmpdir:
+            if audio_format is not None:
+                input = os.path.join(tmpdir, "audio." + audio_format)
+                AudioRegion(data, 8000, 2, 1).save(input)
+            regions = list(split(input, **split_kwargs, **kwargs, **params))
+            spans = [
+                (
+                    round(region.meta.start * 8000),
+                    round(region.meta.end * 8000),
+                )
+                for region in regions
+            ]
+            self.assertEqual(
+                spans, [(1227, 5685), (8994, 12014), (15996, nb_samples)]
+            )
+            for region, (start, stop) in zip(regions, spans):
+                self.assertEqual(len(region), stop - start)
+                self.assertEqual(bytes(region), data[start * 2 : stop * 2])
+
+    def test_split_refinement_window_kept_boundaries(self):
+        data = self._make_refinement_data()
+        params = {"sr": 8000, "sw": 2, "ch": 1, "analysis_window": 0.1}
+        # trailing silence is kept, only starts are refined
+        regions = split(data, 0.1, 5, 0.1, refinement_window=0.001, **params)
+        spans = [
+            (round(region.meta.start * 8000), round(region.meta.end * 8000))
+            for region in regions
+        ]
+        self.assertEqual(spans, [(1227, 7200), (8994, 12800), (15996, 21600)])
+        # the boundary between a region truncated to `max_dur` and its
+        # continuation is not refined
+        regions = split(
+            data,
+            0.1,
+            0.2,
+            0.1,
+            drop_trailing_silence=True,
+            refinement_window=0.001,
+            **params,
+        )
+        spans = [
+            (round(region.meta.start * 8000), round(region.meta.end * 8000))
+            for region in regions
+        ]
+        self.assertEqual(
+            spans,
+            [
+                (1227, 2400),
+                (2400, 4000),
+                (4000, 5600),
+                (5600, 7200),
+                (8994, 10400),
+                (10400, 12014),
+                (15996, 17600),
+                (17600, 19200),
+                (19200, 20118),
+            ],
+        )
+
+    @genty_dataset(
+        null=(0,),
+        negative=(-0.01,),
+        too_large=(0.2,),
+    )
+    def test_split_wrong_refinement_window(self, refinement_window):
+        with self.assertRaises(ValueError) as val_err:
+            split(
+                b"\0" * 16000,
+                sr=8000,
+                sw=2,
+                ch=1,
+                aw=0.1,
+                refinement_window=refinement_window,
+            )
+        err_msg = "'refinement_window' ({}) must be > 0 and <= "
+        err_msg += "'analysis_window' (0.1)"
+        self.assertEqual(
+            err_msg.format(refinement_window), str(val_err.exception)
+        )
+
+    def test_energy_threshold_auto_not_supported(self):
+        data = b"\0" * 32000
+        params = {"sr": 16000, "sw": 2, "ch": 2}
+        with self.assertRaises(ValueError) as val_err:
+            list(split_channels(data, eth="auto", **params))
+        self.assertEqual(
+            "'energy_threshold' can not be 'auto' with 'split_channels'",
+            str(val_err.exception),
+        )
+        with self.assertRaises(ValueError) as val_err:
+            sweep(data, {"max_silence": [0.1, 0.2]}, eth="auto", **params)
+        self.assertEqual(
+            "'energy_threshold' can not be 'auto' with 'sweep'",
+            str(val_err.exception),
+        )
+
+    def _make_multichannel_data(self, channels):
+        # each channel has a different pattern of activity and silence
+        with open("tests/data/test_16KHZ_mono_400Hz.raw", "rb") as fp:
+            tone = array_("h", fp.read())
+        samples = []
+        for channel in range(channels):
+            channel_samples = array_("h", tone)
+            for i in range(channels - channel):
+                onset = 1600 * (2 * i + channel % 2) + 800 * channel
+                channel_samples[onset : onset + 1200] = array_("h", [0] * 1200)
+            samples.append(channel_samples)
+        data = array_("h", [0] * len(tone) * channels)
+        for channel, channel_samples in enumerate(samples):
+            data[channel::channels] = channel_samples
+        return data.tobytes()
+
+    @genty_dataset(
+        stereo=(2, {}, False),
+        three_channels=(3, {}, False),
+        four_channels=(4, {"max_read": 1.37}, False),
+        three_channels_shards=(3, {}, True),
+        three_channels_validator=(
+            3,
+            {"validator": AudioEnergyValidator(60, 2, 1)},
+            False,
+        ),
+    )
+    def test_split_channels(self, channels, kwargs, small_shards):
+        data = self._make_multichannel_data(channels)
+        split_kwargs = {
+            "min_dur": 0.05,
+            "max_dur": 0.3,
+            "max_silence": 0.02,
+            "analysis_window": 0.01,
+            "eth": 60,
+            "sr": 16000,
+            "sw": 2,
+            "ch": channels,
+        }
+        split_kwargs.update(kwargs)
+        with patch(
+            "auditok.core._SHARD_DURATION", 0.05 if small_shards else 60
+        ):
+            regions = list(split_channels(data, **split_kwargs))
+        split_kwargs.pop("validator", None)
+        expected = []
+        for channel in range(channels):
+            for region in split(data, uc=channel, **split_kwargs):
+                expected.append((region, channel))
+        expected.sort(key=lambda item: (item[0].meta.start, item[1]))
+        self.assertEqual(len(regions), len(expected))
+        for region, (exp, channel) in zip(regions, expected):
+            self.assertEqual(region.meta.channel, channel)
+            self.assertEqual(region.meta.start, exp.meta.start)
+            self.assertEqual(region.meta.end, exp.meta.end)
+            self.assertEqual(region.ch, 1)
+            exp_data = array_("h", bytes(exp))[channel::channels].tobytes()
+            self.assertEqual(bytes(region), exp_data)
+        # channels have different activities
+        starts = [
+            [r.meta.start for r in regions if r.meta.channel == channel]
+            for channel in range(channels)
+        ]
+        self.assertEqual(len(set(map(tuple, starts))), channels)
+
+    @genty_dataset(
+        use_channel=({"use_channel": 0}, "'use_channel'"),
+        uc=({"uc": "mix"}, "'uc'"),
+        hop_dur=({"hop_dur": 0.01}, "'hop_dur'"),
+    )
+    def test_split_channels_invalid_argument(self, kwargs, name):
+        with self.assertRaises(ValueError) as val_err:
+            split_channels(b"\0" * 80, sr=10, sw=2, ch=2, **kwargs)
+        err_msg = "{} can not be used with 'split_channels'".format(name)
+        self.assertEqual(err_msg, str(val_err.exception))
+
+    def test_split_channels_non_seekable_input(self):
+        with self.assertRaises(ValueError) as val_err:
+            split_channels(None, sr=16000, sw=2, ch=2)
+        self.assertEqual(
+            "'split_channels' requires a seekable input",
+            str(val_err.exception),
+        )
+
+    def test_sweep_unknown_param(self):
+        with self.assertRaises(ValueError) as val_err:
+            sweep(b"", [{"min_dur": 0.2, "hop_dur": 0.1}], sr=10, sw=2, ch=1)
+        err_msg = "Unknown sweep parameter(s): hop_dur"
+        self.assertEqual(err_msg, str(val_err.exception))
+
     def test_split_too_small_analysis_window(self):
         with self.assertRaises(ValueError) as val_err:
             split(b"", sr=10, sw=1, ch=1, analysis_window=0.09)
@@ -948,6 +1967,13 @@ class TestSplit(TestCase):
         err_msg += "single data sample"
         self.assertEqual(err_msg, str(val_err.exception))
 
+    def test_split_too_small_hop_dur(self):
+        with self.assertRaises(ValueError) as val_err:
+            split(b"", sr=10, sw=1, ch=1, analysis_window=0.2, hop_dur=0.05)
+        err_msg = "Too small hop_dur (0.050000) for sampling rate (10). "
+        err_msg += "hop_dur should cover at least one sample (i.e. 1/10)"
+        self.assertEqual(err_msg, str(val_err.exception))
+
     def test_split_and_plot(self):
 
         with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
@@ -1160,6 +2186,22 @@ class TestAudioRegion(TestCase):
         self.assertEqual(len(region.ms), expected_duration_ms)
         self.assertEqual(bytes(region), data)
 
+    def test_no_instance_dict(self):
+        # regions are slotted, views and aliases are created on demand
+        region = AudioRegion(b"\0" * 20, 10, 2, 1, {"start": 1})
+        self.assertFalse(hasattr(region, "__dict__"))
+        self.assertFalse(hasattr(region.meta, "__dict__"))
+        self.assertFalse(hasattr(region.sec, "__dict__"))
+        self.assertFalse(hasattr(region.ms, "__dict__"))
+        self.assertEqual(region.sec[0.2:0.5], region[2:5])
+        self.assertEqual(region.s[0.2:0.5], region[2:5])
+        self.assertEqual(region.ms[200:500], region[2:5])
+        self.assertEqual(region.splitp, region.split_and_plot)
+        with self.assertRaises(AttributeError):
+            region.channel = 0
+        region.meta.end = 2
+        self.assertEqual(region.meta, {"start": 1, "end": 2})
+
     def test_creation_invalid_data_exception(self):
         with self.assertRaises(AudioParameterError) as audio_param_err:
             _ = AudioRegion(
@@ -1556,6 +2598,77 @@ class TestAudioRegion(TestCase):
         )
         self.assertEqual(bytes(concat_region), expected_data)
 
+    @genty_dataset(
+        simple=(8000, 1, 1),
+        stereo_sw_2=(8000, 2, 2),
+        arbitrary_sr_multichannel=(5413, 2, 3),
+    )
+    def test_concatenate(self, sampling_rate, sample_width, channels):
+        regions = _make_random_length_regions(
+            [b"a", b"b", b"c"], sampling_rate, sample_width, channels
+        )
+        concat_region = AudioRegion.concatenate(iter(regions))
+        self.assertEqual(concat_region, sum(regions))
+        self.assertEqual(AudioRegion.concatenate(regions[:1]), regions[0])
+        separator = AudioRegion(
+            b"\0" * sample_width * channels,
+            sampling_rate,
+            sample_width,
+            channels,
+        )
+        joined_region = separator.join(regions)
+        expected = regions[0] + separator + regions[1] + separator + regions[2]
+        self.assertEqual(joined_region, expected)
+        self.assertEqual(len(separator.join([])), 0)
+
+    def test_concatenate_split(self):
+        with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
+            data = fp.read()
+        region = AudioRegion(data, 10, 2, 1)
+        concat_region = AudioRegion.concatenate(region.split(aw=0.1, eth=50))
+        expected = sum(region.split(aw=0.1, eth=50))
+        self.assertEqual(concat_region, expected)
+
+    def test_concatenate_empty_error(self):
+        with self.assertRaises(ValueError) as val_err:
+            AudioRegion.concatenate([])
+        self.assertEqual(
+            "Can't concatenate an empty iterable of regions",
+            str(val_err.exception),
+        )
+
+    @genty_dataset(
+        first=([b"abcd", AudioRegion(b"a" * 8, 10, 2, 1)],),
+        other=([AudioRegion(b"a" * 8, 10, 2, 1), b"abcd"],),
+    )
+    def test_concatenate_non_region_error(self, regions):
+        with self.assertRaises(TypeError) as type_err:
+            AudioRegion.concatenate(regions)
+        self.assertEqual(
+            "Can only concatenate AudioRegion, not \"<class 'bytes'>\"",
+            str(type_err.exception),
+        )
+
+    def test_concatenate_different_sampling_rate_error(self):
+        region_1 = AudioRegion(b"a" * 100, 8000, 1, 1)
+        region_2 = AudioRegion(b"b" * 100, 3000, 1, 1)
+        with self.assertRaises(ValueError) as val_err:
+            AudioRegion.concatenate([region_1, region_1, region_2])
+        self.assertEqual(
+            "Can only concatenate AudioRegions of the same "
+            "sampling rate (8000 != 3000)",
+            str(val_err.exception),
+        )
+
+    def test_radd_non_region_error(self):
+        region = AudioRegion(b"a" * 100, 8000, 1, 1)
+        with self.assertRaises(TypeError) as type_err:
+            b"abcd" + region
+        self.assertEqual(
+            "Can only concatenate AudioRegion, not \"<class 'bytes'>\"",
+            str(type_err.exception),
+        )
+
     def test_concatenation_different_sampling_rate_error(self):
 
         region_1 = AudioRegion(b"a" * 100, 8000, 1, 1)
@@ -1661,6 +2774,61 @@ class TestAudioRegion(TestCase):
             pass
         self.assertTrue(equal)
 
+    @genty_dataset(
+        bytearray_=(bytearray,),
+        memoryview_=(memoryview,),
+        array_=(lambda data: array_("h", data),),
+    )
+    def test_buffer_protocol_data(self, to_buffer):
+        with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
+            data = fp.read()
+        region = AudioRegion(to_buffer(data), 10, 2, 1)
+        expected = AudioRegion(data, 10, 2, 1)
+        self.assertEqual(len(region), len(expected))
+        self.assertEqual(bytes(region), data)
+        self.assertEqual(region, expected)
+        self.assertEqual(region[5:20], expected[5:20])
+        self.assertEqual(region + region, expected + expected)
+        self.assertEqual(region * 2, expected * 2)
+        self.assertEqual(list(region.samples), list(expected.samples))
+        regions = list(region.split(eth=50, aw=0.1))
+        self.assertEqual(regions, list(expected.split(eth=50, aw=0.1)))
+
+    @genty_dataset(
+        simple=(slice(5, 20), 5, 15),
+        negative=(slice(-20, -5), 56, 15),
+        open_end=(slice(70, None), 70, 6),
+        out_of_range=(slice(80, 100), 76, 0),
+    )
+    def test_lazy_audio_region(self, index, offset, length):
+        with open("tests/data/test_split_10HZ_mono.raw", "rb") as fp:
+            data = fp.read()
+        expected = AudioRegion(data, 10, 2, 1)
+        audio_source = get_audio_source(
+            "tests/data/test_split_10HZ_mono.raw",
+            sr=10,
+            sw=2,
+            ch=1,
+            large_file=True,
+        )
+        region = LazyAudioRegion(audio_source, 0, len(expected))
+        self.assertEqual(region.duration, expected.duration)
+        # slicing doesn't read any data
+        sub_region = region[index]
+        self.assertIsInstance(sub_region, LazyAudioRegion)
+        self.assertIsNone(region._loaded_data)
+        self.assertEqual(sub_region.offset, offset)
+        self.assertEqual(len(sub_region), length)
+        # data is read from a closed audio source that is closed again
+        self.assertEqual(bytes(sub_region), bytes(expected[index]))
+        self.assertFalse(audio_source.is_open())
+        self.assertEqual(region, expected)
+        self.assertEqual(region[index], expected[index])
+        with TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "audio.wav")
+            region[5:20].save(filename)
+            self.assertEqual(AudioRegion.load(filename), expected[5:20])
+
 
 if __name__ == "__main__":
     unittest.main()
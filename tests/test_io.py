@@ -11,11 +11,14 @@ from genty import genty, genty_dataset
 from test_util import _sample_generator, _generate_pure_tone, PURE_TONE_DICT
 from auditok.signal import FORMAT
 from auditok.io import (
+    _WITH_NUMPY,
     AudioIOError,
     AudioParameterError,
     BufferAudioSource,
     RawAudioSource,
     WaveAudioSource,
+    MmapRawAudioSource,
+    MmapWaveAudioSource,
     StdinAudioSource,
     check_audio_data,
     _guess_audio_format,
@@ -29,6 +32,9 @@ from auditok.io import (
     _save_wave,
     _save_with_pydub,
     to_file,
+    save_energy_track,
+    load_energy_track,
+    energy_track_path,
 )
 
 AUDIO_PARAMS_SHORT = {"sr": 16000, "sw": 2, "ch": 1}
@@ -153,6 +159,19 @@ class TestIO(TestCase):
         audio_source = from_file(filename, large_file=True)
         self.assertIsInstance(audio_source, WaveAudioSource)
 
+    @genty_dataset(
+        raw=("raw", True, MmapRawAudioSource),
+        raw_no_mmap=("raw", False, RawAudioSource),
+        wave=("wav", True, MmapWaveAudioSource),
+        wave_no_mmap=("wav", False, WaveAudioSource),
+    )
+    def test_from_file_large_file_use_mmap(self, ext, use_mmap, expected):
+        filename = "tests/data/test_16KHZ_mono_400Hz.{}".format(ext)
+        audio_source = from_file(
+            filename, large_file=True, use_mmap=use_mmap, **AUDIO_PARAMS_SHORT
+        )
+        self.assertIs(type(audio_source), expected)
+
     def test_from_file_large_file_compressed(self,):
         filename = "tests/data/test_16KHZ_mono_400Hz.ogg"
         with self.assertRaises(AudioIOError):
@@ -441,6 +460,53 @@ class TestIO(TestCase):
         audio_source = get_audio_source(input, **kwargs)
         self.assertIsInstance(audio_source, expected_type)
 
+    @unittest.skipIf(not _WITH_NUMPY, "numpy is not installed")
+    def test_save_load_energy_track(self):
+        with TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "audio.raw")
+            with open(filename, "wb") as fp:
+                fp.write(PURE_TONE_DICT[400].tobytes())
+            energies = [50.5, 60.25, 0.0, 70.125]
+            path = save_energy_track(
+                filename, energies, 0.1, "avg", **AUDIO_PARAMS_SHORT
+            )
+            self.assertEqual(path, energy_track_path(filename, 0.1, "mix"))
+            track = load_energy_track(
+                filename, 0.1, "mix", **AUDIO_PARAMS_SHORT
+            )
+            self.assertEqual(list(track), energies)
+
+            # other parameters
+            track = load_energy_track(filename, 0.1, 0, **AUDIO_PARAMS_SHORT)
+            self.assertIsNone(track)
+            track = load_energy_track(
+                filename, 0.1, "mix", sr=8000, sw=2, ch=1
+            )
+            self.assertIsNone(track)
+
+            # same content, different modification time
+            stat = os.stat(filename)
+            os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            track = load_energy_track(
+                filename, 0.1, "mix", **AUDIO_PARAMS_SHORT
+            )
+            self.assertEqual(list(track), energies)
+
+            # changed content, same size
+            with open(filename, "r+b") as fp:
+                fp.write(b"\1\1")
+            track = load_energy_track(
+                filename, 0.1, "mix", **AUDIO_PARAMS_SHORT
+            )
+            self.assertIsNone(track)
+
+    @unittest.skipIf(not _WITH_NUMPY, "numpy is not installed")
+    def test_load_energy_track_no_sidecar(self):
+        track = load_energy_track(
+            "tests/data/test_16KHZ_mono_400Hz.raw", 0.1, **AUDIO_PARAMS_SHORT
+        )
+        self.assertIsNone(track)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,6 @@
 import unittest
 from unittest import TestCase
+from unittest.mock import patch
 from array import array as array_
 from genty import genty, genty_dataset
 import numpy as np
@@ -100,6 +101,54 @@ class TestSignal(TestCase):
         self.assertTrue(all(resutl_numpy == expected))
         self.assertEqual(resutl_numpy.dtype, expected_numpy_fmt)
 
+    @genty_dataset(
+        int8=(1, None, [48, 50, 52, 54, 61, 66]),
+        int16=(2, None, [12849, 13877, 16957]),
+        int16_negative=(2, [-3, 0, -5, 2, -32768, -32768], [-2, -2, -32768]),
+        int32=(4, [2**31 - 1, 2**31 - 1, -7, 0], [2**31 - 1, -4]),
+    )
+    def test_average_channels_stereo(self, sample_width, samples, expected):
+        fmt = signal_.FORMAT[sample_width]
+        if samples is None:
+            data = self.data
+        else:
+            data = array_(fmt, samples).tobytes()
+        expected = array_(fmt, expected)
+        resutl = signal_.average_channels_stereo(data, sample_width)
+        self.assertEqual(resutl, expected)
+        with patch("auditok.signal._WITH_AUDIOOP", False):
+            resutl = signal_.average_channels_stereo(data, sample_width)
+        self.assertEqual(resutl, expected)
+        resutl_numpy = signal_numpy.average_channels_stereo(data, sample_width)
+        self.assertEqual(resutl_numpy.tolist(), expected.tolist())
+        self.assertEqual(resutl_numpy.dtype, signal_numpy.FORMAT[sample_width])
+
+    @genty_dataset(
+        stereo=([[[1, 2], [-3, 0]], [[5, -6], [7, 7]]], [[1, -2], [-1, 7]]),
+        three_channels=(
+            [[[1, 2, 4], [-3, 0, 0]], [[5, -6, 0], [7, 7, 8]]],
+            [[2, -1], [0, 7]],
+        ),
+    )
+    def test_mix_frames(self, frames, expected):
+        frames = np.array(frames, dtype=np.int16)
+        mixed = signal_numpy.mix_frames(frames)
+        self.assertEqual(mixed.tolist(), expected)
+        self.assertEqual(mixed.dtype, np.int16)
+        # same results as mixing down raw data
+        channels = frames.shape[-1]
+        selector = (
+            signal_.average_channels_stereo
+            if channels == 2
+            else signal_.average_channels
+        )
+        for frame, exp in zip(frames, expected):
+            if channels == 2:
+                resutl = selector(frame.tobytes(), 2)
+            else:
+                resutl = selector(frame.tobytes(), "h", channels)
+            self.assertEqual(resutl.tolist(), exp)
+
     @genty_dataset(
         int8_1channel=(
             "b",
@@ -147,6 +196,23 @@ class TestSignal(TestCase):
         energy = signal_numpy.calculate_energy_single_channel(x, sample_width)
         self.assertEqual(energy, expected)
 
+    @genty_dataset(
+        int8=([30, -20, 10, 0, -128, 127], 1, 75),
+        int16=([300, 320, 400, 600], 2, 422),
+        int32=([2**20, 7, -(2**31), 5], 4, 1073741951),
+        empty=([], 2, 0),
+    )
+    def test_calculate_rms(self, x, sample_width, expected):
+        x = array_(signal_.FORMAT[sample_width], x)
+        for samples in (x, x.tobytes()):
+            rms = signal_.calculate_rms(samples, sample_width)
+            self.assertEqual(rms, expected)
+            with patch("auditok.signal._WITH_AUDIOOP", False):
+                rms = signal_.calculate_rms(samples, sample_width)
+            self.assertEqual(rms, expected)
+            rms = signal_numpy.calculate_rms(samples, sample_width)
+            self.assertEqual(rms, expected)
+
     @genty_dataset(
         min_=(
             [[300, 320, 400, 600], [150, 160, 200, 300]],
@@ -175,6 +241,62 @@ class TestSignal(TestCase):
         )
         self.assertEqual(energy, expected)
 
+    @genty_dataset(
+        int8=(1, [[30, -20, 10, 0], [0, 0, 0, 0], [-128, 127, -128, 127]]),
+        int16=(2, [[300, 320, 400, 600], [0, 0, 0, 0], [1, -1, 2, -2]]),
+        int32=(4, [[2**20, 7, -(2**31), 5], [0, 0, 0, 0], [3, 2, 1, 0]]),
+    )
+    def test_calculate_energy_frames(self, sample_width, frames):
+        fmt = signal_.FORMAT[sample_width]
+        expected = [
+            signal_.calculate_energy_single_channel(
+                array_(fmt, x), sample_width
+            )
+            for x in frames
+        ]
+        frames = np.array(frames, dtype=signal_numpy.FORMAT[sample_width])
+        energies = signal_numpy.calculate_energy_frames(frames, sample_width)
+        self.assertEqual(energies.tolist(), expected)
+
+    def test_to_frames(self):
+        frames = signal_numpy.to_frames(self.data, np.int8, 2, 2)
+        self.assertEqual(frames.shape, (3, 2, 2))
+        expected = [
+            [[48, 49], [50, 51]],
+            [[52, 53], [54, 55]],
+            [[57, 65], [66, 67]],
+        ]
+        self.assertEqual(frames.tolist(), expected)
+        frames = signal_numpy.to_frames(self.data, np.int16, 1, 4)
+        expected = [[[12592], [13106], [13620], [14134]]]
+        self.assertEqual(frames.tolist(), expected)
+
+    def test_to_frames_hop_size(self):
+        frames = signal_numpy.to_frames(self.data, np.int8, 2, 2, hop_size=1)
+        self.assertEqual(frames.shape, (5, 2, 2))
+        expected = [
+            [[48, 49], [50, 51]],
+            [[50, 51], [52, 53]],
+            [[52, 53], [54, 55]],
+            [[54, 55], [57, 65]],
+            [[57, 65], [66, 67]],
+        ]
+        self.assertEqual(frames.tolist(), expected)
+        # frames are a read-only view of data
+        self.assertFalse(frames.flags.writeable)
+        self.assertTrue(
+            np.shares_memory(frames, np.frombuffer(self.data, np.int8))
+        )
+        frames = signal_numpy.to_frames(self.data, np.int8, 1, 5, hop_size=3)
+        expected = [
+            [[48], [49], [50], [51], [52]],
+            [[51], [52], [53], [54], [55]],
+            [[54], [55], [57], [65], [66]],
+        ]
+        self.assertEqual(frames.tolist(), expected)
+        frames = signal_numpy.to_frames(self.data, np.int16, 1, 8, hop_size=2)
+        self.assertEqual(frames.shape, (0, 8, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
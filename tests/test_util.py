@@ -1,12 +1,29 @@
 import unittest
 from unittest import TestCase
+from unittest.mock import patch
 import math
+import random
 from array import array
 from genty import genty, genty_dataset
-from auditok.util import AudioEnergyValidator, make_duration_formatter
+from auditok import util
+from auditok.util import (
+    AudioEnergyValidator,
+    AdaptiveEnergyValidator,
+    BandEnergyValidator,
+    ZeroCrossingRateValidator,
+    SpectralFlatnessValidator,
+    AudioReader,
+    make_duration_formatter,
+)
+from auditok.io import BufferAudioSource
 from auditok.signal import FORMAT
 from auditok.exceptions import TimeFormatError
 
+try:
+    from auditok import signal_numpy
+except ImportError:
+    pass
+
 
 def _sample_generator(*data_buffers):
     """
@@ -136,6 +153,346 @@ class TestAudioEnergyValidator(TestCase):
         else:
             self.assertFalse(validator.is_valid(data))
 
+    @genty_dataset(
+        mono=(1, None),
+        stereo_uc_None=(2, None),
+        stereo_uc_mix=(2, "mix"),
+        stereo_uc_0=(2, 0),
+        stereo_uc_1=(2, 1),
+        three_channels_uc_None=(3, None),
+        three_channels_uc_mix=(3, "mix"),
+        three_channels_uc_last=(3, -1),
+        four_channels_uc_None=(4, None),
+        four_channels_uc_mix=(4, "mix"),
+    )
+    def test_audio_energy_validator_energy_track(self, channels, use_channel):
+        data = array("h", PURE_TONE_DICT[400][:7999])
+        data.extend([0] * 1000)
+        data.extend(PURE_TONE_DICT[800][:6000])
+        data = bytes(data[: len(data) // channels * channels])
+        sample_width = 2
+        window_size = 160
+        validator = AudioEnergyValidator(
+            50, sample_width, channels, use_channel
+        )
+        energies = validator.energy_track(data, window_size)
+        mask = validator.is_valid_buffer(data, window_size)
+        window_bytes = window_size * sample_width * channels
+        windows = [
+            data[i : i + window_bytes]
+            for i in range(0, len(data), window_bytes)
+        ]
+        self.assertEqual(len(energies), len(windows))
+        expected_mask = [validator.is_valid(w) for w in windows]
+        self.assertEqual(list(mask), expected_mask)
+        self.assertIn(True, expected_mask)
+        self.assertIn(False, expected_mask)
+        for energy, window in zip(energies, windows):
+            expected = validator._energy_fn(
+                validator._selector(window), sample_width
+            )
+            self.assertEqual(energy, expected)
+
+    @genty_dataset(
+        mono=(1, None, 80),
+        mono_small_hop=(1, None, 40),
+        stereo_uc_None=(2, None, 80),
+        stereo_uc_mix=(2, "mix", 40),
+        three_channels_uc_last=(3, -1, 120),
+    )
+    def test_audio_energy_validator_energy_track_hop_size(
+        self, channels, use_channel, hop_size
+    ):
+        data = array("h", PURE_TONE_DICT[400][:7999])
+        data.extend([0] * 1000)
+        data.extend(PURE_TONE_DICT[800][:6000])
+        data = bytes(data[: len(data) // channels * channels])
+        sample_width = 2
+        window_size = 160
+        validator = AudioEnergyValidator(
+            50, sample_width, channels, use_channel
+        )
+        energies = validator.energy_track(data, window_size, hop_size=hop_size)
+        mask = validator.is_valid_buffer(data, window_size, hop_size=hop_size)
+        # overlapping windows, including shorter last ones, as read by an
+        # AudioReader with the same window and hop sizes
+        source = BufferAudioSource(data, 16000, sample_width, channels)
+        reader = AudioReader(
+            source, block_dur=window_size / 16000, hop_dur=hop_size / 16000
+        )
+        reader.open()
+        windows = list(iter(reader.read, None))
+        reader.close()
+        self.assertEqual(len(energies), len(windows))
+        expected_mask = [validator.is_valid(w) for w in windows]
+        self.assertEqual(list(mask), expected_mask)
+        self.assertIn(True, expected_mask)
+        self.assertIn(False, expected_mask)
+        for energy, window in zip(energies, windows):
+            expected = validator._energy_fn(
+                validator._selector(window), sample_width
+            )
+            self.assertEqual(energy, expected)
+
+    @genty_dataset(
+        mono=(1, None),
+        stereo_uc_None=(2, None),
+        stereo_uc_mix=(2, "mix"),
+        stereo_uc_1=(2, 1),
+        three_channels_uc_None=(3, None),
+        three_channels_uc_mix=(3, "mix"),
+    )
+    def test_audio_energy_validator_is_valid_batch(
+        self, channels, use_channel
+    ):
+        data = array("h", PURE_TONE_DICT[400][:7999])
+        data.extend([0] * 1000)
+        data.extend(PURE_TONE_DICT[800][:6000])
+        data = bytes(data[: len(data) // channels * channels])
+        sample_width = 2
+        window_size = 160
+        validator = AudioEnergyValidator(
+            50, sample_width, channels, use_channel
+        )
+        window_bytes = window_size * sample_width * channels
+        windows = [
+            data[i : i + window_bytes]
+            for i in range(0, len(data), window_bytes)
+        ]
+        expected = [validator.is_valid(w) for w in windows]
+        self.assertIn(True, expected)
+        self.assertIn(False, expected)
+        self.assertEqual(list(validator.is_valid_batch(windows)), expected)
+        # windows of different sizes
+        self.assertEqual(
+            list(validator.is_valid_batch(windows[::-1])), expected[::-1]
+        )
+        if util._WITH_NUMPY:
+            frames = signal_numpy.to_frames(
+                data, signal_numpy.FORMAT[sample_width], channels, window_size
+            )
+            if channels == 1:
+                frames = frames[:, :, 0]
+            mask = validator.is_valid_batch(frames)
+            self.assertEqual(list(mask), expected[: len(frames)])
+
+
+@genty
+class TestAdaptiveEnergyValidator(TestCase):
+    def _make_windows(self, volumes, window_size=160, seed=1):
+        # one window of white noise of the given volume per item of volumes
+        rng = random.Random(seed)
+        return [
+            array(
+                "h", (int(rng.gauss(0, volume)) for _ in range(window_size))
+            ).tobytes()
+            for volume in volumes
+        ]
+
+    def test_noise_floor(self):
+        validator = AdaptiveEnergyValidator(2, 1, margin=10, horizon=4)
+        self.assertIsNone(validator.noise_floor)
+        self.assertIsNone(validator.energy_threshold)
+        energy_validator = AudioEnergyValidator(0, 2, 1)
+        volumes = [100, 80, 1000, 1000, 1000, 1000, 1000, 120, 2000, 100]
+        expected_mask = (
+            [False, False] + [True] * 3 + [False] * 3 + [True, False]
+        )
+        windows = self._make_windows(volumes)
+        energies = [energy_validator._energy_fn(w, 2) for w in windows]
+        mask = []
+        for i, window in enumerate(windows):
+            mask.append(validator.is_valid(window))
+            # noise floor is the minimum energy of the last 4 windows
+            expected_floor = min(energies[max(0, i - 3) : i + 1])
+            self.assertEqual(validator.noise_floor, expected_floor)
+            self.assertEqual(validator.energy_threshold, expected_floor + 10)
+        self.assertEqual(mask, expected_mask)
+
+    @genty_dataset(
+        default=({}, [False, True, False, True, False]),
+        min_threshold=(
+            {"min_threshold": 70},
+            [False, False, False, True, False],
+        ),
+        large_margin=({"margin": 30}, [False, False, False, True, False]),
+    )
+    def test_is_valid_batch(self, kwargs, expected):
+        volumes = [100, 2000, 100, 10000, 100] * 4
+        windows = self._make_windows(volumes, 320)
+        validator = AdaptiveEnergyValidator(2, 1, **kwargs)
+        mask = [validator.is_valid(window) for window in windows]
+        self.assertEqual(mask, expected * 4)
+        validator.reset()
+        self.assertIsNone(validator.noise_floor)
+        self.assertEqual(list(validator.is_valid_batch(windows)), mask)
+        if util._WITH_NUMPY:
+            validator.reset()
+            frames = signal_numpy.to_frames(
+                b"".join(windows), signal_numpy.FORMAT[2], 1, 320
+            )
+            self.assertEqual(
+                list(validator.is_valid_batch(frames[:, :, 0])), mask
+            )
+
+    def test_stereo(self):
+        left = self._make_windows([100, 100, 1000, 100], seed=1)
+        right = self._make_windows([100, 1000, 100, 100], seed=2)
+        windows = [
+            array(
+                "h",
+                _sample_generator(
+                    array("h", left_window), array("h", right_window)
+                ),
+            ).tobytes()
+            for left_window, right_window in zip(left, right)
+        ]
+        for use_channel, expected in (
+            (None, [False, True, True, False]),
+            (0, [False, False, True, False]),
+            (1, [False, True, False, False]),
+        ):
+            validator = AdaptiveEnergyValidator(2, 2, use_channel)
+            mask = [validator.is_valid(window) for window in windows]
+            self.assertEqual(mask, expected)
+
+    def test_wrong_horizon(self):
+        with self.assertRaises(ValueError):
+            AdaptiveEnergyValidator(2, 1, horizon=0)
+
+
+def _white_noise(nb_samples, volume=3000, seed=1):
+    rng = random.Random(seed)
+    return array("h", (int(rng.gauss(0, volume)) for _ in range(nb_samples)))
+
+
+@genty
+@unittest.skipIf(not util._WITH_NUMPY, "numpy is not installed")
+class TestFrameFeatureValidators(TestCase):
+    def setUp(self):
+        self.window_size = 320
+        self.validators = {
+            "band": lambda ch, uc: BandEnergyValidator(
+                60, (300, 3400), 16000, 2, ch, uc
+            ),
+            "zcr": lambda ch, uc: ZeroCrossingRateValidator(
+                0.2, 2, ch, uc, min_rate=0.01
+            ),
+            "flatness": lambda ch, uc: SpectralFlatnessValidator(
+                0.3, 2, ch, uc
+            ),
+        }
+
+    def _windows(self, data):
+        return [
+            data[i : i + self.window_size]
+            for i in range(0, len(data), self.window_size)
+        ]
+
+    @genty_dataset(
+        band_tone_in_band=("band", 400, True),
+        band_tone_out_of_band=("band", 7220, False),
+        band_noise=("band", "noise", True),
+        band_silence=("band", "silence", False),
+        zcr_tone=("zcr", 400, True),
+        zcr_high_frequency_tone=("zcr", 7220, False),
+        zcr_noise=("zcr", "noise", False),
+        zcr_silence=("zcr", "silence", False),
+        flatness_tone=("flatness", 400, True),
+        flatness_high_frequency_tone=("flatness", 7220, True),
+        flatness_noise=("flatness", "noise", False),
+        flatness_silence=("flatness", "silence", False),
+    )
+    def test_is_valid(self, name, signal, expected):
+        if signal == "noise":
+            data = _white_noise(1600)
+        elif signal == "silence":
+            data = array("h", [0] * 1600)
+        else:
+            data = PURE_TONE_DICT[signal][:1600]
+        validator = self.validators[name](1, None)
+        mask = [validator.is_valid(window) for window in self._windows(data)]
+        self.assertEqual(mask, [expected] * 5)
+        self.assertEqual(list(validator.is_valid_batch([data])), [expected])
+
+    @genty_dataset(
+        stereo_uc_None=(2, None),
+        stereo_uc_any=(2, "any"),
+        stereo_uc_mix=(2, "mix"),
+        stereo_uc_0=(2, 0),
+        stereo_uc_1=(2, -1),
+        three_channels_uc_None=(3, None),
+        three_channels_uc_avg=(3, "avg"),
+    )
+    def test_is_valid_batch(self, channels, use_channel):
+        silence = array("h", [0] * 1600)
+        buffers = [
+            PURE_TONE_DICT[400][:1600] + silence * 3,
+            silence
+            + _white_noise(1600)
+            + PURE_TONE_DICT[1600][:1600]
+            + silence,
+            PURE_TONE_DICT[800][:1600] + silence * 3,
+        ]
+        data = array("h", _sample_generator(*buffers[:channels])).tobytes()
+        window_bytes = self.window_size * 2 * channels
+        windows = [
+            data[i : i + window_bytes]
+            for i in range(0, len(data), window_bytes)
+        ]
+        frames = signal_numpy.to_frames(
+            data, signal_numpy.FORMAT[2], channels, self.window_size
+        )
+        for name, make_validator in self.validators.items():
+            validator = make_validator(channels, use_channel)
+            expected = [validator.is_valid(window) for window in windows]
+            self.assertIn(True, expected)
+            self.assertIn(False, expected)
+            self.assertEqual(list(validator.is_valid_batch(windows)), expected)
+            self.assertEqual(list(validator.is_valid_batch(frames)), expected)
+            # frames of different sizes
+            short_window = windows[3][: 20 * 2 * channels]
+            mask = validator.is_valid_batch(windows[:3] + [short_window])
+            self.assertEqual(len(mask), 4)
+            self.assertEqual(list(mask[:3]), expected[:3])
+
+    def test_band_energy_validator_whole_spectrum(self):
+        data = _white_noise(16000).tobytes()
+        validator = BandEnergyValidator(50, (0, None), 16000, 2, 1)
+        energy_validator = AudioEnergyValidator(50, 2, 1)
+        frames = signal_numpy.to_frames(data, signal_numpy.FORMAT[2], 1, 320)
+        energies = validator._frames_feature(frames[:, :, 0])
+        expected = energy_validator.energy_track(data, 320)
+        for energy, expected_energy in zip(energies, expected):
+            self.assertAlmostEqual(energy, expected_energy, delta=0.01)
+
+    @genty_dataset(
+        band_negative_frequency=((-100, 3400),),
+        band_reversed=((3400, 300),),
+    )
+    def test_band_energy_validator_wrong_band(self, band):
+        with self.assertRaises(ValueError):
+            BandEnergyValidator(50, band, 16000, 2, 1)
+
+    def test_wrong_channel(self):
+        for make_validator in self.validators.values():
+            with self.assertRaises(ValueError):
+                make_validator(2, 2)
+
+    def test_feature_methods_required(self):
+        class _FeatureValidator(util._FrameFeatureValidator):
+            def _frames_feature(self, frames):
+                return frames.mean(axis=-1)
+
+        with self.assertRaises(TypeError):
+            _FeatureValidator(2, 1)
+
+    def test_without_numpy(self):
+        with patch("auditok.util._WITH_NUMPY", False):
+            for make_validator in self.validators.values():
+                with self.assertRaises(ImportError):
+                    make_validator(1, None)
+
 
 if __name__ == "__main__":
     unittest.main()